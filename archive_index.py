@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Index archived runs in run_old/ into SQLite and query across them.
+
+Every command first picks up new or changed runs (use --no-update to skip).
+
+Usage:
+    python archive_index.py update
+    python archive_index.py runs --since 2026-01-01
+    python archive_index.py penguin TrendPenguin --since 2026-01-01 --until 2026-01-31
+    python archive_index.py leaderboard --since 2026-01-01
+    python archive_index.py symbol NVDA
+    python archive_index.py sql "SELECT penguin, COUNT(*) FROM trades GROUP BY penguin"
+"""
+
+import argparse
+import time
+
+from config import ARCHIVE_DB, ARCHIVE_DIR
+from data.archive import ArchiveIndex
+
+
+def _date_filter(args, column="r.day"):
+    clauses, params = [], []
+    if args.since:
+        clauses.append(f"{column} >= ?")
+        params.append(args.since)
+    if args.until:
+        clauses.append(f"{column} <= ?")
+        params.append(args.until)
+    return clauses, params
+
+
+def _where(clauses):
+    return ("WHERE " + " AND ".join(clauses)) if clauses else ""
+
+
+def _print_table(columns, rows):
+    if not columns:
+        return
+    cells = [
+        [f"{v:,.2f}" if isinstance(v, float) else str(v) for v in row] for row in rows
+    ]
+    widths = [
+        max([len(c)] + [len(row[i]) for row in cells]) for i, c in enumerate(columns)
+    ]
+    print("  ".join(c.ljust(w) for c, w in zip(columns, widths)))
+    print("  ".join("-" * w for w in widths))
+    for row, cell_row in zip(rows, cells):
+        print(
+            "  ".join(
+                c.ljust(w) if isinstance(v, str) else c.rjust(w)
+                for v, c, w in zip(row, cell_row, widths)
+            )
+        )
+
+
+def cmd_runs(index, args):
+    clauses, params = _date_filter(args)
+    return index.query(
+        "SELECT r.path, r.started, r.duration, r.interrupted AS intr, "
+        "COUNT(res.penguin) AS penguins, MAX(res.final_value) AS best "
+        "FROM runs r LEFT JOIN results res ON res.run_id = r.id "
+        f"{_where(clauses)} GROUP BY r.id ORDER BY r.path",
+        params,
+    )
+
+
+def cmd_penguin(index, args):
+    clauses, params = _date_filter(args)
+    clauses.append("res.penguin = ?")
+    params.append(args.name)
+    return index.query(
+        "SELECT r.path, r.duration, res.final_value, res.pnl, res.pnl_pct, "
+        "res.trades FROM results res JOIN runs r ON r.id = res.run_id "
+        f"{_where(clauses)} ORDER BY r.path",
+        params,
+    )
+
+
+def cmd_leaderboard(index, args):
+    clauses, params = _date_filter(args)
+    return index.query(
+        "WITH best AS (SELECT run_id, MAX(final_value) AS top FROM results "
+        "WHERE trades > 0 GROUP BY run_id) "
+        "SELECT res.penguin, COUNT(*) AS runs, "
+        "SUM(res.trades > 0 AND res.final_value = best.top) AS wins, "
+        "AVG(res.pnl_pct) AS avg_pnl_pct, MIN(res.pnl_pct) AS worst, "
+        "MAX(res.pnl_pct) AS best, SUM(res.trades) AS trades "
+        "FROM results res JOIN runs r ON r.id = res.run_id "
+        "LEFT JOIN best ON best.run_id = res.run_id "
+        f"{_where(clauses)} GROUP BY res.penguin ORDER BY avg_pnl_pct DESC",
+        params,
+    )
+
+
+def cmd_symbol(index, args):
+    clauses, params = _date_filter(args)
+    clauses.append("t.symbol = ?")
+    params.append(args.name)
+    return index.query(
+        "SELECT t.penguin, SUM(t.side = 'BUY') AS buys, SUM(t.side = 'SELL') AS sells, "
+        "SUM(CASE WHEN t.side = 'SELL' THEN t.qty * t.price "
+        "ELSE -t.qty * t.price END) AS net_cash, "
+        "AVG(t.price) AS avg_price, COUNT(DISTINCT t.run_id) AS runs "
+        "FROM trades t JOIN runs r ON r.id = t.run_id "
+        f"{_where(clauses)} GROUP BY t.penguin ORDER BY t.penguin",
+        params,
+    )
+
+
+def cmd_sql(index, args):
+    return index.query(args.query)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--db", default=ARCHIVE_DB)
+    parser.add_argument("--root", default=ARCHIVE_DIR)
+    parser.add_argument("--no-update", action="store_true")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    commands.add_parser("update", help="Ingest new or changed runs")
+    for name, help_text in (
+        ("runs", "List indexed runs"),
+        ("penguin", "One penguin across runs"),
+        ("leaderboard", "All penguins across runs"),
+        ("symbol", "Trades in one symbol across runs"),
+    ):
+        sub = commands.add_parser(name, help=help_text)
+        if name in ("penguin", "symbol"):
+            sub.add_argument("name")
+        sub.add_argument("--since", help="First day, YYYY-MM-DD")
+        sub.add_argument("--until", help="Last day, YYYY-MM-DD")
+    sub = commands.add_parser("sql", help="Run a raw SQL query")
+    sub.add_argument("query")
+    args = parser.parse_args()
+
+    index = ArchiveIndex(args.db, root=args.root)
+    try:
+        if args.command == "update" or not args.no_update:
+            start = time.time()
+            added, removed = index.update()
+            if added or removed or args.command == "update":
+                print(
+                    f"🗂️  Indexed {added} new/changed runs, dropped {removed} "
+                    f"in {time.time() - start:.2f}s"
+                )
+        if args.command == "update":
+            return
+
+        start = time.time()
+        handler = {
+            "runs": cmd_runs,
+            "penguin": cmd_penguin,
+            "leaderboard": cmd_leaderboard,
+            "symbol": cmd_symbol,
+            "sql": cmd_sql,
+        }[args.command]
+        columns, rows = handler(index, args)
+        _print_table(columns, rows)
+        print(f"\n{len(rows)} rows in {(time.time() - start) * 1000:.1f} ms")
+    finally:
+        index.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,7 @@
 from .portfolio import Portfolio
+from .portfolio_book import PortfolioBook
 from .simulator import Simulator
+from .replay import replay_bars
 from .metrics import evaluate
 
-__all__ = ["Portfolio", "Simulator", "evaluate"]
+__all__ = ["Portfolio", "PortfolioBook", "Simulator", "replay_bars", "evaluate"]
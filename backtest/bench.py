@@ -0,0 +1,293 @@
+"""
+Micro and per-bar benchmarks of the trading hot path on synthetic data.
+
+Every case is timed as "one bar" at a given size (symbols x penguins),
+so results line up with the live loop's per-minute budget:
+
+    indicator/<name>    one call per symbol (rsi, roc, sma, zscore, atr, obv)
+    decide/<Penguin>    one penguin deciding every symbol
+    portfolio/<op>      buy, sell or value across every symbol
+    book/values         PortfolioBook marking every penguin at once
+    step                Simulator.step with the whole roster
+
+Each case runs once to warm up, then `repeat` timed times. decide and
+step cases move to the next generated bar on every call, so the per-bar
+indicator cache and streaming state do a new bar's work. The JSON keeps
+median, p95 and min in ms so files from different commits can be
+diffed with compare().
+"""
+
+import platform
+import random
+import subprocess
+import time
+from datetime import datetime
+
+import numpy as np
+
+from backtest.portfolio import Portfolio
+from backtest.portfolio_book import PortfolioBook
+from backtest.simulator import Simulator
+from data.synthetic import SyntheticMarket
+from indicators.context import IndicatorContext
+from indicators.momentum import roc, rsi
+from indicators.statsistics import sma, zscore
+from indicators.volatility import atr
+from indicators.volume import obv
+import penguins as penguin_module
+from penguins import BasePenguin
+
+SYMBOL_COUNTS = (10, 100, 1000)
+PENGUIN_COUNTS = (5, 20, 100)
+
+INDICATORS = {
+    "rsi": lambda b: rsi(b["close"], 14),
+    "roc": lambda b: roc(b["close"], 5),
+    "sma": lambda b: sma(b["close"], 20),
+    "zscore": lambda b: zscore(b["close"], 20),
+    "atr": lambda b: atr(b["high"], b["low"], b["close"], 14),
+    "obv": lambda b: obv(b["close"], b["volume"]),
+}
+
+
+def penguin_classes():
+    return [
+        getattr(penguin_module, name)
+        for name in penguin_module.__all__
+        if getattr(penguin_module, name) is not BasePenguin
+    ]
+
+
+def make_roster(count):
+    """count penguins cycling through every class, with unique names."""
+    classes = penguin_classes()
+    roster = []
+    for i in range(count):
+        penguin = classes[i % len(classes)]()
+        if i >= len(classes):
+            penguin.name = f"{penguin.name}_{i // len(classes)}"
+        roster.append(penguin)
+    return roster
+
+
+def git_commit():
+    try:
+        out = subprocess.run(
+            ["git", "describe", "--always", "--dirty"],
+            capture_output=True,
+            text=True,
+            timeout=10,
+        )
+        return out.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def _timed(fn, repeat):
+    """Call fn(0) to warm up, then fn(1..repeat); return per-call seconds."""
+    fn(0)
+    times = []
+    for i in range(1, repeat + 1):
+        start = time.perf_counter()
+        fn(i)
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def _result(name, symbols, penguins, times):
+    ms = np.array(times) * 1000
+    return {
+        "name": name,
+        "symbols": symbols,
+        "penguins": penguins,
+        "repeat": len(ms),
+        "median_ms": float(np.median(ms)),
+        "p95_ms": float(np.percentile(ms, 95)),
+        "min_ms": float(ms.min()),
+    }
+
+
+class _Data:
+    """Synthetic bars for one symbol count, split into history and live bars."""
+
+    def __init__(self, n_symbols, history, bars, seed, spread_pct):
+        self.symbols = [f"SYN{i:04d}" for i in range(n_symbols)]
+        self.history = history
+        self.bars = SyntheticMarket(seed=seed).bars(self.symbols, history + bars)
+        self.spread_pct = spread_pct
+
+    def window(self, s):
+        return self.bars[s][: self.history]
+
+    def quotes(self, i):
+        out = {}
+        for s in self.symbols:
+            mid = float(self.bars[s]["close"][self.history + i])
+            half = mid * self.spread_pct / 2
+            out[s] = (mid - half, mid + half)
+        return out
+
+    def ohlcv(self, i):
+        return {s: tuple(self.bars[s][self.history + i])[1:] for s in self.symbols}
+
+    def simulator(self, roster):
+        sim = Simulator(roster, self.symbols, initial_capital=1e6, verbose=False)
+        for s in self.symbols:
+            sim.price_history.extend(s, self.window(s)["close"])
+            sim.bars.extend(s, self.window(s))
+        sim.minute = self.history
+        return sim
+
+
+def bench_indicators(data, repeat):
+    windows = [data.window(s) for s in data.symbols]
+    for name, fn in INDICATORS.items():
+        times = _timed(lambda _: [fn(w) for w in windows], repeat)
+        yield _result(f"indicator/{name}", len(data.symbols), 1, times)
+
+
+def bench_decide(data, repeat):
+    # Call i sees history + i + 1 closes, so every timed call is a new bar:
+    # the streaming indicators take one price and the context cache is cold
+    quotes = [data.quotes(i) for i in range(repeat + 1)]
+    closes = {s: data.bars[s]["close"] for s in data.symbols}
+    for cls in penguin_classes():
+        penguin = cls()
+        portfolio = Portfolio(cash=1e6)
+        for s in data.symbols[::2]:  # Half the symbols held, half not
+            portfolio.buy(s, quotes[0][s][1], 1)
+        ctx = IndicatorContext()
+
+        def one_bar(i):
+            ctx.new_bar(i)
+            end = data.history + i + 1
+            for s in data.symbols:
+                bid, ask = quotes[i][s]
+                penguin.decide(s, closes[s][:end], bid, ask, portfolio, ctx=ctx)
+
+        times = _timed(one_bar, repeat)
+        yield _result(f"decide/{cls.__name__}", len(data.symbols), 1, times)
+
+
+def bench_portfolio(data, repeat):
+    quotes = data.quotes(0)
+    asks = [(s, quotes[s][1]) for s in data.symbols]
+    bids = [(s, quotes[s][0]) for s in data.symbols]
+    prices = {s: (b + a) / 2 for s, (b, a) in quotes.items()}
+    n = len(data.symbols)
+
+    portfolios = [Portfolio(cash=1e9) for _ in range(repeat + 1)]
+    times = _timed(lambda i: [portfolios[i].buy(s, p, 1) for s, p in asks], repeat)
+    yield _result("portfolio/buy", n, 1, times)
+    times = _timed(lambda i: [portfolios[i].sell(s, p, 1) for s, p in bids], repeat)
+    yield _result("portfolio/sell", n, 1, times)
+
+    held = Portfolio(cash=1e9)
+    for s, p in asks:
+        held.buy(s, p, 1)
+    yield _result("portfolio/value", n, 1, _timed(lambda _: held.value(prices), repeat))
+
+
+def bench_book(data, n_penguins, repeat):
+    quotes = data.quotes(0)
+    names = [f"P{i}" for i in range(n_penguins)]
+    portfolios = {name: Portfolio(cash=1e9) for name in names}
+    rng = random.Random(0)
+    for portfolio in portfolios.values():
+        for s in rng.sample(data.symbols, max(1, len(data.symbols) // 3)):
+            portfolio.buy(s, quotes[s][1], rng.randint(1, 9))
+    book = PortfolioBook(names, data.symbols)
+    book.load(portfolios)
+    prices = {s: (b + a) / 2 for s, (b, a) in quotes.items()}
+    times = _timed(lambda _: book.values(prices), repeat)
+    return _result("book/values", len(data.symbols), n_penguins, times)
+
+
+def bench_step(data, n_penguins, repeat):
+    random.seed(0)  # RandomPenguins
+    sim = data.simulator(make_roster(n_penguins))
+    times = _timed(lambda i: sim.step(data.quotes(i), bars=data.ohlcv(i)), repeat)
+    return _result("step", len(data.symbols), n_penguins, times)
+
+
+def run_benchmarks(
+    symbol_counts=SYMBOL_COUNTS,
+    penguin_counts=PENGUIN_COUNTS,
+    history=390,
+    repeat=5,
+    seed=0,
+    spread_pct=0.001,
+    only=None,
+    log=print,
+):
+    """
+    Run every benchmark group (or those whose name starts with one of `only`).
+
+    Returns:
+        {"meta": {...}, "results": [ {name, symbols, penguins, median_ms, ...} ]}
+    """
+
+    def wanted(group):
+        return not only or any(o.split("/")[0] == group for o in only)
+
+    results = []
+    started = time.time()
+    for n_symbols in symbol_counts:
+        data = _Data(n_symbols, history, repeat + 1, seed, spread_pct)
+        groups = []
+        if wanted("indicator"):
+            groups.append(bench_indicators(data, repeat))
+        if wanted("decide"):
+            groups.append(bench_decide(data, repeat))
+        if wanted("portfolio"):
+            groups.append(bench_portfolio(data, repeat))
+        for n_penguins in penguin_counts:
+            if wanted("book"):
+                groups.append([bench_book(data, n_penguins, repeat)])
+            if wanted("step"):
+                groups.append([bench_step(data, n_penguins, repeat)])
+        for group in groups:
+            for r in group:
+                if only and not any(r["name"].startswith(o) for o in only):
+                    continue
+                results.append(r)
+                log(
+                    f"  {r['name']:<38} {r['symbols']:>5} sym {r['penguins']:>4} peng"
+                    f"  {r['median_ms']:>10.3f} ms  (p95 {r['p95_ms']:.3f})"
+                )
+
+    return {
+        "meta": {
+            "commit": git_commit(),
+            "time": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.platform(),
+            "history": history,
+            "repeat": repeat,
+            "seed": seed,
+            "seconds": round(time.time() - started, 2),
+        },
+        "results": results,
+    }
+
+
+def compare(base, new, threshold=0.2):
+    """
+    Match results by (name, symbols, penguins) and flag slowdowns.
+
+    Returns:
+        (rows, regressions): rows of (key, base_ms, new_ms, ratio) and the
+        subset whose median grew by more than `threshold`
+    """
+    key = lambda r: (r["name"], r["symbols"], r["penguins"])
+    base_by_key = {key(r): r for r in base["results"]}
+    rows = []
+    for r in new["results"]:
+        old = base_by_key.get(key(r))
+        if old is None:
+            continue
+        ratio = r["median_ms"] / old["median_ms"] if old["median_ms"] > 0 else 1.0
+        rows.append((key(r), old["median_ms"], r["median_ms"], ratio))
+    regressions = [row for row in rows if row[3] > 1 + threshold]
+    return rows, regressions
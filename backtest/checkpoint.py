@@ -0,0 +1,197 @@
+"""
+Crash-safe checkpoints of a running Simulator.
+
+A checkpoint directory holds one base snapshot plus numbered deltas:
+
+    base.pkl           everything up to base["seq"]
+    delta_000042.pkl   what changed since the previous save
+
+Each save only writes what was appended since the last one (new prices,
+bars, curve points, trades) plus the small mutable state (cash,
+positions, each penguin's state()), so its cost does not grow with the run.
+Penguin indicators are not saved; they catch up from the restored prices.
+Every `compact_every` saves a fresh base replaces the chain.
+
+Every file is written to a temp name, fsynced and renamed into place,
+so a crash mid-write leaves the previous checkpoint intact. Loading
+applies the base and then consecutive deltas until the first gap.
+"""
+
+import copy
+import os
+import pickle
+
+from backtest.portfolio import TradeLedger
+
+BASE_FILE = "base.pkl"
+
+
+def _atomic_dump(obj, path):
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        pickle.dump(obj, f, protocol=pickle.HIGHEST_PROTOCOL)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+class Checkpointer:
+    def __init__(self, directory, compact_every=50):
+        self.directory = directory
+        self.compact_every = compact_every
+        self._seq = 0  # Last save written
+        self._base_seq = 0
+        self._marks = None  # Lengths already saved, None until the first save
+
+    def _delta_path(self, seq):
+        return os.path.join(self.directory, f"delta_{seq:06d}.pkl")
+
+    def reset(self):
+        """Drop any checkpoint left by a previous run."""
+        if os.path.isdir(self.directory):
+            for name in os.listdir(self.directory):
+                os.remove(os.path.join(self.directory, name))
+        self._seq = self._base_seq = 0
+        self._marks = None
+
+    # ---------- Saving ----------
+    def save(self, sim, **extra):
+        """Checkpoint sim; extra keyword values come back from load()["extra"]."""
+        os.makedirs(self.directory, exist_ok=True)
+        self._seq += 1
+        full = self._marks is None or self._seq - self._base_seq > self.compact_every
+        marks = _Marks() if full else self._marks
+        delta = self._delta(sim, marks, extra)
+
+        if full:
+            _atomic_dump(delta, os.path.join(self.directory, BASE_FILE))
+            for name in os.listdir(self.directory):
+                if name.startswith("delta_"):
+                    os.remove(os.path.join(self.directory, name))
+            self._base_seq = self._seq
+        else:
+            _atomic_dump(delta, self._delta_path(self._seq))
+        self._marks = _Marks.of(sim)
+
+    def _delta(self, sim, marks, extra):
+        bars = sim.bars
+        return {
+            "seq": self._seq,
+            "minute": sim.minute,
+            "extra": extra,
+            "prices": {
+                s: sim.price_history.series(s)[marks.prices.get(s, 0) :].copy()
+                for s in sim.price_history
+            },
+            "bars": {s: bars.records(s, marks.bars.get(s, 0)) for s in bars.symbols},
+            "curves": {
+                name: vals[marks.curves.get(name, 0) :]
+                for name, vals in sim.curves.items()
+            },
+            "trades_log": {
+                name: log[marks.trades_log.get(name, 0) :]
+                for name, log in sim.trades_log.items()
+            },
+            "portfolios": {
+                name: {
+                    "cash": p.cash,
+                    "trades": p.trades,
+                    "positions": copy.deepcopy(p.positions),
+                    "new_trades": p.trade_history[marks.trades.get(name, 0) :],
+                }
+                for name, p in sim.portfolios.items()
+            },
+            "penguins": {p.name: p.state() for p in sim.penguins},
+        }
+
+    # ---------- Loading ----------
+    def load(self):
+        """
+        Latest checkpointed state, merged from base and deltas, or None.
+
+        The returned state also primes this Checkpointer, so the next
+        save() continues the same delta chain.
+        """
+        base_path = os.path.join(self.directory, BASE_FILE)
+        if not os.path.exists(base_path):
+            return None
+        with open(base_path, "rb") as f:
+            state = pickle.load(f)
+        state["prices"] = {s: [a] for s, a in state["prices"].items()}
+        state["bars"] = {s: [a] for s, a in state["bars"].items()}
+        self._base_seq = state["seq"]
+
+        seq = state["seq"] + 1
+        while os.path.exists(self._delta_path(seq)):
+            with open(self._delta_path(seq), "rb") as f:
+                delta = pickle.load(f)
+            self._apply(state, delta)
+            seq += 1
+        self._seq = seq - 1
+        return state
+
+    @staticmethod
+    def _apply(state, delta):
+        for key in ("seq", "minute", "extra", "penguins"):
+            state[key] = delta[key]
+        for s, tail in delta["prices"].items():
+            state["prices"].setdefault(s, []).append(tail)
+        for s, tail in delta["bars"].items():
+            state["bars"].setdefault(s, []).append(tail)
+        for key in ("curves", "trades_log"):
+            for name, tail in delta[key].items():
+                state[key].setdefault(name, []).extend(tail)
+        for name, p in delta["portfolios"].items():
+            saved = state["portfolios"].setdefault(name, {"new_trades": TradeLedger()})
+            new_trades = saved["new_trades"] + p["new_trades"]
+            saved.update(p)
+            saved["new_trades"] = new_trades
+
+    def restore(self, sim, state):
+        """Load a state from load() into a freshly built Simulator."""
+        sim.minute = state["minute"]
+        for s, chunks in state["prices"].items():
+            for chunk in chunks:
+                sim.price_history.extend(s, chunk)
+        for s, chunks in state["bars"].items():
+            for chunk in chunks:
+                sim.bars.extend(s, chunk)
+        for name, vals in state["curves"].items():
+            sim.curves[name][:] = vals
+        for name, log in state["trades_log"].items():
+            sim.trades_log[name][:] = log
+        for name, p in state["portfolios"].items():
+            portfolio = sim.portfolios[name]
+            portfolio.cash = p["cash"]
+            portfolio.trades = p["trades"]
+            portfolio.positions = p["positions"]
+            portfolio.trade_history = p["new_trades"]
+            portfolio.rebuild_symbol_stats()
+        sim.book.load(sim.portfolios)
+        for penguin in sim.penguins:
+            if penguin.name in state["penguins"]:
+                penguin.load_state(state["penguins"][penguin.name])
+        self._marks = _Marks.of(sim)
+
+
+class _Marks:
+    """How much of each growing series a checkpoint already holds."""
+
+    def __init__(self):
+        self.prices = {}
+        self.bars = {}
+        self.curves = {}
+        self.trades_log = {}
+        self.trades = {}
+
+    @classmethod
+    def of(cls, sim):
+        marks = cls()
+        marks.prices = dict(zip(sim.price_history.symbols, sim.price_history.lengths))
+        marks.bars = dict(zip(sim.bars.symbols, sim.bars.lengths))
+        marks.curves = {name: len(v) for name, v in sim.curves.items()}
+        marks.trades_log = {name: len(v) for name, v in sim.trades_log.items()}
+        marks.trades = {
+            name: len(p.trade_history) for name, p in sim.portfolios.items()
+        }
+        return marks
@@ -0,0 +1,116 @@
+"""
+Rebuild portfolios and capital curves from a run's recorded logs.
+
+Everything streams: the journal and trades.txt are read line by line
+through generators, and each replay is itself an iterator, so a long
+run never has to fit in memory as text.
+
+- data.journal.JournalReplay replays journal.jsonl: recorded fills go
+  through Portfolio.buy/sell with the run's own fee settings and each
+  bar's values are the replayed portfolios marked at the recorded mids,
+  checked against the recorded per-minute values.
+- TradesLogReplay replays a trades.txt from runs that predate the
+  journal. Those logs hold fills but no quotes or fee settings, so fees
+  are assumed and positions can only be marked at each symbol's last
+  traded price.
+"""
+
+import json
+import os
+
+from backtest.portfolio import Portfolio
+from data.archive import iter_trades_log
+from data.journal import JournalReplay
+
+
+class TradesLogReplay:
+    """Iterate (penguin, trade number, value) over a trades.txt."""
+
+    def __init__(self, path, fee_per_trade=1.0, enable_fees=True):
+        self.path = path
+        self.fee_per_trade = fee_per_trade
+        self.enable_fees = enable_fees
+        self.header = {}
+        self.portfolios = {}
+        self.curves = {}  # {penguin: [value after each trade]}
+        self.latest_prices = {}  # Last traded price per symbol
+
+    def __iter__(self):
+        portfolio = None
+        for kind, key, value in iter_trades_log(self.path):
+            if kind == "header":
+                self.header[key] = value
+            elif kind == "penguin":
+                portfolio = self.portfolios[key] = Portfolio(
+                    cash=self.header.get("initial_capital") or 5000.0,
+                    fee_per_trade=self.fee_per_trade,
+                    enable_fees=self.enable_fees,
+                )
+                self.curves[key] = [portfolio.cash]
+            elif kind == "trade":
+                minute, side, qty, symbol, price, _ = value
+                trade = portfolio.buy if side == "BUY" else portfolio.sell
+                trade(symbol, price, qty=qty, bar=-1 if minute is None else minute)
+                self.latest_prices[symbol] = price
+                v = portfolio.value(self.latest_prices)
+                self.curves[key].append(v)
+                yield key, len(self.curves[key]) - 1, v
+
+    def run(self):
+        for _ in self:
+            pass
+        return self
+
+
+def _find(run_dir, prefix, suffix):
+    names = sorted(
+        n for n in os.listdir(run_dir) if n.startswith(prefix) and n.endswith(suffix)
+    )
+    return os.path.join(run_dir, names[0]) if names else None
+
+
+def load_run(run_dir, fee_per_trade=1.0, enable_fees=True):
+    """
+    Curves, portfolios and latest prices for an archived run directory.
+
+    Uses the journal when the run has one (exact unless the replay drifts
+    from the recorded values). Otherwise curves come from the recorded
+    data*.json (exact) or, failing that, from the trades*.txt replay, and
+    portfolios always from that replay, with the given fee and positions
+    marked at last traded prices (approximate).
+
+    Returns:
+        dict with "curves", "portfolios", "latest_prices", "curves_exact",
+        "portfolios_exact", or None when the directory holds nothing to replay
+    """
+    journal = _find(run_dir, "journal", ".jsonl")
+    if journal:
+        replay = JournalReplay(journal).run()
+        return {
+            "curves": replay.curves,
+            "portfolios": replay.portfolios,
+            "latest_prices": replay.latest_prices,
+            "curves_exact": not replay.mismatches,
+            "portfolios_exact": not replay.mismatches,
+        }
+
+    data_file = _find(run_dir, "data", ".json")
+    trades_file = _find(run_dir, "trades", ".txt")
+    if not data_file and not trades_file:
+        return None
+
+    curves, portfolios, latest_prices = {}, {}, {}
+    if trades_file:
+        replay = TradesLogReplay(trades_file, fee_per_trade, enable_fees).run()
+        curves, portfolios = replay.curves, replay.portfolios
+        latest_prices = replay.latest_prices
+    if data_file:
+        with open(data_file, "r") as f:
+            curves = json.load(f)  # Recorded per-minute values beat per-trade ones
+    return {
+        "curves": curves,
+        "portfolios": portfolios,
+        "latest_prices": latest_prices,
+        "curves_exact": bool(data_file),
+        "portfolios_exact": False,
+    }
@@ -1,3 +1,6 @@
+import numpy as np
+
+
 def evaluate(portfolio, price_history):
     final_prices = {s: prices[-1] for s, prices in price_history.items()}
 
@@ -5,7 +8,7 @@ def evaluate(portfolio, price_history):
 
     oracle = 0
     for s, prices in price_history.items():
-        if prices:
+        if len(prices):
             oracle += max(prices) - min(prices)
 
     return {
@@ -14,3 +17,25 @@ def evaluate(portfolio, price_history):
         "cash": round(portfolio.cash, 2),
         "oracle_edge": round(oracle, 2),
     }
+
+
+def curve_metrics(curve, initial_capital):
+    """Summarize a capital curve: final value, PnL, max drawdown and Sharpe."""
+    values = np.asarray(curve, dtype=float)
+    if len(values) == 0:
+        values = np.array([initial_capital])
+
+    final_value = values[-1]
+    peak = np.maximum.accumulate(values)
+    drawdown = (peak - values) / np.where(peak > 0, peak, 1.0)
+
+    returns = np.diff(values) / values[:-1] if len(values) > 1 else np.zeros(1)
+    std = returns.std()
+    sharpe = returns.mean() / std * np.sqrt(len(returns)) if std > 0 else 0.0
+
+    return {
+        "final_value": round(float(final_value), 2),
+        "pnl_pct": round(float((final_value / initial_capital - 1) * 100), 3),
+        "max_drawdown_pct": round(float(drawdown.max() * 100), 3),
+        "sharpe": round(float(sharpe), 3),
+    }
@@ -1,8 +1,15 @@
 from dataclasses import dataclass, field
-from typing import Dict, List
+from typing import Dict
 
+import numpy as np
 
-@dataclass
+# Decision codes used by vectorized penguins (see BasePenguin.decide_batch)
+HOLD, BUY, SELL = 0, 1, -1
+DECISION_CODES = {"HOLD": HOLD, "BUY": BUY, "SELL": SELL}
+DECISION_NAMES = {HOLD: "HOLD", BUY: "BUY", SELL: "SELL"}
+
+
+@dataclass(slots=True)
 class Trade:
     """Record of a single buy/sell transaction."""
 
@@ -11,6 +18,187 @@ class Trade:
     qty: int
     price: float
     fee: float
+    bar: int = -1  # Bar the fill happened on, -1 if unknown
+
+
+class TradeLedger:
+    """
+    Columnar trade history: one array per field, one row per fill.
+
+    Symbols are interned to int32 ids (names in .symbols) and sides are
+    stored as the BUY/SELL codes, so a fill costs ~37 bytes instead of a
+    Python object. Columns are preallocated and double when full, like
+    PriceHistory.
+
+    Reads mirror the old list of Trade: ledger[-1].qty, iteration and len()
+    work as before, and ledger[a:b] is a new (copied) TradeLedger.
+    column() and columns() return views for analytics; a view stays valid
+    until an append grows the buffer.
+    """
+
+    DTYPES = {
+        "symbol": np.int32,
+        "side": np.int8,
+        "qty": np.int64,
+        "price": np.float64,
+        "fee": np.float64,
+        "bar": np.int64,
+    }
+
+    def __init__(self, trades=(), capacity: int = 64):
+        self.symbols = []  # symbol id -> symbol
+        self._ids = {}  # {symbol: id}
+        self._n = 0
+        self._cols = {
+            name: np.empty(max(capacity, 1), dtype=dtype)
+            for name, dtype in self.DTYPES.items()
+        }
+        for t in trades:
+            self.append(t.symbol, DECISION_CODES[t.side], t.qty, t.price, t.fee, t.bar)
+
+    def _intern(self, symbol: str) -> int:
+        sid = self._ids.get(symbol)
+        if sid is None:
+            sid = self._ids[symbol] = len(self.symbols)
+            self.symbols.append(symbol)
+        return sid
+
+    def _reserve(self, n: int) -> None:
+        cap = len(self._cols["side"])
+        if n <= cap:
+            return
+        while cap < n:
+            cap *= 2
+        for name, col in self._cols.items():
+            grown = np.empty(cap, dtype=col.dtype)
+            grown[: self._n] = col[: self._n]
+            self._cols[name] = grown
+
+    # ---------- Writes ----------
+    def append(self, symbol, side, qty, price, fee, bar=-1) -> None:
+        """Add a fill; side is the BUY or SELL code."""
+        self._reserve(self._n + 1)
+        i = self._n
+        cols = self._cols
+        cols["symbol"][i] = self._intern(symbol)
+        cols["side"][i] = side
+        cols["qty"][i] = qty
+        cols["price"][i] = price
+        cols["fee"][i] = fee
+        cols["bar"][i] = bar
+        self._n = i + 1
+
+    def extend(self, other: "TradeLedger") -> None:
+        """Append every row of another ledger, re-mapping its symbol ids."""
+        end = self._n + len(other)
+        self._reserve(end)
+        remap = np.array([self._intern(s) for s in other.symbols], dtype=np.int32)
+        for name, col in other.columns().items():
+            if name == "symbol" and len(remap):
+                col = remap[col]
+            self._cols[name][self._n : end] = col
+        self._n = end
+
+    def __add__(self, other: "TradeLedger") -> "TradeLedger":
+        joined = self[:]
+        joined.extend(other)
+        return joined
+
+    # ---------- Reads ----------
+    def column(self, name: str) -> np.ndarray:
+        """One field for all fills (view)."""
+        return self._cols[name][: self._n]
+
+    def columns(self):
+        """{field: view} for all fills."""
+        return {name: col[: self._n] for name, col in self._cols.items()}
+
+    def _trade(self, i: int) -> Trade:
+        cols = self._cols
+        return Trade(
+            self.symbols[cols["symbol"][i]],
+            DECISION_NAMES[int(cols["side"][i])],
+            int(cols["qty"][i]),
+            float(cols["price"][i]),
+            float(cols["fee"][i]),
+            int(cols["bar"][i]),
+        )
+
+    def net_qty(self) -> Dict[str, int]:
+        """{symbol: qty bought - qty sold} over all fills."""
+        cols = self.columns()
+        signed = np.where(cols["side"] == BUY, cols["qty"], -cols["qty"])
+        totals = np.bincount(
+            cols["symbol"], weights=signed, minlength=len(self.symbols)
+        )
+        return {s: int(q) for s, q in zip(self.symbols, totals.tolist())}
+
+    def __len__(self) -> int:
+        return self._n
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            start, stop, step = key.indices(self._n)
+            part = TradeLedger(capacity=max(len(range(start, stop, step)), 1))
+            part.symbols = list(self.symbols)
+            part._ids = dict(self._ids)
+            for name, col in self._cols.items():
+                rows = col[start:stop:step]
+                part._cols[name][: len(rows)] = rows
+            part._n = len(range(start, stop, step))
+            return part
+        if key < 0:
+            key += self._n
+        if not 0 <= key < self._n:
+            raise IndexError("trade index out of range")
+        return self._trade(key)
+
+    def __iter__(self):
+        cols = self.columns()
+        for sid, side, qty, price, fee, bar in zip(
+            cols["symbol"].tolist(),
+            cols["side"].tolist(),
+            cols["qty"].tolist(),
+            cols["price"].tolist(),
+            cols["fee"].tolist(),
+            cols["bar"].tolist(),
+        ):
+            yield Trade(self.symbols[sid], DECISION_NAMES[side], qty, price, fee, bar)
+
+    def __repr__(self) -> str:
+        return f"TradeLedger({self._n} trades, {len(self.symbols)} symbols)"
+
+    # ---------- Pickling (only the used rows) ----------
+    def __getstate__(self):
+        return {"symbols": self.symbols, "columns": self.columns()}
+
+    def __setstate__(self, state):
+        self.__init__(capacity=len(state["columns"]["side"]))
+        self.symbols = list(state["symbols"])
+        self._ids = {s: i for i, s in enumerate(self.symbols)}
+        for name, col in state["columns"].items():
+            self._cols[name][: len(col)] = col
+        self._n = len(state["columns"]["side"])
+
+
+@dataclass
+class SymbolStats:
+    """Running trade totals for one symbol, updated on every fill."""
+
+    buy_count: int = 0
+    sell_count: int = 0
+    qty_bought: int = 0
+    qty_sold: int = 0
+    cost: float = 0.0  # Spent on buys (including fees)
+    revenue: float = 0.0  # Received from sells (minus fees)
+
+    @property
+    def net_qty(self) -> int:
+        return self.qty_bought - self.qty_sold
+
+    @property
+    def realized_pnl(self) -> float:
+        return self.revenue - self.cost
 
 
 @dataclass
@@ -26,9 +214,33 @@ class Portfolio:
     enable_fees: bool = True
     positions: Dict[str, Position] = field(default_factory=dict)
     trades: int = 0
-    trade_history: List[Trade] = field(default_factory=list)  # Track all trades
+    trade_history: TradeLedger = field(default_factory=TradeLedger)  # All fills
+    symbol_stats: Dict[str, SymbolStats] = field(default_factory=dict)
 
-    def buy(self, symbol: str, price: float, qty: int):
+    def _record(self, symbol, side, qty, price, fee, bar):
+        self.trade_history.append(symbol, side, qty, price, fee, bar)
+        self._count(symbol, side, qty, price, fee)
+
+    def _count(self, symbol, side, qty, price, fee):
+        stats = self.symbol_stats.get(symbol)
+        if stats is None:
+            stats = self.symbol_stats[symbol] = SymbolStats()
+        if side == BUY:
+            stats.buy_count += 1
+            stats.qty_bought += qty
+            stats.cost += qty * price + fee
+        else:
+            stats.sell_count += 1
+            stats.qty_sold += qty
+            stats.revenue += qty * price - fee
+
+    def rebuild_symbol_stats(self):
+        """Recompute symbol_stats from trade_history (after restoring it)."""
+        self.symbol_stats = {}
+        for t in self.trade_history:
+            self._count(t.symbol, DECISION_CODES[t.side], t.qty, t.price, t.fee)
+
+    def buy(self, symbol: str, price: float, qty: int, bar: int = -1):
         # Prevent buying at $0 (data retrieval error)
         if price <= 0:
             return False
@@ -40,7 +252,7 @@ class Portfolio:
 
         self.cash -= cost
         self.trades += 1
-        self.trade_history.append(Trade(symbol, "BUY", qty, price, fee))
+        self._record(symbol, BUY, qty, price, fee, bar)
 
         if symbol in self.positions:
             pos = self.positions[symbol]
@@ -52,7 +264,7 @@ class Portfolio:
 
         return True
 
-    def sell(self, symbol: str, price: float, qty: int):
+    def sell(self, symbol: str, price: float, qty: int, bar: int = -1):
         # Prevent selling at $0 (data retrieval error)
         if price <= 0:
             return False
@@ -66,7 +278,7 @@ class Portfolio:
         fee = self.fee_per_trade if self.enable_fees else 0.0
         self.cash += price * qty - fee
         self.trades += 1
-        self.trade_history.append(Trade(symbol, "SELL", qty, price, fee))
+        self._record(symbol, SELL, qty, price, fee, bar)
         pos.qty -= qty
 
         if pos.qty == 0:
@@ -93,45 +305,15 @@ class Portfolio:
     def get_symbol_summary(self, prices: Dict[str, float] | None = None):
         """Return summary of trades per symbol, including current position info."""
         summary = {}
-
-        for trade in self.trade_history:
-            symbol = trade.symbol
-            if symbol not in summary:
-                summary[symbol] = {
-                    "buy_count": 0,
-                    "sell_count": 0,
-                    "total_qty_bought": 0,
-                    "total_qty_sold": 0,
-                    "total_cost": 0,  # Total spent on buys (including fees)
-                    "total_revenue": 0,  # Total received from sells (minus fees)
-                }
-
-            if trade.side == "BUY":
-                summary[symbol]["buy_count"] += 1
-                summary[symbol]["total_qty_bought"] += trade.qty
-                summary[symbol]["total_cost"] += trade.qty * trade.price + trade.fee
-            else:  # SELL
-                summary[symbol]["sell_count"] += 1
-                summary[symbol]["total_qty_sold"] += trade.qty
-                summary[symbol]["total_revenue"] += trade.qty * trade.price - trade.fee
-
+        symbols = list(self.symbol_stats)
         # Ensure symbols with open positions are included
-        for symbol in self.positions:
-            if symbol not in summary:
-                summary[symbol] = {
-                    "buy_count": 0,
-                    "sell_count": 0,
-                    "total_qty_bought": 0,
-                    "total_qty_sold": 0,
-                    "total_cost": 0,
-                    "total_revenue": 0,
-                }
+        symbols += [s for s in self.positions if s not in self.symbol_stats]
 
         # Calculate PnL for each symbol (realized + unrealized)
-        for symbol in summary:
-            cost = summary[symbol]["total_cost"]
-            revenue = summary[symbol]["total_revenue"]
-            realized_pnl = revenue - cost
+        for symbol in symbols:
+            stats = self.symbol_stats.get(symbol) or SymbolStats()
+            cost = stats.cost
+            realized_pnl = stats.realized_pnl
 
             pos = self.positions.get(symbol)
             position_qty = pos.qty if pos else 0
@@ -148,12 +330,20 @@ class Portfolio:
             total_pnl = realized_pnl + unrealized_pnl
             total_pnl_pct = (total_pnl / cost * 100) if cost > 0 else 0
 
-            summary[symbol]["realized_pnl"] = realized_pnl
-            summary[symbol]["unrealized_pnl"] = unrealized_pnl
-            summary[symbol]["total_pnl"] = total_pnl
-            summary[symbol]["pnl_pct"] = total_pnl_pct
-            summary[symbol]["position_qty"] = position_qty
-            summary[symbol]["market_value"] = market_value
-            summary[symbol]["market_price"] = market_price
+            summary[symbol] = {
+                "buy_count": stats.buy_count,
+                "sell_count": stats.sell_count,
+                "total_qty_bought": stats.qty_bought,
+                "total_qty_sold": stats.qty_sold,
+                "total_cost": cost,
+                "total_revenue": stats.revenue,
+                "realized_pnl": realized_pnl,
+                "unrealized_pnl": unrealized_pnl,
+                "total_pnl": total_pnl,
+                "pnl_pct": total_pnl_pct,
+                "position_qty": position_qty,
+                "market_value": market_value,
+                "market_price": market_price,
+            }
 
         return summary
@@ -0,0 +1,91 @@
+import numpy as np
+
+
+class PortfolioBook:
+    """
+    Holdings of every penguin as arrays, for marking them all at once.
+
+    qty and avg_price are (penguins x symbols) matrices and cash is a
+    vector, so values() is one matrix-vector product against the price
+    vector instead of a dict walk per penguin.
+
+    The Portfolio objects stay the source of truth (penguins read their
+    positions); the book mirrors them. Call sync() after a fill and
+    load() after restoring portfolios wholesale.
+    """
+
+    def __init__(self, names, symbols):
+        self.names = list(names)
+        self.symbols = []
+        self._rows = {name: i for i, name in enumerate(self.names)}
+        self._cols = {}  # {symbol: column}
+        n = len(self.names)
+        self.cash = np.zeros(n)
+        self.qty = np.zeros((n, max(len(symbols), 1)))
+        self.avg_price = np.zeros_like(self.qty)
+        for s in symbols:
+            self._col(s)
+
+    def _col(self, symbol: str) -> int:
+        col = self._cols.get(symbol)
+        if col is None:
+            col = len(self.symbols)
+            if col >= self.qty.shape[1]:
+                pad = ((0, 0), (0, self.qty.shape[1]))
+                self.qty = np.pad(self.qty, pad)
+                self.avg_price = np.pad(self.avg_price, pad)
+            self._cols[symbol] = col
+            self.symbols.append(symbol)
+        return col
+
+    # ---------- Writes ----------
+    def sync(self, name: str, portfolio, symbol: str = None) -> None:
+        """Copy cash and one symbol's position (or all) from portfolio."""
+        row = self._rows[name]
+        self.cash[row] = portfolio.cash
+        symbols = [symbol] if symbol is not None else portfolio.positions
+        for s in symbols:
+            col = self._col(s)
+            pos = portfolio.positions.get(s)
+            self.qty[row, col] = pos.qty if pos else 0
+            self.avg_price[row, col] = pos.avg_price if pos else 0.0
+
+    def load(self, portfolios) -> None:
+        """Rebuild every row from {name: Portfolio}."""
+        self.qty[:] = 0
+        self.avg_price[:] = 0
+        for name, portfolio in portfolios.items():
+            self.sync(name, portfolio)
+
+    # ---------- Reads ----------
+    def price_vector(self, prices) -> np.ndarray:
+        """{symbol: price} -> vector in column order, NaN where missing."""
+        return np.fromiter(
+            (prices.get(s, np.nan) for s in self.symbols),
+            dtype=np.float64,
+            count=len(self.symbols),
+        )
+
+    def values(self, prices) -> np.ndarray:
+        """
+        Portfolio value per penguin, in self.names order.
+
+        Like Portfolio.value, positions without a valid (> 0) price are
+        marked at their average purchase price.
+
+        Args:
+            prices: {symbol: price} or a vector from price_vector()
+        """
+        if isinstance(prices, dict):
+            prices = self.price_vector(prices)
+        n = len(self.symbols)
+        qty = self.qty[:, :n]
+        valid = prices > 0
+        if valid.all():
+            return self.cash + qty @ prices
+        marks = np.where(valid, prices, self.avg_price[:, :n])
+        return self.cash + np.einsum("ij,ij->i", qty, marks)
+
+    def value_dict(self, prices):
+        """{name: value} for every penguin."""
+        return dict(zip(self.names, self.values(prices).tolist()))
@@ -0,0 +1,45 @@
+import time
+
+
+def replay_bars(
+    sim, price_history, spread_pct=0.001, fast=True, bar_seconds=60.0, bars=None
+):
+    """
+    Feed stored minute bars through a Simulator one bar at a time.
+
+    Each stored price is treated as the bar's mid; bid/ask are placed
+    symmetrically around it using a synthetic spread.
+
+    Args:
+        sim: Simulator holding the penguins and portfolios
+        price_history: {symbol: [prices]} oldest first
+        spread_pct: Bid/ask spread as a fraction of the mid price
+        fast: Skip the wall-clock wait between bars
+        bar_seconds: Bar length used when fast is False
+        bars: Optional {symbol: BAR_DTYPE array} aligned with price_history;
+            fills the simulator's OHLCV store with the real bars
+
+    Returns:
+        The same Simulator, advanced by one step per bar
+    """
+    length = max((len(p) for p in price_history.values()), default=0)
+
+    for i in range(length):
+        bid_ask_prices = {}
+        for s in sim.symbols:
+            prices = price_history.get(s)
+            if prices is None or i >= len(prices):
+                continue
+            mid = prices[i]
+            half_spread = mid * spread_pct / 2
+            bid_ask_prices[s] = (mid - half_spread, mid + half_spread)
+
+        step_bars = None
+        if bars is not None:
+            step_bars = {s: tuple(bars[s][i])[1:] for s in bid_ask_prices if s in bars}
+        sim.step(bid_ask_prices, bars=step_bars)
+
+        if not fast:
+            time.sleep(bar_seconds)
+
+    return sim
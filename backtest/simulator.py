@@ -1,25 +1,255 @@
-from collections import defaultdict
-from backtest.portfolio import Portfolio
+from time import perf_counter
+
+import numpy as np
+
+from backtest.portfolio import Portfolio, DECISION_NAMES
+from backtest.portfolio_book import PortfolioBook
+from data.bar_store import BarStore
+from data.price_history import PriceHistory
+from indicators.context import IndicatorContext
 
 
 class Simulator:
-    def __init__(self, agent, symbols):
-        self.agent = agent
+    """
+    Runs one bar of trading for a roster of penguins.
+
+    The live loop in run_simulation.py and the offline replay in
+    backtest/replay.py both drive this class, so a replay produces the same
+    curves and trade log a live session would.
+    """
+
+    def __init__(
+        self,
+        penguins,
+        symbols,
+        initial_capital=5000.0,
+        fee_per_trade=1.0,
+        enable_fees=True,
+        verbose=True,
+        journal=None,
+        timer=None,
+    ):
+        self.penguins = penguins
         self.symbols = symbols
-        self.portfolio = Portfolio()
-        self.price_history = defaultdict(list)
-
-    def step(self, prices):
-        for symbol, price in prices.items():
-            self.price_history[symbol].append(price)
-            decision, qty = self.agent.decide(
-                symbol,
-                self.price_history[symbol],
-                self.portfolio,
+        self.verbose = verbose
+        self.portfolios = {
+            p.name: Portfolio(
+                cash=initial_capital,
+                fee_per_trade=fee_per_trade,
+                enable_fees=enable_fees,
+            )
+            for p in penguins
+        }
+        # All portfolios as arrays, marked with one dot product per bar
+        self.book = PortfolioBook([p.name for p in penguins], symbols)
+        self.book.load(self.portfolios)
+        self.price_history = PriceHistory(symbols)
+        self.bars = BarStore(symbols)  # OHLCV per bar, for atr/obv and reports
+        self.context = IndicatorContext()  # Per-bar indicator cache
+        self.curves = {p.name: [] for p in penguins}
+        self.trades_log = {p.name: [] for p in penguins}  # [(minute, trade_str)]
+        self.minute = 0
+        self.journal = journal  # Optional data.journal.Journal
+        self.timer = timer  # Optional instrumentation.LoopTimer
+        if journal is not None:
+            journal.start_run(
+                symbols,
+                [p.name for p in penguins],
+                initial_capital,
+                fee_per_trade,
+                enable_fees,
+            )
+
+    def latest_prices(self):
+        latest = {}
+        for s in self.symbols:
+            price = self.price_history.last(s)
+            if price is not None:
+                latest[s] = price
+        return latest
+
+    def values(self):
+        """{penguin: current portfolio value} from the book."""
+        return self.book.value_dict(self.latest_prices())
+
+    def step(
+        self,
+        bid_ask_prices,
+        price_source=None,
+        minute=None,
+        bars=None,
+        quotes_fed=False,
+    ):
+        """
+        Record one bar of quotes, let every penguin trade, then mark portfolios.
+
+        Args:
+            bid_ask_prices: {symbol: (bid, ask)} for symbols quoted this bar
+            price_source: Optional {symbol: "real" | "synthetic"}
+            minute: Bar number used in the trade log (defaults to a counter)
+            bars: Optional finished {symbol: (open, high, low, close, volume,
+                vwap)}; without it the bar is aggregated from quotes
+            quotes_fed: A quote stream already folds every quote into
+                self.bars (QuoteBook.on_update), so only synthetic quotes are
+                added here before the bar is closed
+        """
+        lap = perf_counter() if self.timer is not None else None
+        self.minute = minute if minute is not None else self.minute + 1
+        price_source = price_source or {}
+        self.context.new_bar(self.minute)
+
+        for s, (bid, ask) in bid_ask_prices.items():
+            self.price_history.append(s, (bid + ask) / 2)  # Mid for history/charting
+        if self.journal is not None:
+            self.journal.bar(self.minute, bid_ask_prices, price_source)
+
+        if bars is not None:
+            for s, bar in bars.items():
+                self.bars.append(s, *bar)
+        else:
+            for s, (bid, ask) in bid_ask_prices.items():
+                if not quotes_fed or price_source.get(s) == "synthetic":
+                    self.bars.update_quote(s, bid, ask)
+            self.bars.close_bar()
+
+        if lap is not None:
+            lap = self._lap("step/ingest", lap)
+
+        # One zero-copy view per symbol, shared by every penguin this bar
+        views = {
+            s: self.price_history.series(s) for s in self.symbols if s in bid_ask_prices
+        }
+
+        batch = None
+        for penguin in self.penguins:
+            portfolio = self.portfolios[penguin.name]
+            if penguin.has_native_batch:
+                batch = batch or self._batch_inputs(views, bid_ask_prices)
+                decisions = self._decide_batch(penguin, portfolio, batch)
+            else:
+                decisions = self._decide_each(penguin, portfolio, views, bid_ask_prices)
+
+            for s, decision, qty in decisions:
+                bid, ask = bid_ask_prices[s]
+                if self.journal is not None and decision != "HOLD":
+                    self.journal.decision(penguin.name, s, decision, qty)
+
+                if decision == "BUY":
+                    # Validate price is not $0 before buying
+                    if ask <= 0:
+                        self._log(
+                            f"    ⚠️ {penguin.name} skipped BUY {qty} {s} - invalid price ${ask:.2f}"
+                        )
+                        continue
+                    # Buy at ask price
+                    if portfolio.buy(s, ask, qty=qty, bar=self.minute):
+                        self._record(penguin, portfolio, "BUY", s, ask, price_source)
+                elif decision == "SELL":
+                    # Validate price is not $0 before selling
+                    if bid <= 0:
+                        self._log(
+                            f"    ⚠️ {penguin.name} skipped SELL {qty} {s} - invalid price ${bid:.2f}"
+                        )
+                        continue
+                    # Sell at bid price
+                    if portfolio.sell(s, bid, qty=qty, bar=self.minute):
+                        self._record(penguin, portfolio, "SELL", s, bid, price_source)
+
+        if lap is not None:
+            lap = self._lap("step/decide", lap)
+
+        # Record portfolio values
+        for penguin, value in zip(
+            self.penguins, self.book.values(self.latest_prices())
+        ):
+            self.curves[penguin.name].append(float(value))
+        if self.journal is not None:
+            self.journal.values(
+                {p.name: self.curves[p.name][-1] for p in self.penguins}
             )
+        if lap is not None:
+            self._lap("step/value", lap)
+
+    def _lap(self, phase, start):
+        now = perf_counter()
+        self.timer.add(phase, now - start)
+        return now
 
-            if decision == "BUY":
-                self.portfolio.buy(symbol, price, qty=qty)
+    def _decide_each(self, penguin, portfolio, views, bid_ask_prices):
+        """Yield (symbol, decision, qty) one symbol at a time.
+
+        Lazy on purpose: each fill lands before the next symbol is decided,
+        so penguins that look at cash or positions see them up to date.
+        """
+        timer = self.timer
+        for s, mid_prices in views.items():
+            bid, ask = bid_ask_prices[s]
+            start = perf_counter() if timer is not None else None
+            try:
+                decision, qty = penguin.decide(
+                    s, mid_prices, bid, ask, portfolio, ctx=self.context
+                )
+            except Exception as e:
+                print(f"    ❌ {penguin.name} error on {s}: {e}")
+                continue
+            finally:
+                if start is not None:
+                    timer.decide(penguin.name, s, perf_counter() - start)
+            yield s, decision, qty
+
+    def _batch_inputs(self, views, bid_ask_prices):
+        """Arrays shared by every decide_batch call this bar."""
+        symbols = self.price_history.symbols
+        bids = np.full(len(symbols), np.nan)
+        asks = np.full(len(symbols), np.nan)
+        for i, s in enumerate(symbols):
+            if s in views:
+                bids[i], asks[i] = bid_ask_prices[s]
+        return {
+            "symbols": symbols,
+            "prices_matrix": self.price_history.matrix(),
+            "lengths": self.price_history.lengths,
+            "bids": bids,
+            "asks": asks,
+        }
+
+    def _decide_batch(self, penguin, portfolio, batch):
+        """Yield (symbol, decision, qty) for non-HOLD rows of one decide_batch call."""
+        symbols = batch["symbols"]
+        positions = np.array([portfolio.get_position(s) for s in symbols])
+        start = perf_counter() if self.timer is not None else None
+        try:
+            decisions, quantities = penguin.decide_batch(
+                positions=positions, portfolio=portfolio, ctx=self.context, **batch
+            )
+        except Exception as e:
+            print(f"    ❌ {penguin.name} batch error: {e}")
+            return
+        finally:
+            if start is not None:
+                self.timer.decide(penguin.name, None, perf_counter() - start)
+        for i in np.flatnonzero(decisions):
+            yield symbols[i], DECISION_NAMES[int(decisions[i])], int(quantities[i])
+
+    def _record(self, penguin, portfolio, side, symbol, price, price_source):
+        # Log the trade as filled (a SELL may be clipped to the held qty)
+        trade = portfolio.trade_history[-1]
+        self.book.sync(penguin.name, portfolio, symbol)
+        qty = trade.qty
+        quote_side = "ask" if side == "BUY" else "bid"
+        synthetic = price_source.get(symbol) == "synthetic"
+        if self.journal is not None:
+            self.journal.fill(
+                penguin.name, symbol, side, qty, price, trade.fee, synthetic
+            )
+        source_marker = " [synthetic]" if synthetic else ""
+        self._log(
+            f"    ✓ {penguin.name} {side} {qty} {symbol} @ ${price:.2f} ({quote_side}){source_marker}"
+        )
+        self.trades_log[penguin.name].append(
+            (self.minute, f"{side} {qty} {symbol} @ ${price:.2f}{source_marker}")
+        )
 
-            elif decision == "SELL":
-                self.portfolio.sell(symbol, price, qty=qty)
+    def _log(self, message):
+        if self.verbose:
+            print(message)
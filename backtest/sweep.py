@@ -0,0 +1,154 @@
+"""
+Parameter sweeps: replay one stored dataset against many penguin settings.
+
+The price data is copied once into shared memory; every worker process
+maps the same buffer read-only, so adding workers does not add copies of
+the dataset and configurations run independently across cores.
+"""
+
+import itertools
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+import penguins
+from backtest.metrics import curve_metrics
+from backtest.replay import replay_bars
+from backtest.simulator import Simulator
+
+# Default search space per penguin class (constructor keyword -> values)
+DEFAULT_GRIDS = {
+    "BreakoutPenguin": {"lookback": [5, 10, 20, 40, 60]},
+    "CarefulTrendPenguin": {
+        "buy_consecutive": [2, 3, 4, 5],
+        "sell_consecutive": [2, 3, 4],
+    },
+    "RSIMeanReversionPenguin": {
+        "rsi_period": [7, 14, 21],
+        "oversold": [20, 25, 30, 35],
+        "overbought": [65, 70, 75, 80],
+    },
+    "VolatilityBreakoutPenguin": {
+        "period": [10, 20, 30, 50],
+        "std_mult": [1.0, 1.5, 2.0, 2.5, 3.0],
+    },
+    "MovingAverageCrossoverPenguin": {
+        "fast_period": [3, 5, 8, 13],
+        "slow_period": [20, 30, 50],
+        "use_ema": [False, True],
+    },
+}
+
+
+def grid_configs(grids):
+    """Every combination of every grid, as (class_name, params) pairs."""
+    configs = []
+    for class_name, grid in grids.items():
+        keys = list(grid)
+        for values in itertools.product(*(grid[k] for k in keys)):
+            configs.append((class_name, dict(zip(keys, values))))
+    return configs
+
+
+def random_configs(grids, samples, seed=0):
+    """`samples` random draws per penguin class from its grid values."""
+    rng = random.Random(seed)
+    configs = []
+    for class_name, grid in grids.items():
+        for _ in range(samples):
+            configs.append((class_name, {k: rng.choice(v) for k, v in grid.items()}))
+    return configs
+
+
+# ---------- Worker side ----------
+_shared = {}  # Per-process view of the shared dataset
+
+
+def _init_worker(shm_name, shape, symbols, lengths, sim_kwargs, spread_pct):
+    shm = shared_memory.SharedMemory(name=shm_name)
+    prices = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+    prices.flags.writeable = False
+    _shared.update(
+        shm=shm,  # Keep the mapping alive for the life of the worker
+        price_history={s: prices[i, : lengths[i]] for i, s in enumerate(symbols)},
+        symbols=symbols,
+        sim_kwargs=sim_kwargs,
+        spread_pct=spread_pct,
+    )
+
+
+def _run_config(config):
+    class_name, params = config
+    penguin = getattr(penguins, class_name)(**params)
+    sim = Simulator(
+        [penguin], _shared["symbols"], verbose=False, **_shared["sim_kwargs"]
+    )
+    replay_bars(sim, _shared["price_history"], spread_pct=_shared["spread_pct"])
+    portfolio = sim.portfolios[penguin.name]
+    result = {"penguin": class_name, "params": params, "trades": portfolio.trades}
+    result.update(
+        curve_metrics(
+            sim.curves[penguin.name], _shared["sim_kwargs"]["initial_capital"]
+        )
+    )
+    return result
+
+
+# ---------- Driver ----------
+def run_sweep(
+    price_history,
+    configs,
+    workers=None,
+    spread_pct=0.001,
+    rank_by="final_value",
+    initial_capital=5000.0,
+    fee_per_trade=1.0,
+    enable_fees=True,
+):
+    """
+    Replay price_history for every (class_name, params) config in parallel.
+
+    Args:
+        price_history: {symbol: [prices]} oldest first
+        configs: (penguin class name, constructor kwargs) pairs
+        workers: Process count (defaults to os.cpu_count())
+        rank_by: Metric to sort by; max_drawdown_pct ranks ascending
+
+    Returns:
+        List of result dicts, best first
+    """
+    symbols = list(price_history)
+    lengths = [len(price_history[s]) for s in symbols]
+    shape = (len(symbols), max(lengths, default=0))
+    sim_kwargs = {
+        "initial_capital": initial_capital,
+        "fee_per_trade": fee_per_trade,
+        "enable_fees": enable_fees,
+    }
+
+    shm = shared_memory.SharedMemory(create=True, size=max(1, 8 * shape[0] * shape[1]))
+    try:
+        prices = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+        prices[:] = np.nan
+        for i, s in enumerate(symbols):
+            prices[i, : lengths[i]] = price_history[s]
+
+        workers = workers or os.cpu_count() or 1
+        chunksize = max(1, len(configs) // (workers * 4))
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(shm.name, shape, symbols, lengths, sim_kwargs, spread_pct),
+        ) as pool:
+            results = list(pool.map(_run_config, configs, chunksize=chunksize))
+        del prices
+    finally:
+        shm.close()
+        shm.unlink()
+
+    descending = rank_by != "max_drawdown_pct"
+    results.sort(key=lambda r: r[rank_by], reverse=descending)
+    return results
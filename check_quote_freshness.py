@@ -161,21 +161,18 @@ def check_quote_freshness():
     # Check if market is open
     try:
         market_open = client.market_is_open()
-        clock = client.trading.get_clock()
     except Exception as e:
         print(f"⚠️  Could not check market status: {e}\n")
         market_open = None
-        clock = None
 
     if market_open is False:
         print("⚠️  MARKET IS CURRENTLY CLOSED")
-        if clock:
-            next_open = clock.next_open
-            time_to_open = (next_open - now_et).total_seconds()
-            hours = time_to_open / 3600
-            print(
-                f"📅 Next market open: {next_open.strftime('%Y-%m-%d %H:%M:%S %Z')} ({hours:.1f} hours from now)"
-            )
+        next_open = client.clock.next_open()
+        time_to_open = (next_open - now_et).total_seconds()
+        hours = time_to_open / 3600
+        print(
+            f"📅 Next market open: {next_open.strftime('%Y-%m-%d %H:%M:%S %Z')} ({hours:.1f} hours from now)"
+        )
         print(
             "\n💡 This diagnostic is most useful during market hours (9:30 AM - 4:00 PM ET)"
         )
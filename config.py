@@ -32,13 +32,39 @@ ENABLE_TRANSACTION_COSTS = True
 ORDER_QTY = 1  # Quantity per order
 
 # ========== TIMING SETTINGS ==========
-BAR_TIMEFRAME_MINUTES = 1  # 1-minute bars
+BAR_TIMEFRAME_MINUTES = 1  # 1-minute bars (fractions allowed with streaming quotes)
 RUN_MINUTES = 300  # Total runtime (60 = 1 hour)
 
+# ========== QUOTE INGESTION ==========
+# "rest": poll latest quotes every bar
+# "stream": Alpaca websocket feeds a local quote book in the background
+# "replay": replay recent minute bars into the quote book (offline stand-in)
+# "concurrent": one request per symbol on a thread pool, bounded per bar
+QUOTE_MODE = "rest"
+QUOTE_MAX_AGE_SECONDS = 300  # Ignore book quotes older than this
+QUOTE_WORKERS = 8  # Per-symbol requests in flight (also the HTTP pool size)
+QUOTE_DEADLINE_SECONDS = 10  # Symbols not quoted by then are missing this bar
+QUOTE_REQUEST_TIMEOUT_SECONDS = 5  # Per HTTP request
+
+# ========== API REQUESTS ==========
+# Every Alpaca REST call goes through data_client.RequestScheduler
+API_RATE_LIMIT_PER_MINUTE = 200  # Alpaca's limit per account
+API_BURST = 50  # Requests allowed back to back
+API_RETRIES = 3  # Retries of a timeout, connection error, 429 or 5xx
+API_BREAKER_THRESHOLD = 5  # Failures in a row that open an endpoint's breaker
+API_BREAKER_RESET_SECONDS = 30  # Open breaker waits this long before a probe
+
 # ========== SIMULATION SETTINGS ==========
 SIMULATION_MINUTES = 60  # For backtest (kept for compatibility)
 USE_SYNTHETIC_DATA = True  # Use synthetic prices when Alpaca returns no data
-FAST_MODE = True  # Skip real-time sleep, run as fast as possible
+SYNTHETIC_SEED = 0  # Seed of data/synthetic.py; same seed, same synthetic bars
+FAST_MODE = True  # Backtest: skip real-time sleep, run as fast as possible
+BACKTEST_SPREAD_PCT = 0.001  # Synthetic bid/ask spread around replayed prices
+BAR_CACHE_DIR = "bar_cache"  # One .npy file of minute bars per symbol and day
+OFFLINE_MODE = False  # Serve historical bars from the cache only, never fetch
+
+# ========== REPORTING ==========
+REPORT_IN_BACKGROUND = True  # Render plots/PDFs in a worker process, off the bar loop
 
 # ========== OUTPUT FILES ==========
 import os
@@ -52,3 +78,13 @@ os.makedirs(CURRENT_RUN_DIR, exist_ok=True)
 CAPITAL_CURVES_FILE = os.path.join(CURRENT_RUN_DIR, "capital_curves.png")
 TRADES_LOG_FILE = os.path.join(CURRENT_RUN_DIR, "trades.txt")
 CURVES_DATA_FILE = os.path.join(CURRENT_RUN_DIR, "data.json")
+JOURNAL_FILE = os.path.join(CURRENT_RUN_DIR, "journal.jsonl")  # See data/journal.py
+JOURNAL_FLUSH_SECONDS = 5.0  # A crash loses at most this much of the journal
+CHECKPOINT_DIR = os.path.join(CURRENT_RUN_DIR, "checkpoint")  # See --resume
+CHECKPOINT_EVERY_MINUTES = 5
+INSTRUMENT_LOOP = True  # Time loop phases, decide() and API calls per bar
+METRICS_FILE = os.path.join(CURRENT_RUN_DIR, "metrics.json")  # See instrumentation.py
+
+# Archived runs and their SQLite index (see archive_index.py)
+ARCHIVE_DIR = "run_old"
+ARCHIVE_DB = os.path.join(ARCHIVE_DIR, "archive.sqlite")
@@ -1,3 +1,17 @@
-from .alpaca_history import get_minute_bars
+from .alpaca_history import get_minute_bars, load_minute_bars
+from .bar_cache import BarCache
+from .bar_store import BarStore
+from .journal import Journal, JournalReplay, read_journal, rebuild_run
+from .synthetic import SyntheticMarket
 
-__all__ = ["get_minute_bars"]
+__all__ = [
+    "get_minute_bars",
+    "load_minute_bars",
+    "BarCache",
+    "BarStore",
+    "Journal",
+    "JournalReplay",
+    "read_journal",
+    "rebuild_run",
+    "SyntheticMarket",
+]
@@ -1,56 +1,97 @@
-from datetime import datetime, timedelta
+from datetime import datetime
+
 import pytz
-import random
 
 from alpaca.data.requests import StockBarsRequest
 from alpaca.data.timeframe import TimeFrame
 
+from config import BAR_CACHE_DIR, OFFLINE_MODE, SYNTHETIC_SEED
+from data.bar_cache import BarCache, bars_to_array, to_epoch
+from data.synthetic import SyntheticMarket
 from data_client import AlpacaClient
 
 
-def get_minute_bars(
+def load_minute_bars(
     symbols,
     minutes=180,
+    end=None,
+    offline=None,
+    cache_dir=None,
+    client=None,
 ):
-    client = AlpacaClient()
-    end = datetime.now(pytz.UTC)
-    start = end - timedelta(minutes=minutes)
-
-    req = StockBarsRequest(
-        symbol_or_symbols=symbols,
-        timeframe=TimeFrame.Minute,
-        start=start,
-        end=end,
-        feed=client.feed,
-    )
-
-    bars = client.data.get_stock_bars(req)
-
-    # Normalize to {symbol: [close prices]}
-    price_history = {
-        symbol: [bar.close for bar in bars[symbol]]
-        for symbol in symbols
-        if symbol in bars
-    }
-
-    # If any symbols are missing from the API response, provide a synthetic
-    # fallback so simulations can run locally without failing.
-    missing = [s for s in symbols if s not in price_history]
+    """
+    Minute bars for symbols over the `minutes` before `end`, via the bar cache.
+
+    Only the parts of the window the cache has not covered yet are requested
+    from Alpaca, so a longer window backfills its start and a closed market
+    is not asked for the same empty range twice. The minute in progress is
+    never marked covered. Offline, nothing is fetched and `end` defaults to
+    the newest cached bar instead of now, so repeated backtests see the
+    same window.
+
+    Returns:
+        {symbol: BAR_DTYPE array} oldest first
+    """
+    offline = OFFLINE_MODE if offline is None else offline
+    cache = BarCache(cache_dir or BAR_CACHE_DIR)
+
+    if end is not None:
+        end_t = to_epoch(end)
+    elif offline:
+        end_t = cache.latest_time(symbols) or to_epoch(datetime.now(pytz.UTC))
+    else:
+        end_t = to_epoch(datetime.now(pytz.UTC))
+    start_t = end_t - minutes * 60
+
+    groups = {}  # {(gap_start, gap_end): [symbols]}, one request per gap
+    if not offline:
+        for s in symbols:
+            for a, b in cache.gaps(s, start_t, end_t):
+                if -(-a // 60) * 60 < b:  # Holds at least one bar start
+                    groups.setdefault((a, b), []).append(s)
+
+    if groups:
+        now_t = to_epoch(datetime.now(pytz.UTC))
+        settled_t = now_t - now_t % 60  # Bars before this minute are final
+        try:
+            client = client or AlpacaClient()
+            for (a, b), group in sorted(groups.items()):
+                req = StockBarsRequest(
+                    symbol_or_symbols=group,
+                    timeframe=TimeFrame.Minute,
+                    start=datetime.fromtimestamp(a, pytz.UTC),
+                    end=datetime.fromtimestamp(b, pytz.UTC),
+                    feed=client.feed,
+                )
+                fetched = client.get_bars(req).data
+                for s in group:
+                    if s in fetched:
+                        cache.store(s, bars_to_array(fetched[s]))
+                    if a < min(b, settled_t):
+                        cache.mark_covered(s, a, min(b, settled_t))
+        except Exception as e:
+            print(f"⚠️ Could not fetch bars ({e}); serving cached bars only")
+
+    cached = {s: cache.load(s, start_t, end_t) for s in symbols}
+
+    # If any symbols have no bars at all, provide a synthetic fallback so
+    # simulations can run locally without failing.
+    missing = [s for s in symbols if len(cached[s]) == 0]
     if missing:
-        print(
-            f"⚠️ API did not return bars for: {', '.join(missing)}; using synthetic data for them"
+        print(f"⚠️ No bars for: {', '.join(missing)}; using synthetic data for them")
+        cached.update(
+            SyntheticMarket(seed=SYNTHETIC_SEED).bars(missing, minutes, start_t)
         )
 
-        def synthetic_prices(length, start=100.0):
-            prices = [start]
-            for _ in range(length - 1):
-                # small percent change noise
-                change_pct = random.gauss(0, 0.5)
-                prices.append(max(0.01, prices[-1] * (1 + change_pct / 100)))
-            return prices
+    return cached
 
-        for i, s in enumerate(missing):
-            # use a different start price per symbol to vary behavior
-            price_history[s] = synthetic_prices(minutes, start=100.0 + i * 10)
 
-    return price_history
+def get_minute_bars(
+    symbols,
+    minutes=180,
+    end=None,
+    offline=None,
+):
+    """Close prices as {symbol: [prices]}; see load_minute_bars."""
+    bars = load_minute_bars(symbols, minutes=minutes, end=end, offline=offline)
+    return {symbol: bars[symbol]["close"].tolist() for symbol in symbols}
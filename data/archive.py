@@ -0,0 +1,384 @@
+# data/archive.py
+"""
+SQLite index over archived runs in run_old/YYMMDD/run_HHMM/.
+
+Each run directory is ingested once into a single database. A run is
+re-ingested only when its files change, so update() after a new run
+costs one directory walk plus that run. Sources, best first:
+journal.jsonl (see data/journal.py), then data*.json for curves and
+trades*.txt for results and trades.
+
+Tables:
+    runs     (id, path, day, time, started, duration, interrupted,
+              initial_capital, symbols, config, signature)
+    results  (run_id, penguin, final_value, pnl, pnl_pct, trades,
+              positions, cash)
+    curves   (run_id, penguin, points, data)  data: float64 bytes
+    trades   (run_id, penguin, seq, minute, side, qty, symbol, price,
+              synthetic)
+"""
+
+import json
+import os
+import re
+import sqlite3
+
+import numpy as np
+
+from data.journal import rebuild_run
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL,
+    day TEXT,
+    time TEXT,
+    started TEXT,
+    duration INTEGER,
+    interrupted INTEGER,
+    initial_capital REAL,
+    symbols TEXT,
+    config TEXT,
+    signature TEXT
+);
+CREATE TABLE IF NOT EXISTS results (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    penguin TEXT NOT NULL,
+    final_value REAL,
+    pnl REAL,
+    pnl_pct REAL,
+    trades INTEGER,
+    positions INTEGER,
+    cash REAL,
+    PRIMARY KEY (run_id, penguin)
+);
+CREATE TABLE IF NOT EXISTS curves (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    penguin TEXT NOT NULL,
+    points INTEGER,
+    data BLOB,
+    PRIMARY KEY (run_id, penguin)
+);
+CREATE TABLE IF NOT EXISTS trades (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    penguin TEXT NOT NULL,
+    seq INTEGER,
+    minute INTEGER,
+    side TEXT,
+    qty INTEGER,
+    symbol TEXT,
+    price REAL,
+    synthetic INTEGER
+);
+CREATE INDEX IF NOT EXISTS runs_day ON runs(day);
+CREATE INDEX IF NOT EXISTS results_penguin ON results(penguin);
+CREATE INDEX IF NOT EXISTS trades_run_penguin ON trades(run_id, penguin);
+CREATE INDEX IF NOT EXISTS trades_symbol ON trades(symbol);
+"""
+
+_TRADE_RE = re.compile(
+    r"^\s*(?:\d+\.\s*)?(BUY|SELL)\s+(\d+)\s+(\S+)\s+@\s+\$([0-9,.]+)(\s+\[synthetic\])?"
+)
+_BUCKET_RE = re.compile(r"^\s*Minute (\d+)-\d+:")
+_MONEY_RE = re.compile(r"\$([-+]?[0-9,]+\.?[0-9]*)")
+_PCT_RE = re.compile(r"\(([-+]?[0-9.]+)%\)")
+
+
+def _money(text):
+    match = _MONEY_RE.search(text)
+    return float(match.group(1).replace(",", "")) if match else None
+
+
+def iter_trades_log(path):
+    """
+    Stream a trades.txt written by run_simulation.py (any version).
+
+    Yields, in file order:
+        ("header", key, value)    started, duration, interrupted, symbols,
+                                  initial_capital
+        ("penguin", name, None)   start of a penguin's section
+        ("stat", key, value)      final_value, pnl, pnl_pct, trades,
+                                  positions, cash of the current penguin
+        ("trade", name, (minute or None, side, qty, symbol, price, synthetic))
+    """
+    current = None
+    minute = None
+
+    with open(path, "r", encoding="utf-8") as f:
+        for line, next_line in _with_next(f):
+            if current is None and not line.startswith(" "):
+                if line.startswith("Penguin Trading Simulation Log"):
+                    yield "header", "interrupted", "Interrupted" in line
+                    continue
+                if line.startswith("Started:"):
+                    yield "header", "started", line.split(":", 1)[1].strip()
+                    continue
+                if line.startswith("Duration:"):
+                    digits = re.search(r"\d+", line)
+                    yield "header", "duration", int(digits.group()) if digits else None
+                    continue
+                if line.startswith("Symbols:"):
+                    symbols = line.split(":", 1)[1]
+                    yield "header", "symbols", [
+                        s.strip() for s in symbols.split(",") if s.strip()
+                    ]
+                    continue
+                if line.startswith("Initial Capital:"):
+                    yield "header", "initial_capital", _money(line)
+                    continue
+
+            # A penguin section is an unindented name followed by its value line
+            # (names are free-form, e.g. "RSI Mean Reversion")
+            if (
+                line
+                and not line.startswith(" ")
+                and next_line.strip().startswith(("Final Value:", "Current Value:"))
+            ):
+                current = line.strip()
+                minute = None
+                yield "penguin", current, None
+                continue
+            if current is None:
+                continue
+
+            stripped = line.strip()
+            trade = _TRADE_RE.match(line)
+            if trade:
+                side, qty, symbol, price, synthetic = trade.groups()
+                price = float(price.replace(",", ""))
+                yield "trade", current, (
+                    minute,
+                    side,
+                    int(qty),
+                    symbol,
+                    price,
+                    bool(synthetic),
+                )
+            elif _BUCKET_RE.match(line):
+                minute = int(_BUCKET_RE.match(line).group(1))
+            elif stripped.startswith(("Final Value:", "Current Value:")):
+                yield "stat", "final_value", _money(stripped)
+            elif stripped.startswith("PnL:"):
+                yield "stat", "pnl", _money(stripped)
+                pct = _PCT_RE.search(stripped)
+                yield "stat", "pnl_pct", float(pct.group(1)) if pct else None
+            elif stripped.startswith("Total Trades:"):
+                yield "stat", "trades", int(stripped.split(":")[1])
+            elif stripped.startswith(("Final Positions:", "Current Positions:")):
+                yield "stat", "positions", int(stripped.split(":")[1])
+            elif stripped.startswith(("Final Cash:", "Current Cash:")):
+                yield "stat", "cash", _money(stripped)
+
+
+def _with_next(f):
+    """Yield (line, next line) pairs without newlines; the last pairs with ""."""
+    prev = None
+    for line in f:
+        line = line.rstrip("\n")
+        if prev is not None:
+            yield prev, line
+        prev = line
+    if prev is not None:
+        yield prev, ""
+
+
+def parse_trades_log(path):
+    """
+    Parse a whole trades.txt (see iter_trades_log).
+
+    Returns:
+        (header, penguins) where penguins maps name -> {"final_value", "pnl",
+        "pnl_pct", "trades", "positions", "cash", "trade_list": [...]}
+    """
+    header = {"interrupted": False, "symbols": [], "initial_capital": None}
+    penguins = {}
+    current = None
+    for kind, key, value in iter_trades_log(path):
+        if kind == "header":
+            header[key] = value
+        elif kind == "penguin":
+            current = penguins[key] = {"trade_list": []}
+        elif kind == "stat":
+            current[key] = value
+        else:
+            current["trade_list"].append(value)
+    return header, penguins
+
+
+def _find(files, prefix, suffix):
+    matches = sorted(f for f in files if f.startswith(prefix) and f.endswith(suffix))
+    return matches[0] if matches else None
+
+
+def iter_run_dirs(root):
+    """Yield (relative path, absolute path) of every run directory under root."""
+    if not os.path.isdir(root):
+        return
+    for day in sorted(os.listdir(root)):
+        day_dir = os.path.join(root, day)
+        if not os.path.isdir(day_dir):
+            continue
+        for run in sorted(os.listdir(day_dir)):
+            run_dir = os.path.join(day_dir, run)
+            if os.path.isdir(run_dir):
+                yield f"{day}/{run}", run_dir
+
+
+class ArchiveIndex:
+    def __init__(self, db_path, root="run_old"):
+        self.root = root
+        self.db = sqlite3.connect(db_path)
+        self.db.execute("PRAGMA foreign_keys = ON")
+        self.db.executescript(SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    # ---------- Ingest ----------
+    def run_dirs(self):
+        return iter_run_dirs(self.root)
+
+    @staticmethod
+    def _signature(run_dir):
+        parts = []
+        for name in sorted(os.listdir(run_dir)):
+            st = os.stat(os.path.join(run_dir, name))
+            parts.append(f"{name}:{st.st_size}:{int(st.st_mtime)}")
+        return "|".join(parts)
+
+    def update(self):
+        """Ingest new or changed runs and drop vanished ones; return counts."""
+        known = dict(self.db.execute("SELECT path, signature FROM runs"))
+        seen = set()
+        added = 0
+        for rel, run_dir in self.run_dirs():
+            seen.add(rel)
+            signature = self._signature(run_dir)
+            if known.get(rel) == signature:
+                continue
+            with self.db:
+                self.db.execute("DELETE FROM runs WHERE path = ?", (rel,))
+                self._ingest(rel, run_dir, signature)
+            added += 1
+        removed = [p for p in known if p not in seen]
+        with self.db:
+            self.db.executemany(
+                "DELETE FROM runs WHERE path = ?", [(p,) for p in removed]
+            )
+        return added, len(removed)
+
+    def _ingest(self, rel, run_dir, signature):
+        files = os.listdir(run_dir)
+        day_name, run_name = rel.split("/")
+        day = f"20{day_name[:2]}-{day_name[2:4]}-{day_name[4:6]}"
+        hhmm = run_name.replace("run_", "")
+        run_time = f"{hhmm[:2]}:{hhmm[2:4]}"
+
+        header, results, curves, config = {}, {}, {}, {}
+        journal = _find(files, "journal", ".jsonl")
+        trades_file = _find(files, "trades", ".txt")
+        data_file = _find(files, "data", ".json")
+
+        if journal:
+            run = rebuild_run(os.path.join(run_dir, journal))
+            jh = run["header"] or {}
+            config = {k: jh.get(k) for k in ("fee_per_trade", "enable_fees")}
+            header = {
+                "started": jh.get("started"),
+                "duration": run["bars"],
+                "symbols": jh.get("symbols", []),
+                "initial_capital": jh.get("initial_capital"),
+            }
+            curves = run["curves"]
+            for name, p in run["portfolios"].items():
+                trade_list = [
+                    (minute, t.side, t.qty, t.symbol, t.price, "[synthetic]" in s)
+                    for t, (minute, s) in zip(p.trade_history, run["trades_log"][name])
+                ]
+                results[name] = {
+                    "trades": p.trades,
+                    "positions": len(p.positions),
+                    "cash": p.cash,
+                    "trade_list": trade_list,
+                }
+        if trades_file and not journal:
+            header, results = parse_trades_log(os.path.join(run_dir, trades_file))
+        if data_file and not curves:
+            with open(os.path.join(run_dir, data_file), "r") as f:
+                curves = json.load(f)
+
+        initial = header.get("initial_capital")
+        for name, vals in curves.items():
+            r = results.setdefault(name, {"trade_list": []})
+            if vals and r.get("final_value") is None:
+                r["final_value"] = vals[-1]
+                if initial:
+                    r["pnl"] = vals[-1] - initial
+                    r["pnl_pct"] = r["pnl"] / initial * 100
+
+        cur = self.db.execute(
+            "INSERT INTO runs (path, day, time, started, duration, interrupted, "
+            "initial_capital, symbols, config, signature) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                rel,
+                day,
+                run_time,
+                header.get("started"),
+                header.get("duration"),
+                int(bool(header.get("interrupted"))),
+                initial,
+                ",".join(header.get("symbols", [])),
+                json.dumps(config),
+                signature,
+            ),
+        )
+        run_id = cur.lastrowid
+
+        self.db.executemany(
+            "INSERT INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    run_id,
+                    name,
+                    r.get("final_value"),
+                    r.get("pnl"),
+                    r.get("pnl_pct"),
+                    r.get("trades"),
+                    r.get("positions"),
+                    r.get("cash"),
+                )
+                for name, r in results.items()
+            ],
+        )
+        self.db.executemany(
+            "INSERT INTO curves VALUES (?, ?, ?, ?)",
+            [
+                (run_id, name, len(vals), np.asarray(vals, dtype=np.float64).tobytes())
+                for name, vals in curves.items()
+            ],
+        )
+        self.db.executemany(
+            "INSERT INTO trades VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (run_id, name, i, minute, side, qty, symbol, price, int(synthetic))
+                for name, r in results.items()
+                for i, (minute, side, qty, symbol, price, synthetic) in enumerate(
+                    r["trade_list"]
+                )
+            ],
+        )
+
+    # ---------- Queries ----------
+    def query(self, sql, params=()):
+        cur = self.db.execute(sql, params)
+        columns = [d[0] for d in cur.description or ()]
+        return columns, cur.fetchall()
+
+    def curve(self, run_path, penguin):
+        row = self.db.execute(
+            "SELECT c.data FROM curves c JOIN runs r ON r.id = c.run_id "
+            "WHERE r.path = ? AND c.penguin = ?",
+            (run_path, penguin),
+        ).fetchone()
+        return np.frombuffer(row[0], dtype=np.float64) if row else None
@@ -0,0 +1,188 @@
+# data/bar_cache.py
+"""
+On-disk cache of Alpaca minute bars.
+
+Layout: <cache_dir>/<SYMBOL>/<YYYY-MM-DD>.npy, one file per symbol and
+trading day (US/Eastern). Each file is a NumPy structured array with one
+row per bar, sorted by time:
+
+    t       int64    bar start, seconds since the Unix epoch (UTC)
+    open    float64
+    high    float64
+    low     float64
+    close   float64
+    volume  float64
+    vwap    float64
+
+Next to each day file, <YYYY-MM-DD>.coverage.json lists the [start, end)
+epoch ranges already fetched for that day, including ranges that held no
+bars (market closed), so they are not requested again.
+
+Files are written via a temp file and rename, so a crash never leaves a
+half-written day behind.
+"""
+
+import json
+import os
+from datetime import datetime, time, timedelta
+
+import numpy as np
+import pytz
+
+BAR_DTYPE = np.dtype(
+    [
+        ("t", "i8"),
+        ("open", "f8"),
+        ("high", "f8"),
+        ("low", "f8"),
+        ("close", "f8"),
+        ("volume", "f8"),
+        ("vwap", "f8"),
+    ]
+)
+
+MARKET_TZ = pytz.timezone("America/New_York")
+
+
+def to_epoch(dt: datetime) -> int:
+    return int(dt.timestamp())
+
+
+def bars_to_array(bars) -> np.ndarray:
+    """Convert alpaca Bar objects to a BAR_DTYPE array."""
+    out = np.empty(len(bars), dtype=BAR_DTYPE)
+    for i, bar in enumerate(bars):
+        vwap = bar.vwap if bar.vwap is not None else bar.close
+        out[i] = (
+            to_epoch(bar.timestamp),
+            bar.open,
+            bar.high,
+            bar.low,
+            bar.close,
+            bar.volume,
+            vwap,
+        )
+    return out
+
+
+class BarCache:
+    def __init__(self, cache_dir: str = "bar_cache"):
+        self.cache_dir = cache_dir
+
+    # ---------- Paths ----------
+    def _path(self, symbol: str, day) -> str:
+        return os.path.join(self.cache_dir, symbol, f"{day.isoformat()}.npy")
+
+    def _coverage_path(self, symbol: str, day) -> str:
+        return os.path.join(self.cache_dir, symbol, f"{day.isoformat()}.coverage.json")
+
+    @staticmethod
+    def _day_bounds(day):
+        """[start, end) epoch seconds of a market-timezone date."""
+        start = MARKET_TZ.localize(datetime.combine(day, time()))
+        end = MARKET_TZ.localize(datetime.combine(day + timedelta(days=1), time()))
+        return to_epoch(start), to_epoch(end)
+
+    @staticmethod
+    def _days(start_t: int, end_t: int):
+        """Market-timezone dates touched by [start_t, end_t)."""
+        day = datetime.fromtimestamp(start_t, MARKET_TZ).date()
+        last = datetime.fromtimestamp(max(start_t, end_t - 1), MARKET_TZ).date()
+        while day <= last:
+            yield day
+            day += timedelta(days=1)
+
+    # ---------- Reads ----------
+    def _load_day(self, symbol: str, day) -> np.ndarray:
+        path = self._path(symbol, day)
+        if not os.path.exists(path):
+            return np.empty(0, dtype=BAR_DTYPE)
+        return np.load(path)
+
+    def load(self, symbol: str, start_t: int, end_t: int) -> np.ndarray:
+        """Cached bars for symbol with start_t <= t < end_t."""
+        days = [self._load_day(symbol, d) for d in self._days(start_t, end_t)]
+        if not days:
+            return np.empty(0, dtype=BAR_DTYPE)
+        bars = np.concatenate(days)
+        return bars[(bars["t"] >= start_t) & (bars["t"] < end_t)]
+
+    def _load_coverage(self, symbol: str, day):
+        path = self._coverage_path(symbol, day)
+        if not os.path.exists(path):
+            return []
+        with open(path, "r") as f:
+            return [tuple(r) for r in json.load(f)]
+
+    def gaps(self, symbol: str, start_t: int, end_t: int):
+        """Sub-ranges of [start_t, end_t) not fetched yet for symbol, oldest first."""
+        covered = sorted(
+            r
+            for d in self._days(start_t, end_t)
+            for r in self._load_coverage(symbol, d)
+        )
+        gaps = []
+        t = start_t
+        for a, b in covered:
+            if a >= end_t:
+                break
+            if a > t:
+                gaps.append((t, a))
+            t = max(t, b)
+        if t < end_t:
+            gaps.append((t, end_t))
+        return gaps
+
+    def latest_time(self, symbols) -> int:
+        """Epoch seconds just after the newest cached bar across symbols, or None."""
+        latest = None
+        for symbol in symbols:
+            folder = os.path.join(self.cache_dir, symbol)
+            if not os.path.isdir(folder):
+                continue
+            files = sorted(f for f in os.listdir(folder) if f.endswith(".npy"))
+            if not files:
+                continue
+            bars = np.load(os.path.join(folder, files[-1]))
+            if len(bars):
+                t = int(bars["t"][-1]) + 60
+                latest = t if latest is None else max(latest, t)
+        return latest
+
+    # ---------- Writes ----------
+    def store(self, symbol: str, bars: np.ndarray) -> None:
+        """Merge bars into the per-day files; newer rows win on equal t."""
+        if len(bars) == 0:
+            return
+        os.makedirs(os.path.join(self.cache_dir, symbol), exist_ok=True)
+        days = np.array(
+            [datetime.fromtimestamp(int(t), MARKET_TZ).date() for t in bars["t"]]
+        )
+        for day in np.unique(days):
+            merged = np.concatenate([bars[days == day], self._load_day(symbol, day)])
+            _, keep = np.unique(merged["t"], return_index=True)  # First copy wins
+            path = self._path(symbol, day)
+            tmp = path + ".tmp"
+            with open(tmp, "wb") as f:
+                np.save(f, merged[keep])
+            os.replace(tmp, path)
+
+    def mark_covered(self, symbol: str, start_t: int, end_t: int) -> None:
+        """Record [start_t, end_t) as fetched, whether or not it held bars."""
+        os.makedirs(os.path.join(self.cache_dir, symbol), exist_ok=True)
+        for day in self._days(start_t, end_t):
+            day_start, day_end = self._day_bounds(day)
+            a, b = max(start_t, day_start), min(end_t, day_end)
+            if a >= b:
+                continue
+            merged = []
+            for lo, hi in sorted(self._load_coverage(symbol, day) + [(a, b)]):
+                if merged and lo <= merged[-1][1]:
+                    merged[-1][1] = max(merged[-1][1], hi)
+                else:
+                    merged.append([lo, hi])
+            path = self._coverage_path(symbol, day)
+            tmp = path + ".tmp"
+            with open(tmp, "w") as f:
+                json.dump(merged, f)
+            os.replace(tmp, path)
@@ -0,0 +1,199 @@
+# data/bar_store.py
+import threading
+
+import numpy as np
+
+from indicators.volatility import atr
+from indicators.volume import obv
+
+FIELDS = ("open", "high", "low", "close", "volume", "vwap")
+_F = {name: i for i, name in enumerate(FIELDS)}
+RECORD_DTYPE = np.dtype([(name, "f8") for name in FIELDS])
+
+
+class BarStore:
+    """
+    Columnar OHLCV store: a (fields x symbols x bars) float64 buffer.
+
+    Same layout rules as PriceHistory: the buffer doubles when full and
+    reads return views that stay valid until the next append grows it.
+
+    Bars come in two ways:
+      - append()/extend() with finished bars, e.g. from the bar cache
+      - update_quote() for every quote during a bar, then close_bar() to
+        turn the aggregated quotes into one bar per quoted symbol. Quotes
+        carry no traded volume, so live bars have volume 0 and a vwap that
+        is the plain mean of the quoted mids.
+
+    update_quote() may be called from a quote-stream thread while the
+    trading loop reads finished bars.
+    """
+
+    def __init__(self, symbols=(), capacity: int = 512):
+        self._index = {}  # {symbol: row}
+        self._buf = np.empty((len(FIELDS), max(len(symbols), 1), max(capacity, 1)))
+        self._lengths = np.zeros(self._buf.shape[1], dtype=np.int64)
+        self._lock = threading.Lock()
+        # Open bars: {symbol: [open, high, low, close, volume, mid_sum, quotes]}
+        self._pending = {}
+        for s in symbols:
+            self._row(s)
+
+    @classmethod
+    def from_bars(cls, bars, symbols=None):
+        """Build from {symbol: BAR_DTYPE array} as returned by load_minute_bars."""
+        symbols = list(symbols or bars)
+        length = max((len(b) for b in bars.values()), default=0)
+        store = cls(symbols, capacity=max(length, 512))
+        for s in symbols:
+            if s in bars:
+                store.extend(s, bars[s])
+        return store
+
+    # ---------- Layout ----------
+    @property
+    def symbols(self):
+        return list(self._index)
+
+    @property
+    def lengths(self) -> np.ndarray:
+        return self._lengths[: len(self._index)]
+
+    def _row(self, symbol: str) -> int:
+        row = self._index.get(symbol)
+        if row is None:
+            row = len(self._index)
+            if row >= self._buf.shape[1]:
+                self._grow(rows=self._buf.shape[1] * 2)
+            self._index[symbol] = row
+        return row
+
+    def _grow(self, rows: int = None, cols: int = None) -> None:
+        rows = rows or self._buf.shape[1]
+        cols = cols or self._buf.shape[2]
+        buf = np.empty((len(FIELDS), rows, cols))
+        used = int(self._lengths.max()) if len(self._lengths) else 0
+        buf[:, : self._buf.shape[1], :used] = self._buf[:, :, :used]
+        lengths = np.zeros(rows, dtype=np.int64)
+        lengths[: len(self._lengths)] = self._lengths
+        self._buf, self._lengths = buf, lengths
+
+    def _reserve(self, row: int, extra: int) -> int:
+        n = int(self._lengths[row])
+        if n + extra > self._buf.shape[2]:
+            cols = self._buf.shape[2]
+            while cols < n + extra:
+                cols *= 2
+            self._grow(cols=cols)
+        return n
+
+    # ---------- Finished bars ----------
+    def append(self, symbol, open, high, low, close, volume=0.0, vwap=None):
+        row = self._row(symbol)
+        n = self._reserve(row, 1)
+        vwap = close if vwap is None else vwap
+        self._buf[:, row, n] = (open, high, low, close, volume, vwap)
+        self._lengths[row] = n + 1
+
+    def extend(self, symbol: str, bars) -> None:
+        """Append a BAR_DTYPE array (or any record array with FIELDS)."""
+        row = self._row(symbol)
+        n = self._reserve(row, len(bars))
+        for name, i in _F.items():
+            self._buf[i, row, n : n + len(bars)] = bars[name]
+        self._lengths[row] = n + len(bars)
+
+    # ---------- Aggregating quotes ----------
+    def update_quote(self, symbol: str, bid: float, ask: float) -> None:
+        """Fold one quote's mid into the symbol's open bar."""
+        if bid is None or ask is None:
+            return
+        mid = (bid + ask) / 2
+        with self._lock:
+            bar = self._pending.get(symbol)
+            if bar is None:
+                self._pending[symbol] = [mid, mid, mid, mid, 0.0, mid, 1]
+                return
+            bar[1] = max(bar[1], mid)
+            bar[2] = min(bar[2], mid)
+            bar[3] = mid
+            bar[5] += mid
+            bar[6] += 1
+
+    def close_bar(self):
+        """Append one bar per symbol quoted since the last close; return them."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return []
+        rows = np.array([self._row(s) for s in pending])
+        cols = self._lengths[rows]
+        self._reserve(rows[np.argmax(cols)], 1)
+        values = np.array(list(pending.values()))
+        values[:, 5] /= values[:, 6]  # mid_sum -> mean mid
+        self._buf[:, rows, cols] = values[:, :6].T
+        self._lengths[rows] = cols + 1
+        return list(pending)
+
+    # ---------- Reads ----------
+    def field(self, name: str, symbol: str) -> np.ndarray:
+        """One column (e.g. "high") of stored bars for symbol (view)."""
+        row = self._index.get(symbol)
+        if row is None:
+            return self._buf[_F[name], 0, :0]
+        return self._buf[_F[name], row, : self._lengths[row]]
+
+    def opens(self, symbol):
+        return self.field("open", symbol)
+
+    def highs(self, symbol):
+        return self.field("high", symbol)
+
+    def lows(self, symbol):
+        return self.field("low", symbol)
+
+    def closes(self, symbol):
+        return self.field("close", symbol)
+
+    def volumes(self, symbol):
+        return self.field("volume", symbol)
+
+    def vwaps(self, symbol):
+        return self.field("vwap", symbol)
+
+    def matrix(self, name: str) -> np.ndarray:
+        """(symbols x bars) view of one field up to the longest series."""
+        n = len(self._index)
+        used = int(self.lengths.max()) if n else 0
+        return self._buf[_F[name], :n, :used]
+
+    def records(self, symbol: str, start: int = 0) -> np.ndarray:
+        """Copy of bars[start:] for symbol as a structured array of FIELDS."""
+        row = self._index.get(symbol)
+        end = int(self._lengths[row]) if row is not None else 0
+        out = np.empty(max(end - start, 0), dtype=RECORD_DTYPE)
+        if len(out):
+            for name, i in _F.items():
+                out[name] = self._buf[i, row, start:end]
+        return out
+
+    def last(self, symbol: str):
+        """Latest bar as {field: value}, or None."""
+        row = self._index.get(symbol)
+        if row is None or self._lengths[row] == 0:
+            return None
+        col = self._buf[:, row, self._lengths[row] - 1]
+        return {name: float(col[i]) for name, i in _F.items()}
+
+    # ---------- Indicators ----------
+    def atr(self, symbol: str, n: int = 14):
+        return atr(self.highs(symbol), self.lows(symbol), self.closes(symbol), n)
+
+    def obv(self, symbol: str):
+        return obv(self.closes(symbol), self.volumes(symbol))
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._index
+
+    def __len__(self) -> int:
+        return len(self._index)
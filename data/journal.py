@@ -0,0 +1,266 @@
+# data/journal.py
+"""
+Append-only run journal: one JSON object per line (JSON Lines).
+
+Every record has a "type" and, except the header, the bar number "bar".
+Schema version 1:
+
+    run       Header, first line.
+              {"type": "run", "v": 1, "started": ISO time, "symbols": [...],
+               "penguins": [...], "initial_capital": float,
+               "fee_per_trade": float, "enable_fees": bool}
+    bar       Quotes the bar traded on.
+              {"type": "bar", "bar": int, "time": ISO time,
+               "quotes": {symbol: [bid, ask]}, "synthetic": [symbol, ...]}
+    decision  A penguin's non-HOLD decision (HOLD is implied).
+              {"type": "decision", "bar": int, "penguin": str,
+               "symbol": str, "decision": "BUY" | "SELL", "qty": int}
+    fill      An executed trade; decisions without a fill were rejected.
+              {"type": "fill", "bar": int, "penguin": str, "symbol": str,
+               "side": "BUY" | "SELL", "qty": int, "price": float,
+               "fee": float, "synthetic": bool}
+    values    Portfolio values after the bar.
+              {"type": "values", "bar": int, "values": {penguin: float}}
+    end       Footer written by close().
+              {"type": "end", "bar": int, "time": ISO time}
+
+Lines are buffered in memory and written every `flush_seconds`, so a crash
+loses at most that much. A truncated last line is skipped by the reader.
+"""
+
+import json
+import os
+import time
+from datetime import datetime
+
+from backtest.portfolio import Portfolio
+
+SCHEMA_VERSION = 1
+
+
+class Journal:
+    def __init__(self, path: str, flush_seconds: float = 5.0, resume_offset=None):
+        """
+        resume_offset continues an existing journal from a byte offset
+        returned by offset(), dropping anything written after it.
+        """
+        self.path = path
+        self.flush_seconds = flush_seconds
+        if resume_offset is None:
+            self._file = open(path, "w", encoding="utf-8")
+        else:
+            self._file = open(path, "r+", encoding="utf-8")
+            self._file.truncate(resume_offset)
+            self._file.seek(resume_offset)
+        self._lines = []
+        self._last_flush = time.monotonic()
+        self._bar = 0
+
+    def _write(self, record: dict) -> None:
+        self._lines.append(json.dumps(record, separators=(",", ":")))
+
+    # ---------- Records ----------
+    def start_run(self, symbols, penguins, initial_capital, fee_per_trade, enable_fees):
+        if self._file.tell() > 0:
+            return  # Resumed journal already has its header
+        self._write(
+            {
+                "type": "run",
+                "v": SCHEMA_VERSION,
+                "started": datetime.now().isoformat(timespec="seconds"),
+                "symbols": list(symbols),
+                "penguins": list(penguins),
+                "initial_capital": initial_capital,
+                "fee_per_trade": fee_per_trade,
+                "enable_fees": enable_fees,
+            }
+        )
+
+    def bar(self, bar: int, bid_ask_prices, price_source=None) -> None:
+        self._bar = bar
+        price_source = price_source or {}
+        self._write(
+            {
+                "type": "bar",
+                "bar": bar,
+                "time": datetime.now().isoformat(timespec="seconds"),
+                "quotes": {s: [bid, ask] for s, (bid, ask) in bid_ask_prices.items()},
+                "synthetic": [
+                    s for s, src in price_source.items() if src == "synthetic"
+                ],
+            }
+        )
+
+    def decision(self, penguin: str, symbol: str, decision: str, qty: int) -> None:
+        self._write(
+            {
+                "type": "decision",
+                "bar": self._bar,
+                "penguin": penguin,
+                "symbol": symbol,
+                "decision": decision,
+                "qty": qty,
+            }
+        )
+
+    def fill(self, penguin, symbol, side, qty, price, fee, synthetic=False) -> None:
+        self._write(
+            {
+                "type": "fill",
+                "bar": self._bar,
+                "penguin": penguin,
+                "symbol": symbol,
+                "side": side,
+                "qty": qty,
+                "price": price,
+                "fee": fee,
+                "synthetic": synthetic,
+            }
+        )
+
+    def values(self, values) -> None:
+        """Portfolio values for the bar; also the point where flushes happen."""
+        self._write({"type": "values", "bar": self._bar, "values": values})
+        if time.monotonic() - self._last_flush >= self.flush_seconds:
+            self.flush()
+
+    # ---------- Output ----------
+    def flush(self) -> None:
+        if self._lines:
+            self._file.write("\n".join(self._lines) + "\n")
+            self._lines = []
+        self._file.flush()
+        self._last_flush = time.monotonic()
+
+    def offset(self) -> int:
+        """Flush and return the byte offset of the end of the journal."""
+        self.flush()
+        return self._file.tell()
+
+    def close(self) -> None:
+        if self._file.closed:
+            return
+        self._write(
+            {
+                "type": "end",
+                "bar": self._bar,
+                "time": datetime.now().isoformat(timespec="seconds"),
+            }
+        )
+        self.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+
+
+# ---------- Reading ----------
+def read_journal(path: str):
+    """Yield journal records in order, skipping a torn last line."""
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                if line.endswith("\n"):
+                    raise
+                return  # Partial write from a crash
+
+
+class JournalReplay:
+    """
+    Rebuild a run from its journal by replaying fills, one record at a time.
+
+    Iterating yields (bar, {penguin: value}) for every recorded values line
+    while header, portfolios, curves, trades_log and latest_prices fill in,
+    so callers can follow a long run without loading it whole. Values are
+    the replayed portfolios marked at the recorded mids; any that differ
+    from the recorded live values by more than `tolerance` are listed in
+    mismatches as (bar, penguin, recorded, replayed). run() consumes the
+    whole journal.
+    """
+
+    def __init__(self, path: str, tolerance: float = 0.01):
+        self.path = path
+        self.tolerance = tolerance
+        self.header = None
+        self.mismatches = []
+        self.curves = {}
+        self.portfolios = {}
+        self.trades_log = {}
+        self.latest_prices = {}
+        self.bar = 0
+
+    def _portfolio(self, name):
+        if name not in self.portfolios:
+            self.portfolios[name] = Portfolio(
+                cash=self.header["initial_capital"],
+                fee_per_trade=self.header["fee_per_trade"],
+                enable_fees=self.header["enable_fees"],
+            )
+            self.trades_log[name] = []
+        return self.portfolios[name]
+
+    def __iter__(self):
+        for rec in read_journal(self.path):
+            kind = rec["type"]
+            if kind == "bar":
+                self.bar = rec["bar"]
+                for s, (bid, ask) in rec["quotes"].items():
+                    self.latest_prices[s] = (bid + ask) / 2
+            elif kind == "fill":
+                portfolio = self._portfolio(rec["penguin"])
+                trade = getattr(portfolio, rec["side"].lower())
+                trade(rec["symbol"], rec["price"], qty=rec["qty"], bar=rec["bar"])
+                marker = " [synthetic]" if rec["synthetic"] else ""
+                self.trades_log[rec["penguin"]].append(
+                    (
+                        rec["bar"],
+                        f"{rec['side']} {rec['qty']} {rec['symbol']} @ ${rec['price']:.2f}{marker}",
+                    )
+                )
+            elif kind == "values":
+                values = {}
+                for name, recorded in rec["values"].items():
+                    value = self._portfolio(name).value(self.latest_prices)
+                    if abs(value - recorded) > self.tolerance:
+                        self.mismatches.append((self.bar, name, recorded, value))
+                    values[name] = value
+                    self.curves.setdefault(name, []).append(value)
+                yield self.bar, values
+            elif kind == "run":
+                self.header = rec
+                for name in rec["penguins"]:
+                    self._portfolio(name)
+                    self.curves.setdefault(name, [])
+
+    def run(self):
+        """Consume the whole journal; return self for chaining."""
+        for _ in self:
+            pass
+        if self.mismatches:
+            bar, name, recorded, value = self.mismatches[0]
+            print(
+                f"⚠️ {self.path}: replay differs from the recorded values on "
+                f"{len(self.mismatches)} points (first: bar {bar} {name} "
+                f"recorded ${recorded:,.2f}, replayed ${value:,.2f})"
+            )
+        return self
+
+
+def rebuild_run(path: str):
+    """
+    Rebuild a run from its journal (see JournalReplay).
+
+    Returns:
+        dict with "header", "curves" {penguin: [values]}, "portfolios"
+        {penguin: Portfolio}, "trades_log" {penguin: [(bar, trade_str)]},
+        "latest_prices" {symbol: mid} and "bars" (last bar number)
+    """
+    replay = JournalReplay(path).run()
+    return {
+        "header": replay.header,
+        "curves": replay.curves,
+        "portfolios": replay.portfolios,
+        "trades_log": replay.trades_log,
+        "latest_prices": replay.latest_prices,
+        "bars": replay.bar,
+    }
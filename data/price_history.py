@@ -0,0 +1,125 @@
+# data/price_history.py
+import numpy as np
+
+
+class PriceHistory:
+    """
+    Columnar price store: one float64 row per symbol, one column per bar.
+
+    The buffer is preallocated and doubles when full, so append() is
+    amortized O(1). series() and window() return views into the buffer and
+    never copy; a view stays valid until an append grows the buffer, so
+    don't hold on to one across bars.
+
+    Indexing by symbol mirrors the old defaultdict(list): price_history[s]
+    is the symbol's full series (empty for unknown symbols).
+    """
+
+    def __init__(self, symbols=(), capacity: int = 512):
+        self._index = {}  # {symbol: row}
+        self._buf = np.empty((max(len(symbols), 1), max(capacity, 1)))
+        self._lengths = np.zeros(self._buf.shape[0], dtype=np.int64)
+        for s in symbols:
+            self._row(s)
+
+    # ---------- Layout ----------
+    @property
+    def symbols(self):
+        return list(self._index)
+
+    @property
+    def lengths(self) -> np.ndarray:
+        """Number of bars stored per symbol, in row order."""
+        return self._lengths[: len(self._index)]
+
+    def _row(self, symbol: str) -> int:
+        row = self._index.get(symbol)
+        if row is None:
+            row = len(self._index)
+            if row >= self._buf.shape[0]:
+                self._grow(rows=self._buf.shape[0] * 2)
+            self._index[symbol] = row
+        return row
+
+    def _grow(self, rows: int = None, cols: int = None) -> None:
+        rows = rows or self._buf.shape[0]
+        cols = cols or self._buf.shape[1]
+        buf = np.empty((rows, cols))
+        used = int(self._lengths.max()) if len(self._lengths) else 0
+        buf[: self._buf.shape[0], :used] = self._buf[:, :used]
+        lengths = np.zeros(rows, dtype=np.int64)
+        lengths[: len(self._lengths)] = self._lengths
+        self._buf, self._lengths = buf, lengths
+
+    # ---------- Writes ----------
+    def append(self, symbol: str, price: float) -> None:
+        row = self._row(symbol)
+        n = self._lengths[row]
+        if n >= self._buf.shape[1]:
+            self._grow(cols=self._buf.shape[1] * 2)
+        self._buf[row, n] = price
+        self._lengths[row] = n + 1
+
+    def extend(self, symbol: str, prices) -> None:
+        """Append several prices at once."""
+        row = self._row(symbol)
+        n = self._lengths[row]
+        end = n + len(prices)
+        if end > self._buf.shape[1]:
+            cols = self._buf.shape[1]
+            while cols < end:
+                cols *= 2
+            self._grow(cols=cols)
+        self._buf[row, n:end] = prices
+        self._lengths[row] = end
+
+    # ---------- Reads ----------
+    def series(self, symbol: str) -> np.ndarray:
+        """All stored prices for symbol (view)."""
+        row = self._index.get(symbol)
+        if row is None:
+            return self._buf[0, :0]
+        return self._buf[row, : self._lengths[row]]
+
+    def window(self, symbol: str, n: int) -> np.ndarray:
+        """The last n prices for symbol, or fewer if not enough history (view)."""
+        row = self._index.get(symbol)
+        if row is None:
+            return self._buf[0, :0]
+        end = self._lengths[row]
+        return self._buf[row, max(0, end - n) : end]
+
+    def last(self, symbol: str, default=None):
+        row = self._index.get(symbol)
+        if row is None or self._lengths[row] == 0:
+            return default
+        return float(self._buf[row, self._lengths[row] - 1])
+
+    def matrix(self) -> np.ndarray:
+        """(symbols x bars) view of the buffer up to the longest series."""
+        n = len(self._index)
+        used = int(self.lengths.max()) if n else 0
+        return self._buf[:n, :used]
+
+    def to_dict(self):
+        """Copy out as {symbol: [prices]}."""
+        return {s: self.series(s).tolist() for s in self._index}
+
+    # ---------- Mapping interface ----------
+    def __getitem__(self, symbol: str) -> np.ndarray:
+        return self.series(symbol)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._index
+
+    def __iter__(self):
+        return iter(self._index)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def keys(self):
+        return self._index.keys()
+
+    def items(self):
+        return ((s, self.series(s)) for s in self._index)
@@ -0,0 +1,140 @@
+# data/quote_book.py
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Iterable, Optional, Tuple
+
+import pytz
+
+
+class QuoteBook:
+    """
+    Thread-safe book of the latest bid/ask per symbol.
+
+    A background consumer pushes quotes in with update(); the trading loop
+    reads a consistent copy with snapshot() without touching the network.
+
+    on_update, if set, is called with (symbol, bid, ask) for every quote,
+    from the consumer's thread (e.g. BarStore.update_quote).
+    """
+
+    def __init__(self, on_update=None):
+        self._lock = threading.Lock()
+        self._quotes = {}  # {symbol: (bid, ask, timestamp, received_monotonic)}
+        self.updates = 0
+        self.on_update = on_update
+
+    def update(
+        self, symbol: str, bid: float, ask: float, timestamp: datetime = None
+    ) -> None:
+        if bid is None or ask is None:
+            return
+        if timestamp is None:
+            timestamp = datetime.now(pytz.UTC)
+        with self._lock:
+            self._quotes[symbol] = (bid, ask, timestamp, time.monotonic())
+            self.updates += 1
+        if self.on_update is not None:
+            self.on_update(symbol, bid, ask)
+
+    def get_bid_ask(self, symbol: str) -> Tuple[Optional[float], Optional[float]]:
+        with self._lock:
+            q = self._quotes.get(symbol)
+        if q is None:
+            return None, None
+        return q[0], q[1]
+
+    def snapshot(self, max_age: float = None) -> Dict[str, Tuple[float, float]]:
+        """
+        Return {symbol: (bid, ask)} for every symbol in the book.
+
+        Args:
+            max_age: Drop quotes received more than max_age seconds ago
+        """
+        now = time.monotonic()
+        with self._lock:
+            items = list(self._quotes.items())
+        return {
+            s: (bid, ask)
+            for s, (bid, ask, _, received) in items
+            if max_age is None or now - received <= max_age
+        }
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._quotes)
+
+
+class ReplayQuoteSource:
+    """
+    Local stand-in for a live quote stream.
+
+    Replays (symbol, bid, ask, timestamp) tuples, optionally pausing
+    `interval` seconds whenever the timestamp advances to a new bar.
+    """
+
+    def __init__(self, quotes: Iterable[Tuple], interval: float = 0.0):
+        self.quotes = quotes
+        self.interval = interval
+        self._stop = threading.Event()
+
+    @classmethod
+    def from_price_history(cls, price_history, spread_pct=0.001, interval=0.0):
+        """Build a replay from {symbol: [mid prices]}, one quote per symbol per bar."""
+
+        def quotes():
+            length = max((len(p) for p in price_history.values()), default=0)
+            for i in range(length):
+                for symbol, prices in price_history.items():
+                    if i < len(prices):
+                        mid = prices[i]
+                        spread = mid * spread_pct
+                        yield symbol, mid - spread / 2, mid + spread / 2, i
+
+        return cls(quotes(), interval=interval)
+
+    def run(self, on_quote) -> None:
+        last_ts = None
+        for symbol, bid, ask, ts in self.quotes:
+            if self._stop.is_set():
+                return
+            if self.interval and last_ts is not None and ts != last_ts:
+                if self._stop.wait(self.interval):
+                    return
+            last_ts = ts
+            # Replayed timestamps are bar indices or historical times; stamp on arrival
+            on_quote(symbol, bid, ask, None)
+
+    def stop(self) -> None:
+        self._stop.set()
+
+
+class QuoteStreamConsumer:
+    """Background thread feeding a QuoteBook from a quote source."""
+
+    def __init__(self, book: QuoteBook, source):
+        self.book = book
+        self.source = source
+        self._thread = None
+        self.error = None
+
+    def _run(self) -> None:
+        try:
+            self.source.run(self.book.update)
+        except Exception as e:
+            self.error = e
+            print(f"  ⚠️ Quote stream stopped: {type(e).__name__}: {e}")
+
+    def start(self) -> None:
+        self._thread = threading.Thread(
+            target=self._run, name="quote-stream", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self.source.stop()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def is_alive(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
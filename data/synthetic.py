@@ -0,0 +1,187 @@
+# data/synthetic.py
+"""
+Seeded synthetic minute bars and quotes, for offline runs and stress tests.
+
+Every symbol draws from its own random streams, seeded from the market
+seed and crc32(symbol) (stable across processes, unlike hash()). A
+symbol's path therefore depends only on (seed, symbol), never on which
+other symbols are generated with it or how the bars are chunked.
+
+Per minute, each symbol's log return is
+
+    (mu - sigma^2 v^2 / 2) dt + sigma v sqrt(dt) (sqrt(rho) F + sqrt(1 - rho) z) + J
+
+- sigma: the symbol's annual volatility (from its seed, 15%..60%)
+- v: the market volatility regime, calm (1) or volatile (volatile_mult),
+  switching after geometric durations
+- F: a market-wide factor shared by all symbols (correlation rho), z the
+  symbol's own noise
+- J: a jump with probability jump_prob, size ~ N(0, jump_std)
+
+Bid/ask spreads widen with the regime around a per-symbol base spread.
+"""
+
+import zlib
+
+import numpy as np
+
+from data.bar_cache import BAR_DTYPE
+
+MINUTES_PER_YEAR = 252 * 390
+_DT = 1.0 / MINUTES_PER_YEAR
+_MARKET_KEY = 0x4D4B54  # Keeps the market streams apart from any symbol's
+
+
+def _crc(symbol: str) -> int:
+    return zlib.crc32(symbol.encode())
+
+
+def _generators(*key, count):
+    seq = np.random.SeedSequence(list(key))
+    return [np.random.Generator(np.random.PCG64(s)) for s in seq.spawn(count)]
+
+
+class _SymbolStream:
+    """Random streams and running state of one symbol."""
+
+    def __init__(self, seed, symbol):
+        h = _crc(symbol)
+        self.normals, self.uniforms = _generators(seed, h, count=2)
+        self.sigma = 0.15 + (h % 1000) / 1000 * 0.45
+        self.spread_bps = 2.0 + (h >> 10) % 9  # 2..10 bps
+        self.base_volume = 1000.0 * (1 + (h >> 20) % 50)
+        self.close = 100.0 + (h % 20) * 10
+        self.log_close = np.log(self.close)  # Unfloored, carried across chunks
+        self.bar = 0  # Next bar index
+
+
+class SyntheticMarket:
+    def __init__(
+        self,
+        seed=0,
+        annual_drift=0.05,
+        correlation=0.3,
+        calm_minutes=390,
+        volatile_minutes=60,
+        volatile_mult=3.0,
+        jump_prob=1 / 2000,
+        jump_std=0.02,
+    ):
+        self.seed = seed
+        self.annual_drift = annual_drift
+        self.correlation = correlation
+        self.calm_minutes = calm_minutes
+        self.volatile_minutes = volatile_minutes
+        self.volatile_mult = volatile_mult
+        self.jump_prob = jump_prob
+        self.jump_std = jump_std
+
+        self._factor_rng, self._regime_rng = _generators(seed, _MARKET_KEY, count=2)
+        self._factor = np.empty(0)
+        self._vol_mult = np.empty(0)
+        self._volatile = False  # Regime of the last generated market bar
+        self._streams = {}
+
+    # ---------- Market-wide series, extended lazily by bar index ----------
+    def _market(self, end: int) -> None:
+        have = len(self._factor)
+        if end <= have:
+            return
+        size = max(end, 2 * have)
+        self._factor = np.concatenate(
+            [self._factor, self._factor_rng.standard_normal(size - have)]
+        )
+        # Whole regimes are drawn in order, so the last one may run past size
+        regimes = [self._vol_mult]
+        total = len(self._vol_mult)
+        while total < size:
+            mean = self.volatile_minutes if self._volatile else self.calm_minutes
+            length = int(self._regime_rng.geometric(1.0 / mean))
+            regimes.append(
+                np.full(length, self.volatile_mult if self._volatile else 1.0)
+            )
+            self._volatile = not self._volatile
+            total += length
+        self._vol_mult = np.concatenate(regimes)
+
+    def _stream(self, symbol: str) -> _SymbolStream:
+        stream = self._streams.get(symbol)
+        if stream is None:
+            stream = self._streams[symbol] = _SymbolStream(self.seed, symbol)
+        return stream
+
+    # ---------- Generation ----------
+    def _advance(self, symbol: str, n: int):
+        """The next n bars of symbol as a dict of arrays."""
+        st = self._stream(symbol)
+        k = st.bar
+        self._market(k + n)
+        v = self._vol_mult[k : k + n]
+        factor = self._factor[k : k + n]
+        noise = st.normals.standard_normal((n, 5))
+        jumps = st.uniforms.random(n) < self.jump_prob
+
+        step_sd = st.sigma * v * np.sqrt(_DT)
+        rho = self.correlation
+        shocks = np.sqrt(rho) * factor + np.sqrt(1 - rho) * noise[:, 0]
+        log_ret = (self.annual_drift - 0.5 * (st.sigma * v) ** 2) * _DT
+        log_ret = log_ret + step_sd * shocks + jumps * self.jump_std * noise[:, 1]
+
+        # One running sum from the carried log price: np.cumsum adds in order,
+        # so n bars at once and k + (n - k) bars make the same additions
+        log_closes = np.cumsum(np.concatenate([[st.log_close], log_ret]))[1:]
+        closes = np.maximum(np.exp(log_closes), 0.01)
+        opens = np.concatenate([[st.close], closes[:-1]])
+        highs = np.maximum(opens, closes) * np.exp(0.5 * step_sd * np.abs(noise[:, 2]))
+        lows = np.minimum(opens, closes) * np.exp(-0.5 * step_sd * np.abs(noise[:, 3]))
+        volume = st.base_volume * v * (1 + np.abs(log_ret) / step_sd)
+        volume *= np.exp(0.5 * noise[:, 4])
+        half_spread = st.spread_bps / 1e4 / 2 * v
+
+        if n:
+            st.close = float(closes[-1])
+            st.log_close = log_closes[-1]
+        st.bar = k + n
+        return {
+            "open": opens,
+            "high": highs,
+            "low": lows,
+            "close": closes,
+            "volume": np.round(volume),
+            "vwap": (highs + lows + closes) / 3,
+            "half_spread": half_spread,
+        }
+
+    def bars(self, symbols, n: int, start_t: int = 0):
+        """
+        Advance each symbol by n minute bars.
+
+        Returns:
+            {symbol: BAR_DTYPE array}, bar i starting at start_t + 60 * i
+        """
+        out = {}
+        t = start_t + 60 * np.arange(n, dtype=np.int64)
+        for s in symbols:
+            path = self._advance(s, n)
+            bars = np.empty(n, dtype=BAR_DTYPE)
+            bars["t"] = t
+            for field in ("open", "high", "low", "close", "volume", "vwap"):
+                bars[field] = path[field]
+            out[s] = bars
+        return out
+
+    def quote(self, symbol: str, last: float = None):
+        """
+        Next (bid, ask) for symbol, continuing from last if it is valid.
+
+        Used live when a real quote is missing: the synthetic path picks up
+        from the last real price instead of its own.
+        """
+        st = self._stream(symbol)
+        if last is not None and last > 0:
+            st.close = last
+            st.log_close = np.log(last)
+        path = self._advance(symbol, 1)
+        mid = float(path["close"][0])
+        half = mid * float(path["half_spread"][0])
+        return mid - half, mid + half
@@ -2,34 +2,430 @@
 from __future__ import annotations
 
 import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
 from dotenv import load_dotenv
 from datetime import datetime
 import pytz
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
+import requests
+from requests.adapters import HTTPAdapter
 
 from alpaca.trading.client import TradingClient
 from alpaca.trading.requests import MarketOrderRequest
 from alpaca.trading.enums import OrderSide, TimeInForce
 from alpaca.data.historical import StockHistoricalDataClient
+from alpaca.data.live import StockDataStream
 from alpaca.data.requests import StockLatestQuoteRequest
 from alpaca.data.enums import DataFeed
 
 
+def _timed_call(timer, endpoint, fn, *args):
+    """fn(*args), reporting its latency to timer.observe() if a timer is set."""
+    if timer is None:
+        return fn(*args)
+    start = time.perf_counter()
+    try:
+        return fn(*args)
+    finally:
+        timer.observe(endpoint, time.perf_counter() - start)
+
+
+class _PooledAdapter(HTTPAdapter):
+    """Keep-alive connection pool that applies a default request timeout."""
+
+    def __init__(self, pool_size: int, timeout: Optional[float] = None):
+        self.timeout = timeout
+        super().__init__(pool_connections=pool_size, pool_maxsize=pool_size)
+
+    def send(self, request, **kwargs):
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self.timeout
+        return super().send(request, **kwargs)
+
+
+def _pool_session(rest_client, pool_size: int, timeout: Optional[float]) -> None:
+    """Mount a pooled adapter on an alpaca-py REST client's requests session."""
+    session = getattr(rest_client, "_session", None)
+    if session is None:  # Fakes and other non-alpaca clients
+        return
+    adapter = _PooledAdapter(pool_size, timeout)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    rest_client._retry = 0  # Retries are RequestScheduler's job
+
+
+# ---------- Request scheduling ----------
+PRIORITY_HIGH, PRIORITY_NORMAL, PRIORITY_LOW = 0, 1, 2
+ENDPOINT_PRIORITY = {
+    "clock": PRIORITY_HIGH,
+    "submit_order": PRIORITY_HIGH,
+    "latest_quote": PRIORITY_NORMAL,
+    "latest_quotes": PRIORITY_NORMAL,
+}  # Anything else (bars, diagnostics) is PRIORITY_LOW
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling an endpoint whose circuit breaker is open."""
+
+
+class TokenBucket:
+    """
+    Request rate limiter shared by every thread of one client.
+
+    Holds up to `burst` tokens, refilled at per_minute / 60 per second, and
+    each request takes one. Waiting requests are served by priority, and
+    PRIORITY_LOW requests may not take the last `reserve` tokens, which
+    are kept for the clock, orders and quotes.
+    """
+
+    def __init__(self, per_minute: float, burst: int, reserve: int = 0):
+        self.rate = per_minute / 60.0
+        self.burst = float(burst)
+        self.reserve = reserve
+        self.tokens = self.burst
+        self._updated = time.monotonic()
+        self._cond = threading.Condition()
+        self._waiting = [0, 0, 0]  # Waiting requests per priority
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.burst, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, priority: int = PRIORITY_LOW, timeout=None) -> bool:
+        """Take a token, waiting up to timeout seconds (None: as long as it takes)."""
+        floor = 1 + (self.reserve if priority == PRIORITY_LOW else 0)
+        end = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            self._waiting[priority] += 1
+            try:
+                while True:
+                    now = time.monotonic()
+                    self._refill(now)
+                    first = not any(self._waiting[:priority])
+                    if first and self.tokens >= floor:
+                        self.tokens -= 1
+                        return True
+                    if end is not None and now >= end:
+                        return False
+                    delay = max((floor - self.tokens) / self.rate, 0.01)
+                    if end is not None:
+                        delay = min(delay, end - now)
+                    self._cond.wait(delay)
+            finally:
+                self._waiting[priority] -= 1
+                self._cond.notify_all()
+
+
+class CircuitBreaker:
+    """
+    Per-endpoint breaker: after `threshold` failures in a row the endpoint
+    is skipped for reset_seconds, then one probe request decides whether
+    it closes again or stays open for another reset_seconds.
+    """
+
+    def __init__(self, threshold: int = 5, reset_seconds: float = 30.0):
+        self.threshold = threshold
+        self.reset_seconds = reset_seconds
+        self.failures = 0  # In a row
+        self._opened_at = None  # time.monotonic() when it last opened
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        return "half_open" if self.retry_in() == 0 else "open"
+
+    def retry_in(self) -> float:
+        """Seconds until an open breaker lets a probe through (0 if it would now)."""
+        if self._opened_at is None:
+            return 0.0
+        return max(self._opened_at + self.reset_seconds - time.monotonic(), 0.0)
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if self._probing or self.retry_in() > 0:
+                return False
+            self._probing = True
+            return True
+
+    def release(self) -> None:
+        """Give back a probe slot from allow() that was never used."""
+        with self._lock:
+            self._probing = False
+
+    def success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self._opened_at = None
+            self._probing = False
+
+    def failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self._probing or self.failures >= self.threshold:
+                self._opened_at = time.monotonic()
+            self._probing = False
+
+
+def backoff_delay(attempt: int, base: float, cap: float, rng=random) -> float:
+    """Full-jitter exponential backoff: uniform(0, min(cap, base * 2**attempt))."""
+    return rng.uniform(0, min(cap, base * 2**attempt))
+
+
+def _is_transient(e: Exception) -> bool:
+    """Connection problems, timeouts, 429 and 5xx are worth retrying."""
+    if isinstance(e, (requests.ConnectionError, requests.Timeout, ConnectionError)):
+        return True
+    if isinstance(e, TimeoutError):
+        return True
+    try:
+        status = getattr(e, "status_code", None)
+    except Exception:  # alpaca's APIError without an HTTP response
+        status = None
+    return isinstance(status, int) and (status == 429 or status >= 500)
+
+
+def _retry_after(e: Exception) -> Optional[float]:
+    """Seconds from a Retry-After header on the error's response, if any."""
+    try:
+        value = e.response.headers.get("Retry-After")
+        return float(value) if value is not None else None
+    except Exception:
+        return None
+
+
+class RequestScheduler:
+    """
+    Runs every API call of an AlpacaClient through:
+
+    - a TokenBucket sized to the provider's rate limit, serving the clock,
+      orders and quotes ahead of everything else (ENDPOINT_PRIORITY)
+    - a CircuitBreaker per endpoint, so a failing endpoint fails fast
+    - retries of transient errors with jittered exponential backoff
+      (or the server's Retry-After), bounded by an optional deadline
+    """
+
+    def __init__(
+        self,
+        per_minute: float = 200,
+        burst: int = 50,
+        retries: int = 3,
+        backoff_base: float = 0.5,
+        backoff_cap: float = 30.0,
+        breaker_threshold: int = 5,
+        breaker_reset_seconds: float = 30.0,
+        timer=None,
+        seed=None,
+    ):
+        """
+        Args:
+            per_minute: Sustained request rate (Alpaca allows 200/min)
+            burst: Requests that may go out back to back
+            retries: Retries of a transient error per call
+            timer: Optional instrumentation.LoopTimer fed with API latencies
+            seed: Seed of the backoff jitter (None: random)
+        """
+        self.bucket = TokenBucket(per_minute, burst, reserve=burst // 5)
+        self.retries = retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.breaker_threshold = breaker_threshold
+        self.breaker_reset_seconds = breaker_reset_seconds
+        self.timer = timer
+        self.breakers = {}  # {endpoint: CircuitBreaker}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def breaker(self, endpoint: str) -> CircuitBreaker:
+        with self._lock:
+            breaker = self.breakers.get(endpoint)
+            if breaker is None:
+                breaker = self.breakers[endpoint] = CircuitBreaker(
+                    self.breaker_threshold, self.breaker_reset_seconds
+                )
+            return breaker
+
+    def call(
+        self,
+        endpoint: str,
+        fn,
+        *args,
+        deadline: Optional[float] = None,
+        retries: Optional[int] = None,
+    ):
+        """
+        fn(*args) under the rate limit, breaker and retry policy of endpoint.
+
+        Args:
+            deadline: Seconds the whole call (waits and retries) may take
+            retries: Override of self.retries (0 for requests that must not
+                be repeated, like orders)
+
+        Raises:
+            CircuitOpenError: The endpoint's breaker is open
+            TimeoutError: No request slot freed up before the deadline
+            The last error of fn once retries or the deadline run out
+        """
+        end = None if deadline is None else time.monotonic() + deadline
+        retries = self.retries if retries is None else retries
+        priority = ENDPOINT_PRIORITY.get(endpoint, PRIORITY_LOW)
+        breaker = self.breaker(endpoint)
+        attempt = 0
+        while True:
+            if not breaker.allow():
+                raise CircuitOpenError(
+                    f"{endpoint} circuit open, retry in {breaker.retry_in():.0f}s"
+                )
+            remaining = None if end is None else max(end - time.monotonic(), 0.0)
+            if not self.bucket.acquire(priority, remaining):
+                breaker.release()
+                raise TimeoutError(f"{endpoint}: rate limit left no slot in time")
+            try:
+                result = _timed_call(self.timer, endpoint, fn, *args)
+            except Exception as e:
+                # Errors that retrying can't fix (e.g. 401 from a bad key) are
+                # raised at once, but repeats still open the breaker so callers
+                # polling the endpoint back off instead of hammering it
+                breaker.failure()
+                if not _is_transient(e):
+                    raise
+                delay = _retry_after(e)
+                if delay is None:
+                    delay = backoff_delay(
+                        attempt, self.backoff_base, self.backoff_cap, self._rng
+                    )
+                delay = min(delay, self.backoff_cap)
+                attempt += 1
+                late = end is not None and time.monotonic() + delay > end
+                if attempt > retries or late or breaker.state != "closed":
+                    raise
+                time.sleep(delay)
+                continue
+            breaker.success()
+            return result
+
+    def retry_in(self, endpoint: str) -> float:
+        """Seconds to wait before calling endpoint again after call() failed."""
+        breaker = self.breaker(endpoint)
+        if breaker.state == "open":
+            return breaker.retry_in()
+        return backoff_delay(
+            breaker.failures, self.backoff_base, self.backoff_cap, self._rng
+        )
+
+
+class MarketClock:
+    """
+    Shared, cached view of the market clock.
+
+    The Alpaca clock is fetched once; open/closed state is then derived
+    locally from next_open/next_close. A new fetch is only needed once the
+    market passes next_open, since next_close is unknown until then.
+    """
+
+    def __init__(self, trading, min_refresh_seconds: float = 15.0):
+        self.trading = trading
+        self.min_refresh_seconds = min_refresh_seconds
+        self._is_open = None
+        self._next_open = None
+        self._next_close = None
+        self._fetched_at = None  # time.monotonic() of last fetch
+        self.fetches = 0
+        self.scheduler = None  # Optional RequestScheduler
+
+    def refresh(self) -> None:
+        get_clock = self.trading.get_clock
+        if self.scheduler is not None:
+            clock = self.scheduler.call("clock", get_clock)
+        else:
+            clock = get_clock()
+        self._is_open = clock.is_open
+        self._next_open = clock.next_open
+        self._next_close = clock.next_close
+        self._fetched_at = time.monotonic()
+        self.fetches += 1
+
+    def _state(self, now: datetime) -> bool:
+        if self._fetched_at is None:
+            self.refresh()
+        if self._is_open:
+            if now < self._next_close:
+                return True
+            if now < self._next_open:
+                return False  # Closed since next_close, derived locally
+        elif now < self._next_open:
+            return False
+        # Past a transition we can't derive locally. Around the edge the API
+        # may lag a few seconds, so don't re-fetch more than once per interval.
+        if time.monotonic() - self._fetched_at >= self.min_refresh_seconds:
+            self.refresh()
+        return self._is_open
+
+    def is_open(self, now: datetime = None) -> bool:
+        return self._state(now or datetime.now(pytz.UTC))
+
+    def next_open(self, now: datetime = None) -> datetime:
+        self._state(now or datetime.now(pytz.UTC))
+        return self._next_open
+
+    def next_close(self, now: datetime = None) -> datetime:
+        self._state(now or datetime.now(pytz.UTC))
+        return self._next_close
+
+
 class AlpacaClient:
-    def __init__(self, env_file: str = ".env", paper: bool = True):
+    def __init__(
+        self,
+        env_file: str = ".env",
+        paper: bool = True,
+        trading=None,
+        data=None,
+        timer=None,
+        pool_size: int = 10,
+        request_timeout: Optional[float] = None,
+        scheduler: Optional[RequestScheduler] = None,
+    ):
+        """
+        Args:
+            env_file: .env file holding ALPACA_API_KEY / ALPACA_SECRET_KEY
+            paper: Use the paper trading endpoint
+            trading: Optional pre-built trading client (e.g. a fake for tests)
+            data: Optional pre-built market data client (e.g. a fake for tests)
+            timer: Optional instrumentation.LoopTimer fed with API latencies
+            pool_size: Keep-alive connections per host, so concurrent quote
+                requests reuse TLS sessions instead of reconnecting
+            request_timeout: Seconds before an HTTP request gives up (None: wait)
+            scheduler: Rate limit, retry and circuit breaker policy for every
+                API call (default: RequestScheduler())
+        """
         load_dotenv(env_file)
 
-        self.trading = TradingClient(
+        self.trading = trading or TradingClient(
             api_key=os.getenv("ALPACA_API_KEY"),
             secret_key=os.getenv("ALPACA_SECRET_KEY"),
             paper=paper,
         )
 
-        self.data = StockHistoricalDataClient(
+        self.data = data or StockHistoricalDataClient(
             api_key=os.getenv("ALPACA_API_KEY"),
             secret_key=os.getenv("ALPACA_SECRET_KEY"),
         )
 
+        for rest_client in (self.trading, self.data):
+            _pool_session(rest_client, pool_size, request_timeout)
+
+        self.scheduler = scheduler or RequestScheduler()
+        if timer is not None:
+            self.scheduler.timer = timer
+        self.clock = MarketClock(self.trading)
+        self.clock.scheduler = self.scheduler
         self.feed = DataFeed.IEX
         self.tz = pytz.timezone("US/Eastern")
 
@@ -43,22 +439,50 @@ class AlpacaClient:
 
     # ---------- Market ----------
     def market_is_open(self) -> bool:
-        return self.trading.get_clock().is_open
+        return self.clock.is_open()
 
     # ---------- Price ----------
-    def get_quote(self, symbol: str):
+    def get_quote(self, symbol: str, deadline: Optional[float] = None):
         """Get bid and ask prices."""
         req = StockLatestQuoteRequest(symbol_or_symbols=symbol, feed=self.feed)
-        return self.data.get_stock_latest_quote(req).get(symbol)
+        quotes = self.scheduler.call(
+            "latest_quote", self.data.get_stock_latest_quote, req, deadline=deadline
+        )
+        return quotes.get(symbol)
+
+    def get_quotes(self, symbols: List[str], deadline: Optional[float] = None) -> Dict:
+        """Get latest quotes for many symbols with a single request."""
+        if not symbols:
+            return {}
+        req = StockLatestQuoteRequest(symbol_or_symbols=list(symbols), feed=self.feed)
+        return self.scheduler.call(
+            "latest_quotes", self.data.get_stock_latest_quote, req, deadline=deadline
+        )
 
     def get_bid_ask(self, symbol: str):
         """Return (bid, ask) tuple or (None, None) if unavailable."""
-        q = self.get_quote(symbol)
+        return self._check_quote(symbol, self.get_quote(symbol), datetime.now(pytz.UTC))
+
+    def get_bid_ask_many(
+        self, symbols: List[str], deadline: Optional[float] = None
+    ) -> Dict[str, Tuple]:
+        """
+        Return {symbol: (bid, ask)} for all symbols using one batched request.
+
+        Symbols without a usable quote map to (None, None), exactly as
+        get_bid_ask would return for them. Transient errors are retried
+        until deadline seconds have passed (None: the scheduler's retries).
+        """
+        quotes = self.get_quotes(symbols, deadline)
+        now = datetime.now(pytz.UTC)
+        return {s: self._check_quote(s, quotes.get(s), now) for s in symbols}
+
+    def _check_quote(self, symbol: str, q, now: datetime):
+        """Apply staleness and no-update checks to a raw quote."""
         if not q or q.bid_price is None or q.ask_price is None:
             return None, None
 
         bid, ask = q.bid_price, q.ask_price
-        now = datetime.now(pytz.UTC)
         quote_time = q.timestamp if hasattr(q, "timestamp") else now
 
         # Check if quote is stale (older than 5 minutes)
@@ -92,6 +516,10 @@ class AlpacaClient:
 
         return bid, ask
 
+    def get_bars(self, req):
+        """Historical bars for a StockBarsRequest (low priority, see ENDPOINT_PRIORITY)."""
+        return self.scheduler.call("bars", self.data.get_stock_bars, req)
+
     def get_mid_price(self, symbol: str) -> Optional[float]:
         bid, ask = self.get_bid_ask(symbol)
         if bid is None or ask is None:
@@ -100,21 +528,101 @@ class AlpacaClient:
 
     # ---------- Orders ----------
     def buy_market(self, symbol: str, qty: int):
-        return self.trading.submit_order(
-            MarketOrderRequest(
-                symbol=symbol,
-                qty=qty,
-                side=OrderSide.BUY,
-                time_in_force=TimeInForce.DAY,
-            )
+        order = MarketOrderRequest(
+            symbol=symbol,
+            qty=qty,
+            side=OrderSide.BUY,
+            time_in_force=TimeInForce.DAY,
+        )
+        return self.scheduler.call(
+            "submit_order", self.trading.submit_order, order, retries=0
         )
 
     def sell_market(self, symbol: str, qty: int):
-        return self.trading.submit_order(
-            MarketOrderRequest(
-                symbol=symbol,
-                qty=qty,
-                side=OrderSide.SELL,
-                time_in_force=TimeInForce.DAY,
+        order = MarketOrderRequest(
+            symbol=symbol,
+            qty=qty,
+            side=OrderSide.SELL,
+            time_in_force=TimeInForce.DAY,
+        )
+        return self.scheduler.call(
+            "submit_order", self.trading.submit_order, order, retries=0
+        )
+
+
+class QuoteFetcher:
+    """
+    Per-symbol latest-quote requests on a bounded thread pool.
+
+    fetch() waits at most deadline_seconds for the whole bar. Symbols whose
+    request is still running come back as (None, None) for that bar and are
+    not resubmitted until the request finishes, so a hung symbol ties up one
+    worker instead of the loop.
+    """
+
+    def __init__(self, client: AlpacaClient, workers: int = 8, deadline_seconds=10.0):
+        self.client = client
+        self.deadline_seconds = deadline_seconds
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="quote")
+        self._in_flight = {}  # {symbol: Future} that missed an earlier deadline
+        self.late = []  # Symbols missing from the last fetch() for lack of time
+        self.failed = {}  # {symbol: error name} from the last fetch()
+
+    def fetch(self, symbols: List[str]) -> Dict[str, Tuple]:
+        """Return {symbol: (bid, ask)}, (None, None) where late or unusable."""
+        futures = {}
+        for s in symbols:
+            pending = self._in_flight.get(s)
+            if pending is not None and not pending.done():
+                continue
+            futures[s] = self.pool.submit(
+                self.client.get_quote, s, self.deadline_seconds
             )
+        done, _ = wait(futures.values(), timeout=self.deadline_seconds)
+
+        # Quote checks touch the client's staleness state, so run them here
+        now = datetime.now(pytz.UTC)
+        self.late = []
+        self.failed = {}
+        out = {}
+        for s in symbols:
+            future = futures.get(s)
+            if future is None or future not in done:
+                if future is not None:
+                    self._in_flight[s] = future
+                self.late.append(s)
+                out[s] = (None, None)
+                continue
+            self._in_flight.pop(s, None)
+            try:
+                out[s] = self.client._check_quote(s, future.result(), now)
+            except Exception as e:
+                self.failed[s] = type(e).__name__
+                out[s] = (None, None)
+        return out
+
+    def close(self) -> None:
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+
+class AlpacaQuoteSource:
+    """Live quote source backed by Alpaca's websocket stream (see data.quote_book)."""
+
+    def __init__(self, symbols: List[str], env_file: str = ".env", feed=DataFeed.IEX):
+        load_dotenv(env_file)
+        self.symbols = list(symbols)
+        self.stream = StockDataStream(
+            api_key=os.getenv("ALPACA_API_KEY"),
+            secret_key=os.getenv("ALPACA_SECRET_KEY"),
+            feed=feed,
         )
+
+    def run(self, on_quote) -> None:
+        async def handle(q):
+            on_quote(q.symbol, q.bid_price, q.ask_price, q.timestamp)
+
+        self.stream.subscribe_quotes(handle, *self.symbols)
+        self.stream.run()
+
+    def stop(self) -> None:
+        self.stream.stop()
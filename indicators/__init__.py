@@ -1,3 +1,4 @@
 from .momentum import roc, rsi
+from .streaming import StreamingIndicators
 
-__all__ = ["roc", "rsi"]
+__all__ = ["roc", "rsi", "StreamingIndicators"]
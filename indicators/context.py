@@ -0,0 +1,52 @@
+from indicators.streaming import StreamingIndicators
+
+
+class IndicatorContext:
+    """
+    Per-bar indicator cache shared by every penguin.
+
+    Values are memoized under (symbol, indicator, params, lag, bar), so when
+    several penguins ask for the same signal in the same bar it is computed
+    once. new_bar() drops the previous bar's entries. Misses are served by
+    StreamingIndicators, so they cost O(1) per new price as well.
+    """
+
+    def __init__(self, indicators: StreamingIndicators = None):
+        self.indicators = indicators or StreamingIndicators()
+        self.bar = 0
+        self._cache = {}
+        self.hits = 0
+        self.misses = 0
+
+    def new_bar(self, bar: int = None) -> None:
+        self.bar = bar if bar is not None else self.bar + 1
+        self._cache.clear()
+
+    def _get(self, name, symbol, prices, n, lag=0):
+        key = (symbol, name, n, lag, self.bar)
+        value = self._cache.get(key)
+        if value is None:
+            self.misses += 1
+            value = getattr(self.indicators, name)(symbol, prices, n, lag=lag)
+            self._cache[key] = value
+        else:
+            self.hits += 1
+        return value
+
+    def rsi(self, symbol, prices, n=14):
+        return self._get("rsi", symbol, prices, n)
+
+    def roc(self, symbol, prices, n=5):
+        return self._get("roc", symbol, prices, n)
+
+    def sma(self, symbol, prices, n=10):
+        return self._get("sma", symbol, prices, n)
+
+    def zscore(self, symbol, prices, n=20):
+        return self._get("zscore", symbol, prices, n)
+
+    def rolling_max(self, symbol, prices, n, lag=0):
+        return self._get("rolling_max", symbol, prices, n, lag)
+
+    def rolling_min(self, symbol, prices, n, lag=0):
+        return self._get("rolling_min", symbol, prices, n, lag)
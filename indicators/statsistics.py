@@ -3,7 +3,7 @@ import numpy as np
 
 def sma(prices, n=10):
     if len(prices) < n:
-        return prices[-1] if prices else 0
+        return prices[-1] if len(prices) else 0
     return np.mean(prices[-n:])
 
 
@@ -13,3 +13,13 @@ def zscore(prices, n=20):
     mean = np.mean(prices[-n:])
     std = np.std(prices[-n:])
     return (prices[-1] - mean) / std if std > 0 else 0
+
+
+def ema(prices, n=10):
+    if len(prices) < n:
+        return prices[-1] if len(prices) else 0
+    alpha = 2 / (n + 1)
+    value = np.mean(prices[:n])  # Seed with the SMA of the first n prices
+    for p in prices[n:]:
+        value = alpha * p + (1 - alpha) * value
+    return value
@@ -0,0 +1,298 @@
+"""
+Streaming (O(1) per bar) versions of the indicators in this package.
+
+Each indicator consumes one price at a time with update() and keeps just
+enough running state (sums, deques) that the cost of a new bar does not
+depend on the lookback length. Outputs match momentum.rsi/roc and
+statsistics.sma/zscore, including their warm-up values, up to
+floating-point rounding.
+
+StreamingIndicators keeps one indicator per (symbol, name, params, lag)
+and syncs it against a symbol's growing price series, so callers can keep
+passing the full history the way penguins already do. lag=k computes the
+indicator as of k bars ago (the series without its last k prices), so
+callers never slice the series themselves.
+"""
+
+from collections import deque
+import math
+
+
+class StreamingIndicator:
+    """Base class: feed prices with update(), read the result from value."""
+
+    def __init__(self):
+        self.count = 0
+
+    def reset(self):
+        self.__init__(*self._args)
+
+    def update(self, price: float):
+        raise NotImplementedError
+
+    @property
+    def value(self):
+        raise NotImplementedError
+
+    def sync(self, prices, lag=0):
+        """Feed the part of a growing series not seen yet and return value.
+
+        The last `lag` prices are left out, so the value is as of lag bars ago.
+        """
+        end = len(prices) - lag
+        if end < self.count:
+            self.reset()
+        for price in prices[self.count : end]:
+            self.update(float(price))
+        return self.value
+
+
+class RollingROC(StreamingIndicator):
+    """Rate of change over n bars (see momentum.roc)."""
+
+    def __init__(self, n=5):
+        super().__init__()
+        self._args = (n,)
+        self.n = n
+        self._window = deque(maxlen=n + 1)
+
+    def update(self, price):
+        self._window.append(price)
+        self.count += 1
+        return self.value
+
+    @property
+    def value(self):
+        if self.count < self.n + 1:
+            return 0.0
+        return (self._window[-1] - self._window[0]) / self._window[0]
+
+
+class RollingRSI(StreamingIndicator):
+    """
+    RSI over the last n price changes (see momentum.rsi).
+
+    With wilder=True uses Wilder's smoothed averages instead of a plain
+    window; that variant has no list-based counterpart.
+    """
+
+    # Re-sum the window this often to keep rounding drift bounded
+    RESUM_EVERY = 1024
+
+    def __init__(self, n=14, wilder=False):
+        super().__init__()
+        self._args = (n, wilder)
+        self.n = n
+        self.wilder = wilder
+        self._last = None
+        self._deltas = deque(maxlen=n)
+        self._gains = 0.0
+        self._losses = 0.0
+        self._n_up = 0  # Up/down moves in the window, so flat sides are exact
+        self._n_down = 0
+        self._avg_gain = None
+        self._avg_loss = None
+        self._since_resum = 0
+
+    def update(self, price):
+        self.count += 1
+        if self._last is None:
+            self._last = price
+            return self.value
+        delta = price - self._last
+        self._last = price
+
+        if self.wilder:
+            self._update_wilder(delta)
+            return self.value
+
+        if len(self._deltas) == self.n:
+            old = self._deltas[0]
+            if old > 0:
+                self._gains -= old
+                self._n_up -= 1
+            elif old < 0:
+                self._losses += old
+                self._n_down -= 1
+        self._deltas.append(delta)
+        if delta > 0:
+            self._gains += delta
+            self._n_up += 1
+        elif delta < 0:
+            self._losses -= delta
+            self._n_down += 1
+
+        self._since_resum += 1
+        if self._since_resum >= self.RESUM_EVERY:
+            self._gains = sum(d for d in self._deltas if d > 0)
+            self._losses = -sum(d for d in self._deltas if d < 0)
+            self._since_resum = 0
+        return self.value
+
+    def _update_wilder(self, delta):
+        gain, loss = max(delta, 0.0), max(-delta, 0.0)
+        if self._avg_gain is None:
+            self._deltas.append(delta)
+            if len(self._deltas) == self.n:
+                self._avg_gain = sum(d for d in self._deltas if d > 0) / self.n
+                self._avg_loss = -sum(d for d in self._deltas if d < 0) / self.n
+            return
+        self._avg_gain = (self._avg_gain * (self.n - 1) + gain) / self.n
+        self._avg_loss = (self._avg_loss * (self.n - 1) + loss) / self.n
+
+    @property
+    def value(self):
+        if self.count < self.n + 1:
+            return 50
+        if self.wilder:
+            gains, losses = self._avg_gain, self._avg_loss
+        else:
+            gains = self._gains if self._n_up else 0.0
+            losses = self._losses if self._n_down else 0.0
+        if losses <= 0:
+            return 100
+        rs = gains / losses
+        return 100 - (100 / (1 + rs))
+
+
+class RollingMeanStd(StreamingIndicator):
+    """Rolling mean and population std from running sum and sum of squares."""
+
+    def __init__(self, n=20):
+        super().__init__()
+        self._args = (n,)
+        self.n = n
+        self._window = deque(maxlen=n)
+        self._shift = None  # Sums are taken around the first price for precision
+        self._sum = 0.0
+        self._sumsq = 0.0
+
+    def update(self, price):
+        if self._shift is None:
+            self._shift = price
+        if len(self._window) == self.n:
+            old = self._window[0] - self._shift
+            self._sum -= old
+            self._sumsq -= old * old
+        self._window.append(price)
+        x = price - self._shift
+        self._sum += x
+        self._sumsq += x * x
+        self.count += 1
+        return self.value
+
+    @property
+    def last(self):
+        return self._window[-1] if self._window else None
+
+    @property
+    def mean(self):
+        if not self._window:
+            return 0.0
+        return self._shift + self._sum / len(self._window)
+
+    @property
+    def std(self):
+        k = len(self._window)
+        if k == 0:
+            return 0.0
+        m = self._sum / k
+        return math.sqrt(max(self._sumsq / k - m * m, 0.0))
+
+    @property
+    def value(self):
+        return self.mean
+
+
+class RollingSMA(RollingMeanStd):
+    """Simple moving average (see statsistics.sma)."""
+
+    @property
+    def value(self):
+        if self.count < self.n:
+            return self.last if self.count else 0
+        return self.mean
+
+
+class RollingZScore(RollingMeanStd):
+    """Z-score of the latest price within the window (see statsistics.zscore)."""
+
+    @property
+    def value(self):
+        if self.count < self.n:
+            return 0
+        std = self.std
+        # Treat rounding-level spread in a flat window as zero
+        if std <= 1e-12 * max(abs(self.mean), 1.0):
+            return 0
+        return (self.last - self.mean) / std
+
+
+class RollingMax(StreamingIndicator):
+    """Max of the last n prices via a monotonic deque."""
+
+    def __init__(self, n=20):
+        super().__init__()
+        self._args = (n,)
+        self.n = n
+        self._deque = deque()  # (index, price), prices decreasing
+
+    def _dominates(self, new, old):
+        return new >= old
+
+    def update(self, price):
+        while self._deque and self._dominates(price, self._deque[-1][1]):
+            self._deque.pop()
+        self._deque.append((self.count, price))
+        if self._deque[0][0] <= self.count - self.n:
+            self._deque.popleft()
+        self.count += 1
+        return self.value
+
+    @property
+    def value(self):
+        return self._deque[0][1] if self._deque else None
+
+
+class RollingMin(RollingMax):
+    """Min of the last n prices via a monotonic deque."""
+
+    def _dominates(self, new, old):
+        return new <= old
+
+
+class StreamingIndicators:
+    """
+    Streaming indicators keyed by (symbol, name, params, lag).
+
+    Each method takes the symbol's full price series, like the list-based
+    functions do, but only feeds the bars added since the last call.
+    """
+
+    def __init__(self):
+        self._state = {}
+
+    def _sync(self, key, factory, prices, lag=0):
+        key = key + (lag,)
+        ind = self._state.get(key)
+        if ind is None:
+            ind = self._state[key] = factory()
+        return ind.sync(prices, lag)
+
+    def rsi(self, symbol, prices, n=14, lag=0):
+        return self._sync((symbol, "rsi", n), lambda: RollingRSI(n), prices, lag)
+
+    def roc(self, symbol, prices, n=5, lag=0):
+        return self._sync((symbol, "roc", n), lambda: RollingROC(n), prices, lag)
+
+    def sma(self, symbol, prices, n=10, lag=0):
+        return self._sync((symbol, "sma", n), lambda: RollingSMA(n), prices, lag)
+
+    def zscore(self, symbol, prices, n=20, lag=0):
+        return self._sync((symbol, "zscore", n), lambda: RollingZScore(n), prices, lag)
+
+    def rolling_max(self, symbol, prices, n, lag=0):
+        return self._sync((symbol, "max", n), lambda: RollingMax(n), prices, lag)
+
+    def rolling_min(self, symbol, prices, n, lag=0):
+        return self._sync((symbol, "min", n), lambda: RollingMin(n), prices, lag)
@@ -2,13 +2,17 @@ import numpy as np
 
 
 def atr(highs, lows, closes, n=14):
-    trs = []
-    for i in range(1, len(closes)):
-        trs.append(
-            max(
-                highs[i] - lows[i],
-                abs(highs[i] - closes[i - 1]),
-                abs(lows[i] - closes[i - 1]),
-            )
-        )
-    return np.mean(trs[-n:]) if len(trs) >= n else 0
+    highs = np.asarray(highs, dtype=float)
+    lows = np.asarray(lows, dtype=float)
+    closes = np.asarray(closes, dtype=float)
+    if len(closes) - 1 < n:
+        return 0
+    prev_close = closes[:-1]
+    trs = np.maximum.reduce(
+        [
+            highs[1:] - lows[1:],
+            np.abs(highs[1:] - prev_close),
+            np.abs(lows[1:] - prev_close),
+        ]
+    )
+    return np.mean(trs[-n:])
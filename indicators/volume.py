@@ -1,8 +1,9 @@
+import numpy as np
+
+
 def obv(prices, volumes):
-    obv = 0
-    for i in range(1, len(prices)):
-        if prices[i] > prices[i - 1]:
-            obv += volumes[i]
-        elif prices[i] < prices[i - 1]:
-            obv -= volumes[i]
-    return obv
+    prices = np.asarray(prices, dtype=float)
+    volumes = np.asarray(volumes, dtype=float)
+    if len(prices) < 2:
+        return 0
+    return float(np.dot(np.sign(np.diff(prices)), volumes[1 : len(prices)]))
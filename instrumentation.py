@@ -0,0 +1,210 @@
+"""
+Per-bar timing of the live trading loop.
+
+LoopTimer collects, for the whole run:
+
+- phase spans (quotes, step/decide, checkpoint, plot, ...) per bar
+- decide() time per penguin and per symbol
+- API latency per endpoint, reported by AlpacaClient through observe()
+- bars that overran their time budget
+
+Every series is a running count/sum/max plus a fixed log-scale histogram,
+so memory does not grow with the run. When instrumentation is off,
+Simulator and AlpacaClient get timer=None and skip timing altogether, and
+run() uses NULL_TIMER, whose span() hands back one shared no-op context.
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import nullcontext
+
+# Histogram bucket upper bounds in ms; the last bucket catches the rest
+BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000)
+
+
+class Histogram:
+    __slots__ = ("count", "total", "max", "counts")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.counts = [0] * (len(BUCKETS_MS) + 1)
+
+    def add(self, seconds: float) -> None:
+        ms = seconds * 1000
+        self.count += 1
+        self.total += ms
+        if ms > self.max:
+            self.max = ms
+        for i, bound in enumerate(BUCKETS_MS):
+            if ms <= bound:
+                self.counts[i] += 1
+                return
+        self.counts[-1] += 1
+
+    def percentile(self, q: float) -> float:
+        """Upper bound (ms) of the bucket holding the q-th percentile."""
+        target = self.count * q / 100
+        seen = 0
+        for bound, n in zip(BUCKETS_MS, self.counts):
+            seen += n
+            if seen >= target:
+                return min(float(bound), self.max)
+        return self.max
+
+    def to_dict(self):
+        return {
+            "count": self.count,
+            "total_ms": round(self.total, 3),
+            "mean_ms": round(self.total / self.count, 3) if self.count else 0.0,
+            "p50_ms": self.percentile(50),
+            "p95_ms": self.percentile(95),
+            "max_ms": round(self.max, 3),
+            "buckets_ms": dict(zip([*map(str, BUCKETS_MS), "inf"], self.counts)),
+        }
+
+
+class _Span:
+    __slots__ = ("timer", "name", "start")
+
+    def __init__(self, timer, name):
+        self.timer = timer
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.timer.add(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class LoopTimer:
+    enabled = True
+
+    def __init__(self, budget_seconds: float):
+        self.budget_seconds = budget_seconds
+        self.phases = {}  # {phase: Histogram}
+        self.api = {}  # {endpoint: Histogram}
+        self.penguins = {}  # {penguin: [seconds, calls]}
+        self.symbols = {}  # {symbol: [seconds, calls]}
+        self.bars = Histogram()
+        self.overruns = 0
+        self.bar = {}  # {phase: seconds} for the bar in progress
+        self._bar_start = None
+        self._api_lock = threading.Lock()  # QuoteFetcher workers report here
+
+    # ---------- Recording ----------
+    def span(self, name: str):
+        return _Span(self, name)
+
+    def add(self, name: str, seconds: float) -> None:
+        hist = self.phases.get(name)
+        if hist is None:
+            hist = self.phases[name] = Histogram()
+        hist.add(seconds)
+        self.bar[name] = self.bar.get(name, 0.0) + seconds
+
+    def observe(self, endpoint: str, seconds: float) -> None:
+        with self._api_lock:
+            hist = self.api.get(endpoint)
+            if hist is None:
+                hist = self.api[endpoint] = Histogram()
+            hist.add(seconds)
+
+    def decide(self, penguin: str, symbol, seconds: float) -> None:
+        """One decide() (symbol set) or decide_batch() (symbol None) call."""
+        entry = self.penguins.setdefault(penguin, [0.0, 0])
+        entry[0] += seconds
+        entry[1] += 1
+        if symbol is not None:
+            entry = self.symbols.setdefault(symbol, [0.0, 0])
+            entry[0] += seconds
+            entry[1] += 1
+
+    def start_bar(self) -> None:
+        self.bar = {}
+        self._bar_start = time.perf_counter()
+
+    def end_bar(self) -> float:
+        """Close the bar; return its duration and count it if over budget."""
+        seconds = time.perf_counter() - self._bar_start
+        self.bars.add(seconds)
+        if seconds > self.budget_seconds:
+            self.overruns += 1
+        return seconds
+
+    def bar_breakdown(self, top: int = 4) -> str:
+        """The bar's slowest top-level phases, e.g. 'quotes 2.1s, step 35ms'."""
+        phases = [(n, s) for n, s in self.bar.items() if "/" not in n]
+        phases.sort(key=lambda kv: -kv[1])
+        return ", ".join(f"{n} {_fmt(s)}" for n, s in phases[:top])
+
+    # ---------- Output ----------
+    def snapshot(self):
+        def totals(table):
+            rows = [
+                {
+                    "name": name,
+                    "total_ms": round(seconds * 1000, 3),
+                    "calls": calls,
+                    "mean_us": round(seconds / calls * 1e6, 2) if calls else 0.0,
+                }
+                for name, (seconds, calls) in table.items()
+            ]
+            return sorted(rows, key=lambda r: -r["total_ms"])
+
+        with self._api_lock:
+            api = {n: h.to_dict() for n, h in sorted(self.api.items())}
+
+        return {
+            "budget_seconds": self.budget_seconds,
+            "bars": self.bars.to_dict(),
+            "overruns": self.overruns,
+            "phases": {n: h.to_dict() for n, h in sorted(self.phases.items())},
+            "api": api,
+            "penguins": totals(self.penguins),
+            "symbols": totals(self.symbols),
+        }
+
+    def write(self, path: str) -> None:
+        tmp = path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.snapshot(), f, indent=2)
+        os.replace(tmp, path)
+
+
+class _NullTimer:
+    """Stand-in for LoopTimer when instrumentation is off; does nothing."""
+
+    enabled = False
+    _span = nullcontext()
+
+    def span(self, name):
+        return self._span
+
+    def start_bar(self):
+        pass
+
+    def end_bar(self):
+        return 0.0
+
+    def bar_breakdown(self, top=4):
+        return ""
+
+    def snapshot(self):
+        return None
+
+    def write(self, path):
+        pass
+
+
+NULL_TIMER = _NullTimer()
+
+
+def _fmt(seconds: float) -> str:
+    return f"{seconds:.1f}s" if seconds >= 1 else f"{seconds * 1000:.0f}ms"
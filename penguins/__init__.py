@@ -7,6 +7,9 @@ from .random_penguin2 import RandomPenguin2
 from .trend_penguin import TrendPenguin
 from .careful_trend_penguin import CarefulTrendPenguin
 from .copilot_penguin import CopilotPenguin
+from .rsi_mean_reversion_penguin import RSIMeanReversionPenguin
+from .volatility_breakout_penguin import VolatilityBreakoutPenguin
+from .moving_average_crossover_penguin import MovingAverageCrossoverPenguin
 
 __all__ = [
     "BasePenguin",
@@ -18,4 +21,7 @@ __all__ = [
     "TrendPenguin",
     "CarefulTrendPenguin",
     "CopilotPenguin",
+    "RSIMeanReversionPenguin",
+    "VolatilityBreakoutPenguin",
+    "MovingAverageCrossoverPenguin",
 ]
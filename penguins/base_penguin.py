@@ -1,31 +1,123 @@
 from abc import ABC, abstractmethod
-from typing import List
-from backtest.portfolio import Portfolio
+from typing import Sequence
+
+import numpy as np
+
+from backtest.portfolio import Portfolio, HOLD, BUY, SELL, DECISION_CODES
+
+
+def tail_window(prices_matrix, lengths, n):
+    """
+    Gather the last n prices of every row into an (symbols x n) array.
+
+    Row i of prices_matrix is valid up to lengths[i]; rows with fewer than
+    n prices come back NaN-padded on the left.
+    """
+    idx = lengths[:, None] - n + np.arange(n)
+    window = np.take_along_axis(prices_matrix, np.clip(idx, 0, None), axis=1)
+    window[idx < 0] = np.nan
+    return window
+
+
+def decisions_from_masks(buy, sell):
+    """Turn boolean BUY/SELL masks into (decisions, quantities) of 1 share each."""
+    decisions = np.where(buy, BUY, np.where(sell, SELL, HOLD)).astype(np.int8)
+    return decisions, (decisions != HOLD).astype(np.int64)
 
 
 class BasePenguin(ABC):
+    # Attributes that change while trading and must survive a restart.
+    # Indicators and other derived state are left out: they rebuild from
+    # the restored PriceHistory on the next bar.
+    STATE_FIELDS = ()
+
     def __init__(self, name: str):
         self.name = name
 
+    def state(self) -> dict:
+        """The STATE_FIELDS attributes, for checkpoints."""
+        return {name: getattr(self, name) for name in self.STATE_FIELDS}
+
+    def load_state(self, state: dict) -> None:
+        """Restore attributes saved by state(); unknown keys are ignored."""
+        for name in self.STATE_FIELDS:
+            if name in state:
+                setattr(self, name, state[name])
+
     @abstractmethod
     def decide(
         self,
         symbol: str,
-        mid_prices: List[float],
+        mid_prices: Sequence[float],
         bid: float,
         ask: float,
         portfolio: Portfolio,
+        ctx=None,
     ) -> tuple[str, int]:
         """
         Make trading decision based on mid-price history and current bid/ask.
 
         Args:
             symbol: Stock symbol
-            mid_prices: Historical mid-prices for analysis
+            mid_prices: Historical mid-prices for analysis (a read-only
+                PriceHistory view during simulation; don't keep it across bars)
             bid: Current bid price (sell at this)
             ask: Current ask price (buy at this)
             portfolio: Current portfolio
+            ctx: Optional IndicatorContext shared by all penguins this bar
 
         Returns:
             (BUY | SELL | HOLD, quantity)
         """
+
+    @property
+    def has_native_batch(self) -> bool:
+        """True if the subclass vectorizes decide_batch itself."""
+        return type(self).decide_batch is not BasePenguin.decide_batch
+
+    def decide_batch(
+        self,
+        symbols: Sequence[str],
+        prices_matrix: np.ndarray,
+        lengths: np.ndarray,
+        bids: np.ndarray,
+        asks: np.ndarray,
+        positions: np.ndarray,
+        portfolio: Portfolio,
+        ctx=None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Make trading decisions for all symbols in one call.
+
+        The default falls back to decide() per symbol; subclasses whose
+        signals only depend on prices override it with NumPy code.
+
+        Args:
+            symbols: Symbol for each row of prices_matrix
+            prices_matrix: (symbols x bars) mid prices, row i valid up to lengths[i]
+            lengths: Number of stored prices per row
+            bids: Current bid per row (NaN where there is no quote this bar)
+            asks: Current ask per row (NaN where there is no quote this bar)
+            positions: Held quantity per row
+            portfolio: Current portfolio
+            ctx: Optional IndicatorContext shared by all penguins this bar
+
+        Returns:
+            (decisions, quantities) arrays with BUY/SELL/HOLD codes
+        """
+        decisions = np.zeros(len(symbols), dtype=np.int8)
+        quantities = np.zeros(len(symbols), dtype=np.int64)
+        for i, symbol in enumerate(symbols):
+            if np.isnan(bids[i]) or lengths[i] == 0:
+                continue
+            decision, qty = self.decide(
+                symbol,
+                prices_matrix[i, : lengths[i]],
+                bids[i],
+                asks[i],
+                portfolio,
+                ctx=ctx,
+            )
+            decisions[i] = DECISION_CODES.get(decision, HOLD)
+            quantities[i] = qty
+        return decisions, quantities
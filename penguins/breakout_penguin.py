@@ -1,21 +1,45 @@
 # penguins/breakout_penguin.py
-from penguins.base_penguin import BasePenguin
+import numpy as np
+from penguins.base_penguin import BasePenguin, decisions_from_masks, tail_window
+from indicators.streaming import StreamingIndicators
 
 
 class BreakoutPenguin(BasePenguin):
     def __init__(self, lookback=20):
         super().__init__("BreakoutPenguin")
         self.lookback = lookback
+        self.indicators = StreamingIndicators()
 
-    def decide(self, symbol, mid_prices, bid, ask, portfolio):
+    def decide(self, symbol, mid_prices, bid, ask, portfolio, ctx=None):
         if len(mid_prices) < self.lookback:
             return "HOLD", 0
 
-        high = max(mid_prices[-self.lookback : -1])
-        low = min(mid_prices[-self.lookback : -1])
+        # Range of the lookback window before the current bar
+        ind = ctx if ctx is not None else self.indicators
+        high = ind.rolling_max(symbol, mid_prices, self.lookback - 1, lag=1)
+        low = ind.rolling_min(symbol, mid_prices, self.lookback - 1, lag=1)
 
         if mid_prices[-1] > high:
             return "BUY", 1
         if mid_prices[-1] < low:
             return "SELL", 1
         return "HOLD", 0
+
+    def decide_batch(
+        self,
+        symbols,
+        prices_matrix,
+        lengths,
+        bids,
+        asks,
+        positions,
+        portfolio,
+        ctx=None,
+    ):
+        """Vectorized decide: break of the prior lookback range for every symbol."""
+        window = tail_window(prices_matrix, lengths, self.lookback)
+        high = window[:, :-1].max(axis=1)
+        low = window[:, :-1].min(axis=1)
+        price = window[:, -1]
+        ok = ~np.isnan(bids) & (lengths >= self.lookback)
+        return decisions_from_masks(ok & (price > high), ok & (price < low))
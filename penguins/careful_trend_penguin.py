@@ -8,7 +8,7 @@ class CarefulTrendPenguin(BasePenguin):
         self.buy_consecutive = buy_consecutive
         self.sell_consecutive = sell_consecutive
 
-    def decide(self, symbol, mid_prices, bid, ask, portfolio):
+    def decide(self, symbol, mid_prices, bid, ask, portfolio, ctx=None):
         """
         Buy when stock has risen for buy_consecutive consecutive minutes.
         Sell when stock has fallen for sell_consecutive consecutive minutes.
@@ -1,15 +1,18 @@
 # penguins/copilot_penguin.py
 from penguins.base_penguin import BasePenguin
-from indicators.momentum import rsi, roc
+from indicators.streaming import StreamingIndicators
 
 
 class CopilotPenguin(BasePenguin):
+    STATE_FIELDS = ("entry_price",)
+
     def __init__(self):
         super().__init__("CopilotPenguin")
         self.position_size = 1  # Track position size
         self.entry_price = {}  # Track entry prices by symbol
+        self.indicators = StreamingIndicators()
 
-    def decide(self, symbol, mid_prices, bid, ask, portfolio):
+    def decide(self, symbol, mid_prices, bid, ask, portfolio, ctx=None):
         """
         Advanced hybrid strategy combining:
         - RSI for mean reversion (overbought/oversold)
@@ -20,20 +23,21 @@ class CopilotPenguin(BasePenguin):
         if len(mid_prices) < 20:
             return "HOLD", 0
 
-        # Calculate indicators
-        rsi_val = rsi(mid_prices, n=14)
-        roc_short = roc(mid_prices, n=3)  # Short-term momentum
-        roc_medium = roc(mid_prices, n=7)  # Medium-term momentum
+        # Calculate indicators (shared per bar when a context is given)
+        ind = ctx if ctx is not None else self.indicators
+        rsi_val = ind.rsi(symbol, mid_prices, n=14)
+        roc_short = ind.roc(symbol, mid_prices, n=3)  # Short-term momentum
+        roc_medium = ind.roc(symbol, mid_prices, n=7)  # Medium-term momentum
 
         # Trend detection: Is price above 20-SMA?
-        sma_20 = sum(mid_prices[-20:]) / 20
+        sma_20 = ind.sma(symbol, mid_prices, n=20)
         price = mid_prices[-1]
         is_uptrend = price > sma_20
         is_downtrend = price < sma_20
 
         # Volatility (simple measure based on price range)
-        recent_high = max(mid_prices[-10:])
-        recent_low = min(mid_prices[-10:])
+        recent_high = ind.rolling_max(symbol, mid_prices, 10)
+        recent_low = ind.rolling_min(symbol, mid_prices, 10)
         volatility = (recent_high - recent_low) / recent_low if recent_low > 0 else 0
 
         # Check if we have a position
@@ -1,5 +1,6 @@
 # penguins/mean_reversion_penguin.py
-from penguins.base_penguin import BasePenguin
+import numpy as np
+from penguins.base_penguin import BasePenguin, decisions_from_masks, tail_window
 from indicators.momentum import rsi
 
 
@@ -7,10 +8,31 @@ class MeanReversionPenguin(BasePenguin):
     def __init__(self):
         super().__init__("MeanReversionPenguin")
 
-    def decide(self, symbol, mid_prices, bid, ask, portfolio):
-        r = rsi(mid_prices)
+    def decide(self, symbol, mid_prices, bid, ask, portfolio, ctx=None):
+        r = ctx.rsi(symbol, mid_prices) if ctx is not None else rsi(mid_prices)
         if r < 30:
             return "BUY", 1
         if r > 70:
             return "SELL", 1
         return "HOLD", 0
+
+    def decide_batch(
+        self,
+        symbols,
+        prices_matrix,
+        lengths,
+        bids,
+        asks,
+        positions,
+        portfolio,
+        ctx=None,
+    ):
+        """Vectorized decide: 14-period RSI for every symbol at once."""
+        n = 14
+        deltas = np.diff(tail_window(prices_matrix, lengths, n + 1), axis=1)
+        gains = np.where(deltas > 0, deltas, 0.0).sum(axis=1)
+        losses = np.where(deltas < 0, -deltas, 0.0).sum(axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            r = np.where(losses == 0, 100.0, 100 - 100 / (1 + gains / losses))
+        ok = ~np.isnan(bids) & (lengths >= n + 1)
+        return decisions_from_masks(ok & (r < 30), ok & (r > 70))
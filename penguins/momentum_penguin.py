@@ -1,5 +1,6 @@
 # penguins/momentum_penguin.py
-from penguins.base_penguin import BasePenguin
+import numpy as np
+from penguins.base_penguin import BasePenguin, decisions_from_masks, tail_window
 from indicators.momentum import roc
 
 
@@ -7,10 +8,28 @@ class MomentumPenguin(BasePenguin):
     def __init__(self):
         super().__init__("MomentumPenguin")
 
-    def decide(self, symbol, mid_prices, bid, ask, portfolio):
-        r = roc(mid_prices, 5)
+    def decide(self, symbol, mid_prices, bid, ask, portfolio, ctx=None):
+        r = ctx.roc(symbol, mid_prices, 5) if ctx is not None else roc(mid_prices, 5)
         if r > 0.01:
             return "BUY", 1
         if r < -0.01:
             return "SELL", 1
         return "HOLD", 0
+
+    def decide_batch(
+        self,
+        symbols,
+        prices_matrix,
+        lengths,
+        bids,
+        asks,
+        positions,
+        portfolio,
+        ctx=None,
+    ):
+        """Vectorized decide: 5-bar rate of change for every symbol at once."""
+        window = tail_window(prices_matrix, lengths, 6)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            r = (window[:, -1] - window[:, 0]) / window[:, 0]
+        quoted = ~np.isnan(bids)
+        return decisions_from_masks(quoted & (r > 0.01), quoted & (r < -0.01))
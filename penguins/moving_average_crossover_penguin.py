@@ -3,6 +3,8 @@ from indicators.statsistics import sma, ema
 
 
 class MovingAverageCrossoverPenguin(BasePenguin):
+    STATE_FIELDS = ("prev_signal",)
+
     def __init__(self, fast_period=5, slow_period=20, use_ema=False):
         super().__init__("Moving Average Crossover")
         self.fast_period = fast_period
@@ -11,7 +13,7 @@ class MovingAverageCrossoverPenguin(BasePenguin):
         self.ma_func = ema if use_ema else sma
         self.prev_signal = None  # To avoid overtrading
 
-    def decide(self, symbol, mid_prices, bid, ask, portfolio):
+    def decide(self, symbol, mid_prices, bid, ask, portfolio, ctx=None):
         if len(mid_prices) < self.slow_period + 1:
             return "HOLD", 0
 
@@ -9,11 +9,14 @@ class RSIMeanReversionPenguin(BasePenguin):
         self.oversold = oversold
         self.overbought = overbought
 
-    def decide(self, symbol, mid_prices, bid, ask, portfolio):
+    def decide(self, symbol, mid_prices, bid, ask, portfolio, ctx=None):
         if len(mid_prices) < self.rsi_period + 1:
             return "HOLD", 0
 
-        rsi_val = rsi(mid_prices, self.rsi_period)
+        if ctx is not None:
+            rsi_val = ctx.rsi(symbol, mid_prices, self.rsi_period)
+        else:
+            rsi_val = rsi(mid_prices, self.rsi_period)
         qty = portfolio.get_position(symbol)
         cash = portfolio.cash
 
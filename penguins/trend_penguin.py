@@ -1,5 +1,6 @@
 # penguins/trend_penguin.py
-from penguins.base_penguin import BasePenguin
+import numpy as np
+from penguins.base_penguin import BasePenguin, decisions_from_masks, tail_window
 
 
 class TrendPenguin(BasePenguin):
@@ -7,7 +8,7 @@ class TrendPenguin(BasePenguin):
         super().__init__("TrendPenguin")
         self.lookback = lookback
 
-    def decide(self, symbol, mid_prices, bid, ask, portfolio):
+    def decide(self, symbol, mid_prices, bid, ask, portfolio, ctx=None):
         """
         Buy when stock rises from previous minute, sell when it falls, else hold.
         """
@@ -20,3 +21,20 @@ class TrendPenguin(BasePenguin):
             return "SELL", 1
         else:
             return "HOLD", 0
+
+    def decide_batch(
+        self,
+        symbols,
+        prices_matrix,
+        lengths,
+        bids,
+        asks,
+        positions,
+        portfolio,
+        ctx=None,
+    ):
+        """Vectorized decide: compare each symbol's last two prices."""
+        window = tail_window(prices_matrix, lengths, 2)
+        quoted = ~np.isnan(bids)
+        change = window[:, 1] - window[:, 0]
+        return decisions_from_masks(quoted & (change > 0), quoted & (change < 0))
@@ -8,7 +8,7 @@ class VolatilityBreakoutPenguin(BasePenguin):
         self.period = period
         self.std_mult = std_mult
 
-    def decide(self, symbol, mid_prices, bid, ask, portfolio):
+    def decide(self, symbol, mid_prices, bid, ask, portfolio, ctx=None):
         if len(mid_prices) < self.period:
             return "HOLD", 0
 
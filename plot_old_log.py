@@ -1,138 +1,67 @@
 #!/usr/bin/env python3
 """
-plot_old_log.py - Replot capital curves from saved data or plot summary from log.
-Usage: python plot_old_log.py <data_XXXXXX.json or trades_XXXXXX.txt>
+plot_old_log.py - Replot capital curves and reports from recorded runs.
+
+Usage:
+    python plot_old_log.py run_current/journal.jsonl    # Exact per-minute curves
+    python plot_old_log.py data_XXXXXX.json            # Recorded curves
+    python plot_old_log.py trades_XXXXXX.txt           # Value after each trade
+    python plot_old_log.py run_old/260205/run_0900     # PNG + PDF for one run
+    python plot_old_log.py --all --workers 8           # PNG + PDF for every run
 """
 
-import sys
+import argparse
 import json
 import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
 import matplotlib
-import re
 
 matplotlib.use("Agg")
 import matplotlib.pyplot as plt
-from config import INITIAL_CAPITAL
 
+from config import ARCHIVE_DIR, ENABLE_TRANSACTION_COSTS, TRANSACTION_COST
+from backtest.log_replay import TradesLogReplay, load_run
+from data.archive import iter_run_dirs
+from data.journal import JournalReplay
+from reporting import create_final_report_pdf, plot_capital_curves
 
-def plot_capital_curves(curves, filename):
-    """Plot and save capital curves."""
-    plt.figure(figsize=(12, 6))
-    for name, vals in curves.items():
-        plt.plot(range(1, len(vals) + 1), vals, marker=None, label=name, linewidth=1)
-
-    # Calculate and plot overall average capital
-    if curves:
-        curve_values = list(curves.values())
-        num_penguins = len(curve_values)
-        overall_avg = [
-            sum(vals[i] for vals in curve_values) / num_penguins
-            for i in range(len(curve_values[0]))
-        ]
-        plt.plot(
-            range(1, len(overall_avg) + 1),
-            overall_avg,
-            marker="",
-            label="Overall Average Capital",
-            linewidth=3,
-            color="black",
-            linestyle="--",
-        )
+REPLOT_PNG = "replot_capital.png"
+REPLOT_PDF = "replot_report.pdf"
 
-    plt.axhline(
-        y=INITIAL_CAPITAL,
-        color="gray",
-        linestyle="--",
-        alpha=0.5,
-        label="Initial Capital",
-    )
-    plt.xlabel("Minute")
-    plt.ylabel("Total Capital ($)")
-    plt.title(f"Penguin Capital Over {len(list(curves.values())[0])} Minutes")
-    plt.legend()
-    plt.grid(True, alpha=0.3)
-    plt.tight_layout()
-    plt.savefig(filename, dpi=100)
-    plt.close()  # Close to free memory
-    print(f"📈 Saved replot to {filename}")
-
-
-def plot_from_log(log_file, output_file):
-    """Plot capital progression from log file trades."""
-    with open(log_file, "r") as f:
-        content = f.read()
-
-    # Extract penguin sections
-    sections = re.split(r"\n(?=[A-Z][a-z]+Penguin)", content)[
-        1:
-    ]  # Split on penguin names
-
-    curves = {}
-
-    for section in sections:
-        lines = section.strip().split("\n")
-        name = lines[0]
-        portfolio = {"cash": INITIAL_CAPITAL, "positions": {}}
-        values = [INITIAL_CAPITAL]
-
-        # Find trades
-        trades_start = False
-        for line in lines:
-            if "Trades:" in line:
-                trades_start = True
-                continue
-            if trades_start and line.strip().startswith(("BUY", "SELL")):
-                # Parse trade: "1. BUY 1 MSFT @ $457.42"
-                match = re.search(
-                    r"\s*\d+\.\s*(BUY|SELL)\s+(\d+)\s+(\w+)\s+@\s+\$([0-9.]+)", line
-                )
-                if match:
-                    action, qty_str, symbol, price_str = match.groups()
-                    qty = int(qty_str)
-                    price = float(price_str)
-
-                    if action == "BUY":
-                        cost = price * qty + 1.0  # assuming fee
-                        if portfolio["cash"] >= cost:
-                            portfolio["cash"] -= cost
-                            portfolio["positions"][symbol] = (
-                                portfolio["positions"].get(symbol, 0) + qty
-                            )
-                    elif action == "SELL":
-                        if portfolio["positions"].get(symbol, 0) >= qty:
-                            portfolio["cash"] += price * qty - 1.0
-                            portfolio["positions"][symbol] -= qty
-                            if portfolio["positions"][symbol] == 0:
-                                del portfolio["positions"][symbol]
-
-                    # Calculate current value (assuming current prices are the trade prices, simplistic)
-                    value = portfolio["cash"]
-                    for sym, q in portfolio["positions"].items():
-                        value += (
-                            q * price
-                        )  # Use last price, not accurate but approximate
-                    values.append(value)
-
-        if len(values) > 1:
-            curves[name] = values
 
+def _plots_path(input_file, old, new, ext):
+    """Old layout: <run dir>/../plots/<name with old prefix replaced>."""
+    name = os.path.basename(input_file).replace(old, new)
+    name = os.path.splitext(name)[0] + ext
+    plots_dir = os.path.join(os.path.dirname(input_file), "..", "plots")
+    os.makedirs(plots_dir, exist_ok=True)
+    return os.path.join(plots_dir, name)
+
+
+def plot_from_log(log_file, output_file, fee_per_trade, enable_fees):
+    """Plot portfolio value after each trade in a trades.txt."""
+    replay = TradesLogReplay(log_file, fee_per_trade, enable_fees).run()
+    curves = {name: vals for name, vals in replay.curves.items() if len(vals) > 1}
     if not curves:
         print("No trades found in log.")
         return
 
-    # Plot
+    initial = replay.header.get("initial_capital") or 5000.0
     plt.figure(figsize=(12, 6))
     for name, vals in curves.items():
         plt.plot(range(len(vals)), vals, marker=None, label=name, linewidth=1)
 
     plt.axhline(
-        y=INITIAL_CAPITAL,
+        y=initial,
         color="red",
         linestyle="--",
-        label=f"Initial Capital (${INITIAL_CAPITAL})",
+        label=f"Initial Capital (${initial})",
     )
     plt.xlabel("Trade Number")
-    plt.ylabel("Portfolio Value ($)")
+    plt.ylabel("Portfolio Value ($, marked at last traded prices)")
     plt.title(f"Portfolio Value Progression from {os.path.basename(log_file)}")
     plt.legend()
     plt.grid(True, alpha=0.3)
@@ -142,44 +71,93 @@ def plot_from_log(log_file, output_file):
     print(f"📊 Saved progression plot to {output_file}")
 
 
+def regenerate_run(run_dir, fee_per_trade=TRANSACTION_COST, enable_fees=True):
+    """Write REPLOT_PNG and REPLOT_PDF into an archived run directory."""
+    run = load_run(run_dir, fee_per_trade, enable_fees)
+    if run is None or not run["curves"]:
+        return run_dir, False
+    if not run["portfolios_exact"]:
+        print(
+            f"  ℹ️  {run_dir}: no journal, report tables use fee ${fee_per_trade:.2f} "
+            f"and last traded prices"
+        )
+    plot_capital_curves(run["curves"], os.path.join(run_dir, REPLOT_PNG))
+    create_final_report_pdf(
+        run["curves"],
+        run["portfolios"],
+        os.path.join(run_dir, REPLOT_PDF),
+        run["latest_prices"],
+    )
+    return run_dir, True
+
+
+def regenerate_all(root, workers=None, fee_per_trade=TRANSACTION_COST):
+    run_dirs = [path for _, path in iter_run_dirs(root)]
+    print(f"🔁 Regenerating {len(run_dirs)} runs under {root}")
+    start = time.time()
+    done = 0
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(regenerate_run, d, fee_per_trade, ENABLE_TRANSACTION_COSTS)
+            for d in run_dirs
+        ]
+        for future in futures:
+            run_dir, ok = future.result()
+            done += ok
+            if not ok:
+                print(f"  ⏭️  Nothing to replay in {run_dir}")
+    print(f"✓ Regenerated {done} runs in {time.time() - start:.1f}s")
+
+
 def main():
-    if len(sys.argv) != 2:
-        print("Usage: python plot_old_log.py <data_XXXXXX.json or trades_XXXXXX.txt>")
-        sys.exit(1)
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("inputs", nargs="*", help="journal/data/trades file or run dir")
+    parser.add_argument("--all", action="store_true", help="Every run under --root")
+    parser.add_argument("--root", default=ARCHIVE_DIR)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument(
+        "--fee",
+        type=float,
+        default=TRANSACTION_COST,
+        help="Fee per trade for logs without a journal",
+    )
+    args = parser.parse_args()
 
-    input_file = sys.argv[1]
+    if args.all:
+        regenerate_all(args.root, args.workers, args.fee)
+        return
+    if not args.inputs:
+        parser.print_usage()
+        sys.exit(1)
 
-    if input_file.endswith(".json"):
-        # Original functionality for JSON
-        try:
-            with open(input_file, "r") as f:
-                curves = json.load(f)
-        except FileNotFoundError:
+    for input_file in args.inputs:
+        if not os.path.exists(input_file):
             print(f"Error: File {input_file} not found.")
             sys.exit(1)
-        except json.JSONDecodeError:
-            print(f"Error: Invalid JSON in {input_file}.")
-            sys.exit(1)
-
-        output_file = input_file.replace("data_", "replot_capital_").replace(
-            ".json", ".png"
-        )
-        output_file = os.path.join(
-            os.path.dirname(input_file), "..", "plots", os.path.basename(output_file)
-        )
-        plot_capital_curves(curves, output_file)
 
-    elif input_file.endswith(".txt"):
-        # New functionality for TXT logs
-        output_file = input_file.replace("trades_", "summary_").replace(".txt", ".png")
-        output_file = os.path.join(
-            os.path.dirname(input_file), "..", "plots", os.path.basename(output_file)
-        )
-        plot_from_log(input_file, output_file)
-
-    else:
-        print("Error: File must be .json or .txt")
-        sys.exit(1)
+        if os.path.isdir(input_file):
+            run_dir, ok = regenerate_run(input_file, args.fee, ENABLE_TRANSACTION_COSTS)
+            if not ok:
+                print(f"Error: Nothing to replay in {run_dir}")
+        elif input_file.endswith(".jsonl"):
+            replay = JournalReplay(input_file).run()
+            output_file = os.path.join(os.path.dirname(input_file), REPLOT_PNG)
+            plot_capital_curves(replay.curves, output_file)
+        elif input_file.endswith(".json"):
+            try:
+                with open(input_file, "r") as f:
+                    curves = json.load(f)
+            except json.JSONDecodeError:
+                print(f"Error: Invalid JSON in {input_file}.")
+                sys.exit(1)
+            output_file = _plots_path(input_file, "data_", "replot_capital_", ".png")
+            plot_capital_curves(curves, output_file)
+        elif input_file.endswith(".txt"):
+            output_file = _plots_path(input_file, "trades_", "summary_", ".png")
+            plot_from_log(input_file, output_file, args.fee, ENABLE_TRANSACTION_COSTS)
+        else:
+            print("Error: File must be .jsonl, .json, .txt or a run directory")
+            sys.exit(1)
 
 
 if __name__ == "__main__":
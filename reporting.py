@@ -0,0 +1,523 @@
+"""
+Capital-curve PNGs and the final PDF report.
+
+Rendering runs in a ReportWorker so the trading loop only pushes data:
+jobs are pickled at submit time (a snapshot of the curves and portfolios
+as they were) and rendered by a separate process in order. Queued
+renders of the same file are coalesced, so a slow render never builds up
+a backlog.
+"""
+
+import multiprocessing
+import pickle
+import queue
+import signal
+
+import matplotlib
+
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+from matplotlib.backends.backend_pdf import PdfPages
+from matplotlib.figure import Figure
+import numpy as np
+
+from config import INITIAL_CAPITAL
+
+MAX_PLOT_POINTS = 2000  # Vertices per line before min/max decimation kicks in
+
+
+def decimate(values, max_points=MAX_PLOT_POINTS):
+    """
+    (x, y) to draw a series with at most ~max_points vertices.
+
+    Long series are split into max_points // 2 buckets and each bucket
+    contributes its min and max, so spikes survive the reduction.
+    """
+    values = np.asarray(values, dtype=float)
+    n = len(values)
+    if n <= max_points:
+        return np.arange(1, n + 1), values
+    starts = np.linspace(0, n, max_points // 2, endpoint=False).astype(np.int64)
+    y = np.empty(2 * len(starts))
+    y[0::2] = np.minimum.reduceat(values, starts)
+    y[1::2] = np.maximum.reduceat(values, starts)
+    return np.repeat(starts + 1, 2), y
+
+
+class CapitalCurvePlot:
+    """
+    Capital-curve figure that grows with the run instead of being rebuilt.
+
+    extend()/update() only append new points and add them to a running
+    per-minute sum for the overall average. render() reuses one figure and
+    its lines, drawing decimated data, so its cost does not grow with the
+    length of the run.
+    """
+
+    def __init__(self, initial_capital=INITIAL_CAPITAL, max_points=MAX_PLOT_POINTS):
+        self.initial_capital = initial_capital
+        self.max_points = max_points
+        self._values = {}  # {name: float buffer}
+        self._lengths = {}
+        self._sum = np.zeros(0)  # Per-minute sum over penguins
+        self._count = np.zeros(0, dtype=np.int64)  # Penguins with a value that minute
+        self._fig = None
+        self._lines = {}
+        self._avg_line = None
+
+    # ---------- Data ----------
+    def __len__(self):
+        return max(self._lengths.values(), default=0)
+
+    @staticmethod
+    def _fit(buf, n, fill=0.0):
+        if n <= len(buf):
+            return buf
+        grown = np.full(max(n, 2 * len(buf), 64), fill, dtype=buf.dtype)
+        grown[: len(buf)] = buf
+        return grown
+
+    def extend(self, name, values):
+        """Append new points to one penguin's curve."""
+        values = np.asarray(values, dtype=float)
+        start = self._lengths.get(name, 0)
+        end = start + len(values)
+        buf = self._fit(self._values.get(name, np.zeros(0)), end)
+        buf[start:end] = values
+        self._values[name] = buf
+        self._lengths[name] = end
+
+        self._sum = self._fit(self._sum, end)
+        self._count = self._fit(self._count, end)
+        self._sum[start:end] += values
+        self._count[start:end] += 1
+
+    def update(self, curves):
+        """Append whatever part of {name: [values]} has not been seen yet."""
+        for name, vals in curves.items():
+            seen = self._lengths.get(name, 0)
+            if len(vals) > seen:
+                self.extend(name, vals[seen:])
+
+    def series(self, name):
+        return self._values[name][: self._lengths[name]]
+
+    def average(self):
+        """Overall average capital per minute over penguins with a value."""
+        n = len(self)
+        return self._sum[:n] / np.maximum(self._count[:n], 1)
+
+    # ---------- Drawing ----------
+    def render(self, filename, linewidth=3, avg_linewidth=3, minutes=None, final=False):
+        """Save the current curves to filename."""
+        if self._fig is None:
+            self._fig = Figure(figsize=(12, 6))
+            ax = self._fig.add_subplot(111)
+            ax.set_xlabel("Minute")
+            ax.set_ylabel("Total Capital ($)")
+            ax.grid(True, alpha=0.3)
+        ax = self._fig.axes[0]
+
+        new_lines = False
+        for name in self._values:
+            line = self._lines.get(name)
+            if line is None:
+                (line,) = ax.plot([], [], label=name)
+                self._lines[name] = line
+                new_lines = True
+            line.set_data(*decimate(self.series(name), self.max_points))
+            line.set_linewidth(linewidth)
+
+        if self._avg_line is None and self._values:
+            (self._avg_line,) = ax.plot(
+                [],
+                [],
+                marker=None,
+                label="Overall Average Capital",
+                color="black",
+                linestyle="--",
+            )
+            ax.axhline(
+                y=self.initial_capital,
+                color="gray",
+                linestyle="--",
+                alpha=0.5,
+                label="Initial Capital",
+            )
+        if self._avg_line is not None:
+            self._avg_line.set_data(*decimate(self.average(), self.max_points))
+            self._avg_line.set_linewidth(avg_linewidth)
+
+        if new_lines:
+            ax.legend()
+        ax.relim()
+        ax.autoscale_view()
+        ax.set_title(
+            f"Penguin Capital Over {len(self) if minutes is None else minutes} Minutes"
+        )
+        self._fig.tight_layout()
+        self._fig.savefig(filename, dpi=100)
+        if final:
+            print(f"\n📈 Saved capital curves to {filename}")
+        else:
+            print(f"📈 Updated capital curves to {filename}")
+
+
+def plot_capital_curves(curves, filename, **kwargs):
+    """Plot and save capital curves (one-off; see CapitalCurvePlot)."""
+    plot = CapitalCurvePlot()
+    plot.update(curves)
+    plot.render(filename, **kwargs)
+
+
+def _timing_table(ax, title, header, rows, col_widths):
+    ax.axis("off")
+    ax.set_title(title, fontsize=11, weight="bold", loc="left")
+    if not rows:
+        ax.text(0.5, 0.5, "No data", ha="center", va="center", fontsize=9)
+        return
+    table = ax.table(
+        cellText=[header] + rows,
+        cellLoc="center",
+        loc="upper center",
+        colWidths=col_widths,
+    )
+    table.auto_set_font_size(False)
+    table.set_fontsize(8)
+    table.scale(1, 1.3)
+    for i in range(len(header)):
+        table[(0, i)].set_facecolor("#4472C4")
+        table[(0, i)].set_text_props(weight="bold", color="white")
+
+
+def _add_metrics_page(pdf, metrics, top=15):
+    """Loop timing from LoopTimer.snapshot(): phases, API, slowest deciders."""
+    hist_header = ["Name", "Count", "Mean ms", "p50 ms", "p95 ms", "Max ms", "Total s"]
+    hist_widths = [0.28, 0.1, 0.12, 0.12, 0.12, 0.12, 0.12]
+
+    def hist_rows(table):
+        return [
+            [
+                name,
+                str(h["count"]),
+                f"{h['mean_ms']:.1f}",
+                f"{h['p50_ms']:.0f}",
+                f"{h['p95_ms']:.0f}",
+                f"{h['max_ms']:.1f}",
+                f"{h['total_ms'] / 1000:.2f}",
+            ]
+            for name, h in table.items()
+        ]
+
+    def total_rows(table):
+        return [
+            [r["name"], str(r["calls"]), f"{r['mean_us']:.1f}", f"{r['total_ms']:.1f}"]
+            for r in table[:top]
+        ]
+
+    fig, axes = plt.subplots(4, 1, figsize=(12, 16))
+    bars = metrics["bars"]
+    fig.suptitle("Loop Timing", fontsize=14, weight="bold", y=0.99)
+    fig.text(
+        0.5,
+        0.965,
+        f"Bars: {bars['count']}    Mean: {bars['mean_ms'] / 1000:.2f}s    "
+        f"p95: {bars['p95_ms'] / 1000:.2f}s    Max: {bars['max_ms'] / 1000:.2f}s    "
+        f"Over {metrics['budget_seconds']:.0f}s budget: {metrics['overruns']}",
+        ha="center",
+        fontsize=11,
+    )
+    _timing_table(
+        axes[0], "Phases", hist_header, hist_rows(metrics["phases"]), hist_widths
+    )
+    _timing_table(
+        axes[1], "API Endpoints", hist_header, hist_rows(metrics["api"]), hist_widths
+    )
+    totals_header = ["Name", "Calls", "Mean us", "Total ms"]
+    totals_widths = [0.4, 0.15, 0.15, 0.15]
+    _timing_table(
+        axes[2],
+        f"Slowest Penguins (top {top})",
+        totals_header,
+        total_rows(metrics["penguins"]),
+        totals_widths,
+    )
+    _timing_table(
+        axes[3],
+        f"Slowest Symbols (top {top})",
+        totals_header,
+        total_rows(metrics["symbols"]),
+        totals_widths,
+    )
+    plt.tight_layout(rect=(0, 0, 1, 0.95))
+    pdf.savefig(fig, bbox_inches="tight")
+    plt.close()
+
+
+def create_final_report_pdf(
+    curves, portfolios, filename, latest_prices=None, metrics=None
+):
+    """
+    Create PDF with capital curves and per-symbol trade summary.
+
+    With metrics (a LoopTimer snapshot), a loop timing page is added last.
+    """
+    with PdfPages(filename) as pdf:
+        # Page 1: Capital Curves
+        fig, ax = plt.subplots(figsize=(12, 8))
+
+        for name, vals in curves.items():
+            ax.plot(*decimate(vals), label=name, linewidth=2)
+
+        # Calculate and plot overall average capital
+        if curves:
+            plot = CapitalCurvePlot()
+            plot.update(curves)
+            ax.plot(
+                *decimate(plot.average()),
+                marker=None,
+                label="Overall Average Capital",
+                linewidth=2.5,
+                color="black",
+                linestyle="--",
+            )
+
+        ax.axhline(
+            y=INITIAL_CAPITAL,
+            color="gray",
+            linestyle="--",
+            alpha=0.5,
+            label="Initial Capital",
+        )
+        ax.set_xlabel("Minute")
+        ax.set_ylabel("Total Capital ($)")
+        ax.set_title(f"Penguin Capital Curves")
+        ax.legend(fontsize=9)
+        ax.grid(True, alpha=0.3)
+
+        plt.tight_layout()
+        pdf.savefig(fig, bbox_inches="tight")
+        plt.close()
+
+        # Page 2+: Trade Summary Table for each Penguin
+        for penguin_name, portfolio in sorted(portfolios.items()):
+            fig = plt.figure(figsize=(12, 10))
+            ax = fig.add_subplot(111)
+            ax.axis("tight")
+            ax.axis("off")
+
+            summary = portfolio.get_symbol_summary(latest_prices or {})
+
+            cash = portfolio.cash
+            market_value = 0.0
+            if latest_prices:
+                for symbol, pos in portfolio.positions.items():
+                    if symbol in latest_prices:
+                        market_value += pos.qty * latest_prices[symbol]
+            total_value = cash + market_value
+
+            # Build table data
+            table_data = [
+                [
+                    "Symbol",
+                    "Buy Cnt",
+                    "Sell Cnt",
+                    "Pos Qty",
+                    "Market Value",
+                    "Total Cost",
+                    "Total Revenue",
+                    "Total PnL",
+                    "PnL %",
+                ]
+            ]
+
+            total_pnl = 0
+            for symbol in sorted(summary.keys()):
+                s = summary[symbol]
+                pnl = s["total_pnl"]
+                pnl_pct = s["pnl_pct"]
+                total_pnl += pnl
+
+                table_data.append(
+                    [
+                        symbol,
+                        str(s["buy_count"]),
+                        str(s["sell_count"]),
+                        str(s["position_qty"]),
+                        f"${s['market_value']:,.2f}",
+                        f"${s['total_cost']:,.2f}",
+                        f"${s['total_revenue']:,.2f}",
+                        f"${pnl:,.2f}",
+                        f"{pnl_pct:+.2f}%",
+                    ]
+                )
+
+            # Add total row
+            table_data.append(
+                [
+                    "TOTAL",
+                    "",
+                    "",
+                    "",
+                    f"${market_value:,.2f}",
+                    "",
+                    "",
+                    f"${total_pnl:,.2f}",
+                    "",
+                ]
+            )
+
+            table = ax.table(
+                cellText=table_data,
+                cellLoc="center",
+                loc="center",
+                colWidths=[0.09, 0.08, 0.08, 0.08, 0.13, 0.13, 0.13, 0.12, 0.09],
+            )
+            table.auto_set_font_size(False)
+            table.set_fontsize(9)
+            table.scale(1, 2)
+
+            # Style header row
+            for i in range(len(table_data[0])):
+                table[(0, i)].set_facecolor("#4472C4")
+                table[(0, i)].set_text_props(weight="bold", color="white")
+
+            # Style total row
+            for i in range(len(table_data[0])):
+                table[(len(table_data) - 1, i)].set_facecolor("#E7E6E6")
+                table[(len(table_data) - 1, i)].set_text_props(weight="bold")
+
+            title = f"Trade Summary: {penguin_name}"
+            fig.suptitle(title, fontsize=14, weight="bold", y=0.98)
+
+            # Portfolio totals at the top
+            summary_text = (
+                f"Cash: ${cash:,.2f}    "
+                f"Market Value: ${market_value:,.2f}    "
+                f"Total Value: ${total_value:,.2f}"
+            )
+            fig.text(0.5, 0.93, summary_text, ha="center", fontsize=11)
+
+            plt.tight_layout()
+            pdf.savefig(fig, bbox_inches="tight")
+            plt.close()
+
+        if metrics:
+            _add_metrics_page(pdf, metrics)
+
+    print(f"📄 Final report saved to {filename}")
+
+
+# ---------- Background rendering ----------
+class _Renderer:
+    """Job handlers plus the persistent plots they draw into, one per file."""
+
+    def __init__(self):
+        self.plots = {}
+
+    def extend(self, filename, tails):
+        plot = self.plots.setdefault(filename, CapitalCurvePlot())
+        for name, vals in tails.items():
+            plot.extend(name, vals)
+
+    def render(self, filename, **kwargs):
+        self.plots[filename].render(filename, **kwargs)
+
+    def report(self, curves, portfolios, filename, latest_prices=None, metrics=None):
+        create_final_report_pdf(curves, portfolios, filename, latest_prices, metrics)
+
+    def run(self, kind, args, kwargs):
+        try:
+            getattr(self, kind)(*args, **kwargs)
+        except Exception as e:
+            print(f"    ❌ Report worker failed on {kind}: {type(e).__name__}: {e}")
+
+
+def _serve(jobs):
+    # Ctrl+C is for the trading loop, which still needs us to render its report
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    renderer = _Renderer()
+    done = False
+    while not done:
+        batch = [jobs.get()]
+        # Drain whatever else is queued so stale renders can be skipped
+        while True:
+            try:
+                batch.append(jobs.get_nowait())
+            except queue.Empty:
+                break
+
+        pending = []
+        for payload in batch:
+            if payload is None:
+                done = True
+                break
+            pending.append(pickle.loads(payload))
+
+        last_render = {}
+        for i, (kind, args, _) in enumerate(pending):
+            if kind == "render":
+                last_render[args[0]] = i  # Keyed by filename
+        for i, (kind, args, kwargs) in enumerate(pending):
+            if kind == "render" and last_render[args[0]] != i:
+                continue
+            renderer.run(kind, args, kwargs)
+
+
+class ReportWorker:
+    """
+    Renders plots and reports off the trading loop.
+
+    Capital curves are sent as deltas: only points added since the last
+    plot of the same file cross the queue, and the worker keeps one
+    CapitalCurvePlot per file.
+
+    With background=False every job runs inline on submit, which is what
+    short offline runs want; the API is the same either way.
+    """
+
+    def __init__(self, background=True):
+        self.background = background
+        self._jobs = None
+        self._process = None
+        self._renderer = _Renderer()  # Used when running inline
+        self._sent = {}  # {filename: {name: points sent}}
+
+    def start(self):
+        if self.background and self._process is None:
+            ctx = multiprocessing.get_context("spawn")  # Don't fork a threaded loop
+            self._jobs = ctx.Queue()
+            self._process = ctx.Process(
+                target=_serve, args=(self._jobs,), name="report-worker", daemon=True
+            )
+            self._process.start()
+        return self
+
+    def _submit(self, kind, *args, **kwargs):
+        if self._process is None:
+            self._renderer.run(kind, args, kwargs)
+            return
+        # Pickle now: the worker must see the data as it is at submit time
+        self._jobs.put(pickle.dumps((kind, args, kwargs)))
+
+    def plot_capital_curves(self, curves, filename, **kwargs):
+        sent = self._sent.setdefault(filename, {})
+        tails = {}
+        for name, vals in curves.items():
+            tails[name] = list(vals[sent.get(name, 0) :])
+            sent[name] = len(vals)
+        self._submit("extend", filename, tails)
+        self._submit("render", filename, **kwargs)
+
+    def create_final_report_pdf(
+        self, curves, portfolios, filename, latest_prices=None, metrics=None
+    ):
+        self._submit("report", curves, portfolios, filename, latest_prices, metrics)
+
+    def close(self, timeout=None):
+        """Finish every queued job, then stop the worker."""
+        if self._process is None:
+            return
+        self._jobs.put(None)
+        self._process.join(timeout)
+        self._process = None
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Replay stored minute bars through the live penguin roster without sleeping.
+
+Writes the same capital curves, trades log, PDF report and scoreboard
+entries as a live run of run_simulation.py.
+
+Usage:
+    python run_backtest.py                    # Last RUN_MINUTES of Alpaca minute bars
+    python run_backtest.py --minutes 120      # Shorter window
+    python run_backtest.py --offline          # Cached bars only, no network
+    python run_backtest.py --bars bars.json   # {symbol: [prices]} from disk
+    python run_backtest.py --synthetic --seed 7 --minutes 5000   # Seeded synthetic bars
+    python run_backtest.py --no-scoreboard --no-archive
+"""
+
+import argparse
+import json
+import time
+from datetime import datetime
+
+import pytz
+
+from config import (
+    SYMBOLS,
+    RUN_MINUTES,
+    BAR_TIMEFRAME_MINUTES,
+    FAST_MODE,
+    BACKTEST_SPREAD_PCT,
+    SYNTHETIC_SEED,
+)
+from backtest.replay import replay_bars
+from data.alpaca_history import load_minute_bars
+from data.bar_cache import to_epoch
+from data.synthetic import SyntheticMarket
+from data.scoreboard import load_scoreboard, register_penguin
+from run_simulation import make_penguins, make_simulator, finish_run
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--minutes", type=int, default=RUN_MINUTES)
+    parser.add_argument("--bars", help="JSON file of {symbol: [prices]}")
+    parser.add_argument("--end", help="End of the bar window (ISO time, default: now)")
+    parser.add_argument(
+        "--offline", action="store_true", help="Use cached bars only, never fetch"
+    )
+    parser.add_argument(
+        "--synthetic", action="store_true", help="Generate seeded synthetic bars"
+    )
+    parser.add_argument("--seed", type=int, default=SYNTHETIC_SEED)
+    parser.add_argument("--no-scoreboard", action="store_true")
+    parser.add_argument("--no-archive", action="store_true")
+    args = parser.parse_args()
+
+    bars = None
+    end = datetime.fromisoformat(args.end).astimezone(pytz.UTC) if args.end else None
+    if args.bars:
+        with open(args.bars, "r") as f:
+            price_history = json.load(f)
+    elif args.synthetic:
+        end_t = to_epoch(end or datetime.now(pytz.UTC))
+        bars = SyntheticMarket(seed=args.seed).bars(
+            SYMBOLS, args.minutes, start_t=end_t - args.minutes * 60
+        )
+        price_history = {s: b["close"].tolist() for s, b in bars.items()}
+    else:
+        bars = load_minute_bars(
+            SYMBOLS,
+            minutes=args.minutes,
+            end=end,
+            offline=args.offline or None,
+        )
+        price_history = {s: b["close"].tolist() for s, b in bars.items()}
+
+    penguins = make_penguins()
+    scoreboard = None
+    if not args.no_scoreboard:
+        scoreboard = load_scoreboard()
+        for penguin in penguins:
+            scoreboard = register_penguin(scoreboard, penguin.name)
+
+    sim = make_simulator(penguins, verbose=False)
+
+    length = max((len(p) for p in price_history.values()), default=0)
+    print(f"🐧 Replaying {length} minutes of bars for {len(price_history)} symbols")
+    start = time.time()
+    replay_bars(
+        sim,
+        price_history,
+        spread_pct=BACKTEST_SPREAD_PCT,
+        fast=FAST_MODE,
+        bar_seconds=BAR_TIMEFRAME_MINUTES * 60,
+        bars=bars,
+    )
+    print(f"⏱️  Replayed {sim.minute} bars in {time.time() - start:.2f}s")
+
+    finish_run(
+        sim,
+        scoreboard,
+        sim.minute,
+        sim.minute,
+        archive=not args.no_archive,
+    )
+
+
+if __name__ == "__main__":
+    main()
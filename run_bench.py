@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Benchmark indicators, penguin decisions, portfolio ops and the bar step.
+
+Runs on seeded synthetic bars (no network) at 10/100/1000 symbols and
+5/20/100 penguins and writes bench_results/<commit>.json.
+
+Usage:
+    python run_bench.py                              # Full suite
+    python run_bench.py --symbols 10 100 --penguins 5 --repeat 3
+    python run_bench.py --only step --only decide    # Some groups only
+    python run_bench.py --compare bench_results/abc1234.json   # Exit 1 on regressions
+"""
+
+import argparse
+import json
+import os
+import sys
+
+from config import BACKTEST_SPREAD_PCT, SYNTHETIC_SEED
+from backtest.bench import (
+    PENGUIN_COUNTS,
+    SYMBOL_COUNTS,
+    compare,
+    git_commit,
+    run_benchmarks,
+)
+
+BENCH_DIR = "bench_results"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--symbols", type=int, nargs="+", default=SYMBOL_COUNTS)
+    parser.add_argument("--penguins", type=int, nargs="+", default=PENGUIN_COUNTS)
+    parser.add_argument("--history", type=int, default=390, help="Bars before timing")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=SYNTHETIC_SEED)
+    parser.add_argument(
+        "--only",
+        action="append",
+        help="Benchmark name prefix, e.g. step, decide/TrendPenguin (repeatable)",
+    )
+    parser.add_argument(
+        "--out", help=f"Output JSON (default: {BENCH_DIR}/<commit>.json)"
+    )
+    parser.add_argument("--compare", help="Earlier results JSON to compare against")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="Median slowdown counted as a regression (0.2 = 20%%)",
+    )
+    args = parser.parse_args()
+
+    print(
+        f"⏱️  Benchmarking {args.symbols} symbols x {args.penguins} penguins, "
+        f"{args.repeat} repeats"
+    )
+    results = run_benchmarks(
+        symbol_counts=args.symbols,
+        penguin_counts=args.penguins,
+        history=args.history,
+        repeat=args.repeat,
+        seed=args.seed,
+        spread_pct=BACKTEST_SPREAD_PCT,
+        only=args.only,
+    )
+
+    out = args.out or os.path.join(BENCH_DIR, f"{git_commit() or 'results'}.json")
+    os.makedirs(os.path.dirname(out) or ".", exist_ok=True)
+    with open(out, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"💾 Saved {len(results['results'])} results to {out}")
+
+    if args.compare:
+        with open(args.compare, "r") as f:
+            base = json.load(f)
+        rows, regressions = compare(base, results, args.threshold)
+        print(f"\n📊 vs {args.compare} ({base['meta'].get('commit')})")
+        for (name, symbols, penguins), old_ms, new_ms, ratio in rows:
+            flag = "  ⚠️" if ratio > 1 + args.threshold else ""
+            print(
+                f"  {name:<38} {symbols:>5} sym {penguins:>4} peng  "
+                f"{old_ms:>10.3f} -> {new_ms:>10.3f} ms  x{ratio:.2f}{flag}"
+            )
+        if regressions:
+            print(f"\n❌ {len(regressions)} regressions over {args.threshold:.0%}")
+            sys.exit(1)
+        print("\n✓ No regressions")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,10 @@
+import argparse
 import time
 import signal
 import sys
-import random
 import os
 import shutil
-from collections import defaultdict
 from datetime import datetime
-import matplotlib
-
-matplotlib.use("Agg")
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_pdf import PdfPages
-from matplotlib.table import Table
 import json
 import pytz
 
@@ -23,12 +16,42 @@ from config import (
     TRANSACTION_COST,
     ENABLE_TRANSACTION_COSTS,
     USE_SYNTHETIC_DATA,
+    SYNTHETIC_SEED,
+    QUOTE_MODE,
+    QUOTE_MAX_AGE_SECONDS,
+    QUOTE_WORKERS,
+    QUOTE_DEADLINE_SECONDS,
+    QUOTE_REQUEST_TIMEOUT_SECONDS,
+    API_RATE_LIMIT_PER_MINUTE,
+    API_BURST,
+    API_RETRIES,
+    API_BREAKER_THRESHOLD,
+    API_BREAKER_RESET_SECONDS,
     CAPITAL_CURVES_FILE,
     TRADES_LOG_FILE,
     CURVES_DATA_FILE,
+    JOURNAL_FILE,
+    JOURNAL_FLUSH_SECONDS,
+    CHECKPOINT_DIR,
+    CHECKPOINT_EVERY_MINUTES,
+    REPORT_IN_BACKGROUND,
+    INSTRUMENT_LOOP,
+    METRICS_FILE,
+)
+from data_client import (
+    AlpacaClient,
+    AlpacaQuoteSource,
+    QuoteFetcher,
+    RequestScheduler,
 )
-from data_client import AlpacaClient
-from backtest.portfolio import Portfolio
+from instrumentation import NULL_TIMER, LoopTimer
+from data.alpaca_history import get_minute_bars
+from data.journal import Journal
+from data.quote_book import QuoteBook, QuoteStreamConsumer, ReplayQuoteSource
+from backtest.checkpoint import Checkpointer
+from backtest.simulator import Simulator
+from reporting import ReportWorker
+from data.synthetic import SyntheticMarket
 from data.scoreboard import (
     load_scoreboard,
     save_scoreboard,
@@ -47,222 +70,12 @@ from penguins import (
 )
 
 
-def synthetic_price_bar(symbol, price_history):
-    """Generate synthetic price when Alpaca has no data."""
-    if symbol not in price_history or not price_history[symbol]:
-        return 100.0 + hash(symbol) % 50
-    last = price_history[symbol][-1]
-    # Ensure last price is valid
-    if last <= 0:
-        return 100.0 + hash(symbol) % 50
-    change_pct = random.gauss(0, 0.3)
-    new_price = last * (1 + change_pct / 100)
-    # Ensure minimum price of $0.01
-    return max(0.01, new_price)
-
-
-def plot_capital_curves(curves, filename):
-    """Plot and save capital curves."""
-    plt.figure(figsize=(12, 6))
-    for name, vals in curves.items():
-        plt.plot(range(1, len(vals) + 1), vals, label=name, linewidth=3)
-
-    # Calculate and plot overall average capital
-    if curves:
-        curve_values = list(curves.values())
-        num_penguins = len(curve_values)
-        overall_avg = [
-            sum(vals[i] for vals in curve_values) / num_penguins
-            for i in range(len(curve_values[0]))
-        ]
-        plt.plot(
-            range(1, len(overall_avg) + 1),
-            overall_avg,
-            marker=None,
-            label="Overall Average Capital",
-            linewidth=3,
-            color="black",
-            linestyle="--",
-        )
-
-    plt.axhline(
-        y=INITIAL_CAPITAL,
-        color="gray",
-        linestyle="--",
-        alpha=0.5,
-        label="Initial Capital",
-    )
-    plt.xlabel("Minute")
-    plt.ylabel("Total Capital ($)")
-    plt.title(f"Penguin Capital Over {len(list(curves.values())[0])} Minutes")
-    plt.legend()
-    plt.grid(True, alpha=0.3)
-    plt.tight_layout()
-    plt.savefig(filename, dpi=100)
-    plt.close()  # Close to free memory
-    print(f"📈 Updated capital curves to {filename}")
-
-
-def create_final_report_pdf(curves, portfolios, filename, latest_prices=None):
-    """Create PDF with capital curves and per-symbol trade summary."""
-    with PdfPages(filename) as pdf:
-        # Page 1: Capital Curves
-        fig, ax = plt.subplots(figsize=(12, 8))
-
-        for name, vals in curves.items():
-            ax.plot(range(1, len(vals) + 1), vals, label=name, linewidth=2)
-
-        # Calculate and plot overall average capital
-        if curves:
-            curve_values = list(curves.values())
-            num_penguins = len(curve_values)
-            overall_avg = [
-                sum(vals[i] for vals in curve_values) / num_penguins
-                for i in range(len(curve_values[0]))
-            ]
-            ax.plot(
-                range(1, len(overall_avg) + 1),
-                overall_avg,
-                marker=None,
-                label="Overall Average Capital",
-                linewidth=2.5,
-                color="black",
-                linestyle="--",
-            )
-
-        ax.axhline(
-            y=INITIAL_CAPITAL,
-            color="gray",
-            linestyle="--",
-            alpha=0.5,
-            label="Initial Capital",
-        )
-        ax.set_xlabel("Minute")
-        ax.set_ylabel("Total Capital ($)")
-        ax.set_title(f"Penguin Capital Curves")
-        ax.legend(fontsize=9)
-        ax.grid(True, alpha=0.3)
-
-        plt.tight_layout()
-        pdf.savefig(fig, bbox_inches="tight")
-        plt.close()
-
-        # Page 2+: Trade Summary Table for each Penguin
-        for penguin_name, portfolio in sorted(portfolios.items()):
-            fig = plt.figure(figsize=(12, 10))
-            ax = fig.add_subplot(111)
-            ax.axis("tight")
-            ax.axis("off")
-
-            summary = portfolio.get_symbol_summary(latest_prices or {})
-
-            cash = portfolio.cash
-            market_value = 0.0
-            if latest_prices:
-                for symbol, pos in portfolio.positions.items():
-                    if symbol in latest_prices:
-                        market_value += pos.qty * latest_prices[symbol]
-            total_value = cash + market_value
-
-            # Build table data
-            table_data = [
-                [
-                    "Symbol",
-                    "Buy Cnt",
-                    "Sell Cnt",
-                    "Pos Qty",
-                    "Market Value",
-                    "Total Cost",
-                    "Total Revenue",
-                    "Total PnL",
-                    "PnL %",
-                ]
-            ]
-
-            total_pnl = 0
-            for symbol in sorted(summary.keys()):
-                s = summary[symbol]
-                pnl = s["total_pnl"]
-                pnl_pct = s["pnl_pct"]
-                total_pnl += pnl
-
-                table_data.append(
-                    [
-                        symbol,
-                        str(s["buy_count"]),
-                        str(s["sell_count"]),
-                        str(s["position_qty"]),
-                        f"${s['market_value']:,.2f}",
-                        f"${s['total_cost']:,.2f}",
-                        f"${s['total_revenue']:,.2f}",
-                        f"${pnl:,.2f}",
-                        f"{pnl_pct:+.2f}%",
-                    ]
-                )
-
-            # Add total row
-            table_data.append(
-                [
-                    "TOTAL",
-                    "",
-                    "",
-                    "",
-                    f"${market_value:,.2f}",
-                    "",
-                    "",
-                    f"${total_pnl:,.2f}",
-                    "",
-                ]
-            )
-
-            table = ax.table(
-                cellText=table_data,
-                cellLoc="center",
-                loc="center",
-                colWidths=[0.09, 0.08, 0.08, 0.08, 0.13, 0.13, 0.13, 0.12, 0.09],
-            )
-            table.auto_set_font_size(False)
-            table.set_fontsize(9)
-            table.scale(1, 2)
-
-            # Style header row
-            for i in range(len(table_data[0])):
-                table[(0, i)].set_facecolor("#4472C4")
-                table[(0, i)].set_text_props(weight="bold", color="white")
-
-            # Style total row
-            for i in range(len(table_data[0])):
-                table[(len(table_data) - 1, i)].set_facecolor("#E7E6E6")
-                table[(len(table_data) - 1, i)].set_text_props(weight="bold")
-
-            title = f"Trade Summary: {penguin_name}"
-            fig.suptitle(title, fontsize=14, weight="bold", y=0.98)
-
-            # Portfolio totals at the top
-            summary_text = (
-                f"Cash: ${cash:,.2f}    "
-                f"Market Value: ${market_value:,.2f}    "
-                f"Total Value: ${total_value:,.2f}"
-            )
-            fig.text(0.5, 0.93, summary_text, ha="center", fontsize=11)
-
-            plt.tight_layout()
-            pdf.savefig(fig, bbox_inches="tight")
-            plt.close()
-
-    print(f"📄 Final report saved to {filename}")
-
-
 def check_consistency(portfolio, latest_prices, curve_values, max_jump_pct=0.15):
     """Validate positions vs trade history and detect suspicious curve jumps."""
     warnings = []
 
-    # 1) Positions vs trade history
-    expected_qty = {}
-    for t in portfolio.trade_history:
-        expected_qty[t.symbol] = expected_qty.get(t.symbol, 0) + (
-            t.qty if t.side == "BUY" else -t.qty
-        )
+    # 1) Positions vs the trade ledger (kept apart from positions and symbol_stats)
+    expected_qty = portfolio.trade_history.net_qty()
 
     for symbol, pos in portfolio.positions.items():
         expected = expected_qty.get(symbol, 0)
@@ -301,7 +114,31 @@ def check_consistency(portfolio, latest_prices, curve_values, max_jump_pct=0.15)
     return warnings
 
 
-def run():
+def make_penguins():
+    """The penguin roster shared by live runs and offline replays."""
+    return [
+        CopilotPenguin(),
+        MomentumPenguin(),
+        MeanReversionPenguin(),
+        BreakoutPenguin(),
+        TrendPenguin(),
+    ]
+
+
+def make_simulator(penguins, verbose=True, journal=None, timer=None):
+    return Simulator(
+        penguins,
+        SYMBOLS,
+        initial_capital=INITIAL_CAPITAL,
+        fee_per_trade=TRANSACTION_COST,
+        enable_fees=ENABLE_TRANSACTION_COSTS,
+        verbose=verbose,
+        journal=journal,
+        timer=timer,
+    )
+
+
+def run(resume=False):
     # Load scoreboard and register penguins
     scoreboard = load_scoreboard()
 
@@ -309,35 +146,97 @@ def run():
     print(f"Symbols: {SYMBOLS}")
     print(f"Interval: {BAR_TIMEFRAME_MINUTES} minute(s) per bar\n")
 
-    client = AlpacaClient(paper=True)
+    # Per-bar timing; with INSTRUMENT_LOOP off nothing below is timed
+    timer = LoopTimer(BAR_TIMEFRAME_MINUTES * 60) if INSTRUMENT_LOOP else NULL_TIMER
+    hooked_timer = timer if timer.enabled else None
+    client = AlpacaClient(
+        paper=True,
+        timer=hooked_timer,
+        pool_size=QUOTE_WORKERS,
+        request_timeout=QUOTE_REQUEST_TIMEOUT_SECONDS,
+        scheduler=RequestScheduler(
+            per_minute=API_RATE_LIMIT_PER_MINUTE,
+            burst=API_BURST,
+            retries=API_RETRIES,
+            breaker_threshold=API_BREAKER_THRESHOLD,
+            breaker_reset_seconds=API_BREAKER_RESET_SECONDS,
+        ),
+    )
 
-    penguins = [
-        CopilotPenguin(),
-        MomentumPenguin(),
-        MeanReversionPenguin(),
-        BreakoutPenguin(),
-        TrendPenguin(),
-    ]
+    # Push-based quote ingestion: a background consumer keeps the book current
+    quote_book = None
+    stream = None
+    if QUOTE_MODE in ("stream", "replay"):
+        if QUOTE_MODE == "stream":
+            source = AlpacaQuoteSource(SYMBOLS, feed=client.feed)
+        else:
+            source = ReplayQuoteSource.from_price_history(
+                get_minute_bars(SYMBOLS, minutes=RUN_MINUTES),
+                interval=BAR_TIMEFRAME_MINUTES * 60,
+            )
+        quote_book = QuoteBook()
+        stream = QuoteStreamConsumer(quote_book, source)
+        stream.start()
+        print(f"📡 Quote ingestion mode: {QUOTE_MODE}")
+
+    # Per-symbol polling: the "concurrent" mode, and the fallback when a
+    # batched request fails in "rest" mode
+    fetcher = None
+    if quote_book is None:
+        fetcher = QuoteFetcher(
+            client, workers=QUOTE_WORKERS, deadline_seconds=QUOTE_DEADLINE_SECONDS
+        )
+
+    def poll_each():
+        quotes = fetcher.fetch(SYMBOLS)
+        if fetcher.late or fetcher.failed:
+            print(
+                f"  ⏰ No quote this bar for {len(fetcher.late)} late and "
+                f"{len(fetcher.failed)} failed symbols"
+            )
+        return quotes
+
+    penguins = make_penguins()
 
     # Register all penguins in scoreboard
     for penguin in penguins:
         scoreboard = register_penguin(scoreboard, penguin.name)
 
-    portfolios = {
-        p.name: Portfolio(
-            cash=INITIAL_CAPITAL,
-            fee_per_trade=TRANSACTION_COST,
-            enable_fees=ENABLE_TRANSACTION_COSTS,
-        )
-        for p in penguins
-    }
-    price_history = defaultdict(list)
-    curves = {p.name: [] for p in penguins}
-    trades_log = {p.name: [] for p in penguins}  # List of (minute, trade_str) tuples
+    # Continue from the latest checkpoint, or start clean
+    checkpointer = Checkpointer(CHECKPOINT_DIR)
+    state = checkpointer.load() if resume else None
+    if resume and state is None:
+        print("⚠️ No checkpoint found - starting a new run")
+    if state is None:
+        checkpointer.reset()
+
+    journal = Journal(
+        JOURNAL_FILE,
+        flush_seconds=JOURNAL_FLUSH_SECONDS,
+        resume_offset=state["extra"]["journal_offset"] if state else None,
+    )
+    sim = make_simulator(penguins, journal=journal, timer=hooked_timer)
+    if quote_book is not None:
+        quote_book.on_update = sim.bars.update_quote  # Every quote shapes the bar
+    portfolios = sim.portfolios
+    price_history = sim.price_history
+    synthetic = SyntheticMarket(seed=SYNTHETIC_SEED)  # Fills in missing quotes
+    curves = sim.curves
+    trades_log = sim.trades_log  # List of (minute, trade_str) tuples
     actual_trading_minutes = 0  # Track minutes when market was actually open
+    minute = 0
+    if state is not None:
+        checkpointer.restore(sim, state)
+        minute = state["minute"]
+        actual_trading_minutes = state["extra"]["actual_trading_minutes"]
+        print(f"♻️  Resumed from checkpoint at minute {minute}")
+    reporter = ReportWorker(background=REPORT_IN_BACKGROUND).start()
 
     def handle_sigint(signum, frame):
         print("\n\n⛔ Interrupted by user...")
+        sim.journal.close()
+        if stream is not None:
+            stream.stop()
         # Only save if we had meaningful trading time (>10 minutes)
         if actual_trading_minutes < 10:
             print(
@@ -357,9 +256,7 @@ def run():
             f.write(f"Initial Capital: ${INITIAL_CAPITAL:,.2f}\n\n")
             f.write("=" * 80 + "\n\n")
 
-            latest_prices = {
-                s: price_history[s][-1] for s in SYMBOLS if price_history[s]
-            }
+            latest_prices = sim.latest_prices()
             consistency_warnings = {
                 name: check_consistency(
                     portfolios[name],
@@ -368,9 +265,10 @@ def run():
                 )
                 for name in portfolios
             }
+            values = sim.values()
             for name in sorted(portfolios.keys()):
                 p = portfolios[name]
-                v = p.value(latest_prices)
+                v = values[name]
                 pnl = v - INITIAL_CAPITAL
                 pnl_pct = (pnl / INITIAL_CAPITAL * 100) if INITIAL_CAPITAL else 0
 
@@ -410,19 +308,21 @@ def run():
             )
 
             # Get latest prices
-            latest_prices = {
-                s: price_history[s][-1] for s in SYMBOLS if price_history[s]
-            }
+            latest_prices = sim.latest_prices()
 
             # Keep portfolios intact to avoid double-counting trades on interruption
             # Use latest prices for market value instead of force-liquidating
 
             # Ensure capital curve plot matches the report
-            plot_capital_curves(curves, CAPITAL_CURVES_FILE)
+            reporter.plot_capital_curves(curves, CAPITAL_CURVES_FILE)
 
             # Generate final PDF report
             pdf_filename = os.path.join("run_current", "report_interrupted.pdf")
-            create_final_report_pdf(curves, portfolios, pdf_filename, latest_prices)
+            timer.write(METRICS_FILE)
+            reporter.create_final_report_pdf(
+                curves, portfolios, pdf_filename, latest_prices, timer.snapshot()
+            )
+            reporter.close()  # Rendered files must exist before archiving
 
             # Archive to run_old with day/time structure
             now = datetime.now().replace(minute=0, second=0)
@@ -441,30 +341,27 @@ def run():
 
     signal.signal(signal.SIGINT, handle_sigint)
 
-    minute = 0
-
     while minute < RUN_MINUTES:
+        # The bar starts with the market check, so it counts toward the budget;
+        # a closed-market pass is discarded by the next start_bar()
+        loop_start = time.time()
+        timer.start_bar()
+
         # Check if market is open
         try:
-            market_open = client.market_is_open()
+            with timer.span("market_check"):
+                market_open = client.market_is_open()
+                next_open = None if market_open else client.clock.next_open()
         except Exception as e:
+            # Backoff after a transient error, or until the breaker's next probe
+            wait_time = client.scheduler.retry_in("clock")
             print(
-                f"  ⚠️ Connection error checking market status: {type(e).__name__}. Retrying in 30s..."
+                f"  ⚠️ Connection error checking market status: {type(e).__name__}. Retrying in {wait_time:.0f}s..."
             )
-            time.sleep(30)
+            time.sleep(wait_time)
             continue
 
         if not market_open:
-            try:
-                clock = client.trading.get_clock()
-            except Exception as e:
-                print(
-                    f"  ⚠️ Connection error getting clock: {type(e).__name__}. Retrying in 30s..."
-                )
-                time.sleep(30)
-                continue
-
-            next_open = clock.next_open
             now = datetime.now(pytz.timezone("US/Eastern"))
             time_to_open = (next_open - now).total_seconds()
 
@@ -489,121 +386,136 @@ def run():
 
         minute += 1
         actual_trading_minutes += 1  # Increment only when market is open
-        loop_start = time.time()
         print(
             f"\n=== Minute {minute}/{RUN_MINUTES} {datetime.now().strftime('%H:%M:%S')} ==="
         )
 
-        # Poll prices for each symbol
-        bid_ask_prices = {}
-        price_source = {}  # Track if price is real or synthetic
-        for s in SYMBOLS:
-            try:
-                bid, ask = client.get_bid_ask(s)
-            except Exception as e:
-                print(
-                    f"  ⚠️ API error for {s}: {type(e).__name__}. Using synthetic price."
-                )
-                bid, ask = None, None
-
-            if bid is None or ask is None:
-                if USE_SYNTHETIC_DATA:
-                    mid = synthetic_price_bar(s, price_history)
-                    spread = mid * 0.001  # 0.1% spread for synthetic
-                    bid, ask = mid - spread / 2, mid + spread / 2
-                    print(f"{s}: ${bid:.2f} (synthetic)", end="  ")
-                    price_source[s] = "synthetic"
-                else:
-                    print(f"  ⚠️ No quote for {s}, skipping")
-                    continue
-            else:
-                mid = (bid + ask) / 2
-                spread = ask - bid
-                print(f"{s}: ${bid:.2f} (real)", end="  ")
-                price_source[s] = "real"
-
-            bid_ask_prices[s] = (bid, ask)
-            price_history[s].append(mid)  # Store mid for history/charting
-
-        # Let each penguin trade
-        for penguin in penguins:
-            portfolio = portfolios[penguin.name]
-            for s in SYMBOLS:
-                if s not in bid_ask_prices:
-                    continue
-
-                mid_prices = price_history[s]
-                if not mid_prices:
-                    continue
-
-                bid, ask = bid_ask_prices[s]
+        # A dead stream leaves the book frozen: poll over REST for the rest of the run
+        if stream is not None and stream.error is not None and quote_book is not None:
+            print(
+                f"  ⚠️ Quote stream failed ({type(stream.error).__name__}). Polling quotes over REST from now on."
+            )
+            quote_book = None
+            fetcher = QuoteFetcher(
+                client, workers=QUOTE_WORKERS, deadline_seconds=QUOTE_DEADLINE_SECONDS
+            )
 
+        # Read the quote book snapshot, or poll all symbols in one batched request
+        with timer.span("quotes"):
+            if quote_book is not None:
+                quotes = quote_book.snapshot(max_age=QUOTE_MAX_AGE_SECONDS)
+            elif QUOTE_MODE == "concurrent":
+                quotes = poll_each()
+            else:
                 try:
-                    decision, qty = penguin.decide(s, mid_prices, bid, ask, portfolio)
+                    quotes = client.get_bid_ask_many(
+                        SYMBOLS, deadline=QUOTE_DEADLINE_SECONDS
+                    )
                 except Exception as e:
-                    print(f"    ❌ {penguin.name} error on {s}: {e}")
-                    continue
-
-                if decision == "BUY":
-                    # Validate price is not $0 before buying
-                    if ask <= 0:
-                        print(
-                            f"    ⚠️ {penguin.name} skipped BUY {qty} {s} - invalid price ${ask:.2f}"
-                        )
-                        continue
-                    # Buy at ask price
-                    success = portfolio.buy(s, ask, qty=qty)
-                    if success:
-                        source_marker = (
-                            " [synthetic]" if price_source.get(s) == "synthetic" else ""
-                        )
-                        print(
-                            f"    ✓ {penguin.name} BUY {qty} {s} @ ${ask:.2f} (ask){source_marker}"
-                        )
-                        trades_log[penguin.name].append(
-                            (minute, f"BUY {qty} {s} @ ${ask:.2f}{source_marker}")
-                        )
-                elif decision == "SELL":
-                    # Validate price is not $0 before selling
-                    if bid <= 0:
-                        print(
-                            f"    ⚠️ {penguin.name} skipped SELL {qty} {s} - invalid price ${bid:.2f}"
-                        )
+                    print(
+                        f"  ⚠️ Batched quote request failed: {type(e).__name__}. Polling symbols one by one."
+                    )
+                    quotes = poll_each()
+
+        with timer.span("prepare"):
+            bid_ask_prices = {}
+            price_source = {}  # Track if price is real or synthetic
+            for s in SYMBOLS:
+                bid, ask = quotes.get(s, (None, None))
+
+                if bid is None or ask is None:
+                    if USE_SYNTHETIC_DATA:
+                        # Continue from the last price with a modelled spread
+                        bid, ask = synthetic.quote(s, price_history.last(s))
+                        print(f"{s}: ${bid:.2f} (synthetic)", end="  ")
+                        price_source[s] = "synthetic"
+                    else:
+                        print(f"  ⚠️ No quote for {s}, skipping")
                         continue
-                    # Sell at bid price
-                    success = portfolio.sell(s, bid, qty=qty)
-                    if success:
-                        source_marker = (
-                            " [synthetic]" if price_source.get(s) == "synthetic" else ""
-                        )
-                        print(
-                            f"    ✓ {penguin.name} SELL {qty} {s} @ ${bid:.2f} (bid){source_marker}"
-                        )
-                        trades_log[penguin.name].append(
-                            (minute, f"SELL {qty} {s} @ ${bid:.2f}{source_marker}")
-                        )
-
-        # Record portfolio values
-        latest_prices = {s: price_history[s][-1] for s in SYMBOLS if price_history[s]}
-        for penguin in penguins:
-            p = portfolios[penguin.name]
-            v = p.value(latest_prices)
-            curves[penguin.name].append(v)
+                else:
+                    print(f"{s}: ${bid:.2f} (real)", end="  ")
+                    price_source[s] = "real"
+
+                bid_ask_prices[s] = (bid, ask)
+
+        # Let each penguin trade, then record portfolio values
+        with timer.span("step"):
+            sim.step(
+                bid_ask_prices,
+                price_source,
+                minute=minute,
+                quotes_fed=quote_book is not None,
+            )
+
+        if minute % CHECKPOINT_EVERY_MINUTES == 0:
+            with timer.span("checkpoint"):
+                checkpointer.save(
+                    sim,
+                    journal_offset=sim.journal.offset(),
+                    actual_trading_minutes=actual_trading_minutes,
+                )
 
         # Plot capital curves every 10 minutes
         if minute % 10 == 0:
-            plot_capital_curves(curves, CAPITAL_CURVES_FILE)
+            with timer.span("plot"):
+                reporter.plot_capital_curves(curves, CAPITAL_CURVES_FILE)
+            timer.write(METRICS_FILE)
+            penguin = penguins[-1]
+            p = portfolios[penguin.name]
+            v = curves[penguin.name][-1]
             print(f"  {penguin.name}:")
             print(f"    Cash (pocket): ${p.cash:,.2f}")
             print(f"    Total value (cash + stocks): ${v:,.2f}")
             print(f"    Trades: {p.trades}")
 
         # Wait for next bar
+        timer.end_bar()
+        breakdown = timer.bar_breakdown()
+        breakdown = f" [{breakdown}]" if breakdown else ""
         elapsed = time.time() - loop_start
         wait_time = BAR_TIMEFRAME_MINUTES * 60 - elapsed
         if wait_time > 0:
-            print(f"  Waiting {wait_time:.1f}s for next minute...")
+            print(f"  Waiting {wait_time:.1f}s for next minute...{breakdown}")
             time.sleep(wait_time)
+        else:
+            print(f"  ⚠️ Bar took {elapsed:.1f}s, over the bar budget{breakdown}")
+
+    if stream is not None:
+        stream.stop()
+    if fetcher is not None:
+        fetcher.close()
+    finish_run(
+        sim,
+        scoreboard,
+        RUN_MINUTES,
+        actual_trading_minutes,
+        reporter=reporter,
+        timer=timer,
+    )
+
+
+def finish_run(
+    sim,
+    scoreboard,
+    run_minutes,
+    actual_trading_minutes,
+    archive=True,
+    reporter=None,
+    timer=None,
+):
+    """
+    Pick the winner, update the scoreboard and write all run artifacts.
+
+    Pass scoreboard=None to leave the scoreboard untouched, archive=False to
+    skip copying run_current/ into run_old/. Without a reporter the plot and
+    PDF are rendered inline. With a LoopTimer, its metrics are written to
+    METRICS_FILE and added to the PDF.
+    """
+    penguins = sim.penguins
+    portfolios = sim.portfolios
+    price_history = sim.price_history
+    curves = sim.curves
+    trades_log = sim.trades_log
 
     # End of run: determine winner and save results
     print("\n" + "=" * 60)
@@ -637,82 +549,41 @@ def run():
     print(f"\n🏆 Winner: {winner_name} with ${winner_value:,.2f}")
 
     # Record win in scoreboard (completed run, not interrupted)
-    for penguin in penguins:
-        scoreboard = record_run(scoreboard, penguin.name)
-    scoreboard = record_win(scoreboard, winner_name)
-    save_scoreboard(scoreboard)
-    print_scoreboard(scoreboard)
-
-    # Save capital curves plot
-    plt.figure(figsize=(12, 6))
-    for name, vals in curves.items():
-        plt.plot(range(1, len(vals) + 1), vals, marker=None, label=name, linewidth=1)
-
-    # Calculate and plot overall average capital
-    if curves:
-        curve_values = list(curves.values())
-        num_penguins = len(curve_values)
-        overall_avg = [
-            sum(vals[i] for vals in curve_values) / num_penguins
-            for i in range(len(curve_values[0]))
-        ]
-        plt.plot(
-            range(1, len(overall_avg) + 1),
-            overall_avg,
-            marker="",
-            label="Overall Average Capital",
-            linewidth=2,
-            color="black",
-            linestyle="--",
-        )
-
-    plt.axhline(
-        y=INITIAL_CAPITAL,
-        color="gray",
-        linestyle="--",
-        alpha=0.5,
-        label="Initial Capital",
+    if scoreboard is not None:
+        for penguin in penguins:
+            scoreboard = record_run(scoreboard, penguin.name)
+        scoreboard = record_win(scoreboard, winner_name)
+        save_scoreboard(scoreboard)
+        print_scoreboard(scoreboard)
+
+    # Render the final plot and PDF in the background while the logs are written
+    reporter = reporter or ReportWorker(background=False)
+    reporter.plot_capital_curves(
+        curves,
+        CAPITAL_CURVES_FILE,
+        linewidth=1,
+        avg_linewidth=2,
+        minutes=run_minutes,
+        final=True,
     )
-    plt.xlabel("Minute")
-    plt.ylabel("Total Capital ($)")
-    plt.title(f"Penguin Capital Over {RUN_MINUTES} Minutes")
-    plt.legend()
-    plt.grid(True, alpha=0.3)
-    plt.tight_layout()
-    plt.savefig(CAPITAL_CURVES_FILE, dpi=100)
-    print(f"\n📈 Saved capital curves to {CAPITAL_CURVES_FILE}")
 
     # Generate final PDF report with capital curves and trade summary
-    latest_prices = {s: price_history[s][-1] for s in SYMBOLS if price_history[s]}
+    latest_prices = sim.latest_prices()
     pdf_filename = os.path.join("run_current", "report.pdf")
-    create_final_report_pdf(curves, portfolios, pdf_filename, latest_prices)
-
-    # Save to run_old only if meaningful run (>10 minutes of actual trading)
-    if actual_trading_minutes >= 10:
-        now = datetime.now().replace(minute=0, second=0)
-        date_str = now.strftime("%y%m%d")
-        time_str = now.strftime("%H%M")
-        old_run_dir = os.path.join("run_old", date_str, f"run_{time_str}")
-        os.makedirs(old_run_dir, exist_ok=True)
-
-        # Copy files from run_current to timestamped folder in run_old
-        for filename in os.listdir("run_current"):
-            src = os.path.join("run_current", filename)
-            if os.path.isfile(src):
-                dst = os.path.join(old_run_dir, filename)
-                shutil.copy2(src, dst)
-        print(f"💾 Archived run to {old_run_dir}")
-    else:
-        print(
-            f"⏭️  Only {actual_trading_minutes} minutes of actual trading - not archiving to run_old."
-        )
+    metrics = None
+    if timer is not None and timer.enabled:
+        timer.write(METRICS_FILE)
+        metrics = timer.snapshot()
+    reporter.create_final_report_pdf(
+        curves, portfolios, pdf_filename, latest_prices, metrics
+    )
 
     # Save trades log
     with open(TRADES_LOG_FILE, "w") as f:
         f.write(f"Penguin Trading Simulation Log\n")
         f.write(f"Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-        f.write(f"Duration: {RUN_MINUTES} minutes\n")
-        f.write(f"Symbols: {', '.join(SYMBOLS)}\n")
+        f.write(f"Duration: {run_minutes} minutes\n")
+        f.write(f"Symbols: {', '.join(sim.symbols)}\n")
         f.write(f"Initial Capital: ${INITIAL_CAPITAL:,.2f}\n\n")
         f.write("=" * 80 + "\n\n")
 
@@ -765,6 +636,39 @@ def run():
         json.dump(curves, f, indent=2)
     print(f"📊 Saved curves data to {CURVES_DATA_FILE}")
 
+    reporter.close()  # The archive below must include the rendered files
+    if sim.journal is not None:
+        sim.journal.close()
+        print(f"🗒️  Journal written to {sim.journal.path}")
+
+    # Save to run_old only if meaningful run (>10 minutes of actual trading)
+    if not archive:
+        return
+    if actual_trading_minutes >= 10:
+        now = datetime.now().replace(minute=0, second=0)
+        date_str = now.strftime("%y%m%d")
+        time_str = now.strftime("%H%M")
+        old_run_dir = os.path.join("run_old", date_str, f"run_{time_str}")
+        os.makedirs(old_run_dir, exist_ok=True)
+
+        # Copy files from run_current to timestamped folder in run_old
+        for filename in os.listdir("run_current"):
+            src = os.path.join("run_current", filename)
+            if os.path.isfile(src):
+                dst = os.path.join(old_run_dir, filename)
+                shutil.copy2(src, dst)
+        print(f"💾 Archived run to {old_run_dir}")
+    else:
+        print(
+            f"⏭️  Only {actual_trading_minutes} minutes of actual trading - not archiving to run_old."
+        )
+
 
 if __name__ == "__main__":
-    run()
+    parser = argparse.ArgumentParser(description="Run the live penguin simulation.")
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help=f"Continue from the latest checkpoint in {CHECKPOINT_DIR}",
+    )
+    run(resume=parser.parse_args().resume)
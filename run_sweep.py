@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Sweep penguin hyperparameters over a stored dataset across all CPU cores.
+
+Usage:
+    python run_sweep.py --bars bars.json                        # Full default grids
+    python run_sweep.py --penguin BreakoutPenguin --samples 20  # Random search
+    python run_sweep.py --minutes 300 --workers 8 --rank-by sharpe
+    python run_sweep.py --offline --end 2026-01-21T16:00-05:00
+"""
+
+import argparse
+import json
+import os
+import time
+from datetime import datetime
+
+import pytz
+
+from config import (
+    SYMBOLS,
+    RUN_MINUTES,
+    INITIAL_CAPITAL,
+    TRANSACTION_COST,
+    ENABLE_TRANSACTION_COSTS,
+    BACKTEST_SPREAD_PCT,
+    CURRENT_RUN_DIR,
+)
+from backtest.sweep import DEFAULT_GRIDS, grid_configs, random_configs, run_sweep
+from data.alpaca_history import get_minute_bars
+
+SWEEP_RESULTS_FILE = os.path.join(CURRENT_RUN_DIR, "sweep_results.json")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--bars", help="JSON file of {symbol: [prices]}")
+    parser.add_argument("--end", help="End of the bar window (ISO time, default: now)")
+    parser.add_argument(
+        "--offline", action="store_true", help="Use cached bars only, never fetch"
+    )
+    parser.add_argument("--minutes", type=int, default=RUN_MINUTES)
+    parser.add_argument(
+        "--penguin",
+        action="append",
+        choices=sorted(DEFAULT_GRIDS),
+        help="Penguin class to sweep (repeatable, default: all)",
+    )
+    parser.add_argument(
+        "--samples", type=int, help="Random configs per penguin instead of a grid"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument(
+        "--rank-by",
+        default="final_value",
+        choices=["final_value", "pnl_pct", "sharpe", "max_drawdown_pct", "trades"],
+    )
+    parser.add_argument("--top", type=int, default=20)
+    args = parser.parse_args()
+
+    if args.bars:
+        with open(args.bars, "r") as f:
+            price_history = json.load(f)
+    else:
+        price_history = get_minute_bars(
+            SYMBOLS,
+            minutes=args.minutes,
+            end=(
+                datetime.fromisoformat(args.end).astimezone(pytz.UTC)
+                if args.end
+                else None
+            ),
+            offline=args.offline or None,
+        )
+
+    grids = {name: DEFAULT_GRIDS[name] for name in (args.penguin or DEFAULT_GRIDS)}
+    if args.samples:
+        configs = random_configs(grids, args.samples, seed=args.seed)
+    else:
+        configs = grid_configs(grids)
+
+    print(
+        f"🔬 Sweeping {len(configs)} configurations over {len(price_history)} symbols"
+    )
+    start = time.time()
+    results = run_sweep(
+        price_history,
+        configs,
+        workers=args.workers,
+        spread_pct=BACKTEST_SPREAD_PCT,
+        rank_by=args.rank_by,
+        initial_capital=INITIAL_CAPITAL,
+        fee_per_trade=TRANSACTION_COST,
+        enable_fees=ENABLE_TRANSACTION_COSTS,
+    )
+    print(f"⏱️  Finished in {time.time() - start:.1f}s\n")
+
+    print(
+        f"{'#':>3} {'Penguin':28} {'Final':>10} {'PnL %':>8} {'MaxDD %':>8} "
+        f"{'Sharpe':>7} {'Trades':>7}  Params"
+    )
+    print("=" * 100)
+    for rank, r in enumerate(results[: args.top], 1):
+        print(
+            f"{rank:3d} {r['penguin']:28} ${r['final_value']:9,.2f} {r['pnl_pct']:+8.2f} "
+            f"{r['max_drawdown_pct']:8.2f} {r['sharpe']:7.2f} {r['trades']:7d}  {r['params']}"
+        )
+
+    with open(SWEEP_RESULTS_FILE, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"\n📊 Saved {len(results)} results to {SWEEP_RESULTS_FILE}")
+
+
+if __name__ == "__main__":
+    main()
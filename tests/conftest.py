@@ -0,0 +1,113 @@
+import json
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+
+def iso(dt):
+    return dt.isoformat().replace("+00:00", "Z")
+
+
+class FakeAlpacaServer:
+    """
+    Local HTTP stand-in for the Alpaca data and trading REST APIs.
+
+    Serves latest quotes (/v2/stocks/quotes/latest) and the clock
+    (/v2/clock). Each path answers from a queue of scripted failures
+    before succeeding: push 503, 429 (with an optional Retry-After),
+    401, or "hang" to stall past the client's timeout.
+    """
+
+    def __init__(self):
+        self.plan = {}  # {path: [status or "hang" or (429, retry_after)]}
+        self.hits = {}  # {path: [time.monotonic()]}
+        self.quote_age = timedelta(0)
+        self.hang_seconds = 1.0
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server.handle(self)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.httpd.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.httpd.server_port}"
+        threading.Thread(
+            target=self.httpd.serve_forever, args=(0.05,), daemon=True
+        ).start()
+
+    def fail(self, path, *steps):
+        self.plan.setdefault(path, []).extend(steps)
+
+    def count(self, path):
+        return len(self.hits.get(path, []))
+
+    def handle(self, request):
+        path = request.path.split("?")[0]
+        self.hits.setdefault(path, []).append(time.monotonic())
+        steps = self.plan.get(path)
+        step = steps.pop(0) if steps else 200
+        if step == "hang":
+            time.sleep(self.hang_seconds)
+            step = 200
+        retry_after = None
+        if isinstance(step, tuple):
+            step, retry_after = step
+        if step != 200:
+            request.send_response(step)
+            if retry_after is not None:
+                request.send_header("Retry-After", str(retry_after))
+            request.end_headers()
+            request.wfile.write(b'{"code": 40000000, "message": "scripted"}')
+            return
+
+        now = datetime.now(timezone.utc)
+        if path == "/v2/clock":
+            body = {
+                "timestamp": iso(now),
+                "is_open": True,
+                "next_open": iso(now + timedelta(days=1)),
+                "next_close": iso(now + timedelta(hours=1)),
+            }
+        else:
+            query = request.path.split("symbols=")[-1].split("&")[0]
+            symbols = query.replace("%2C", ",").split(",")
+            t = iso(now - self.quote_age)
+            body = {
+                "quotes": {
+                    s: {
+                        "ap": 101.0,
+                        "as": 1,
+                        "ax": "V",
+                        "bp": 100.0,
+                        "bs": 1,
+                        "bx": "V",
+                        "c": [],
+                        "t": t,
+                        "z": "C",
+                    }
+                    for s in symbols
+                }
+            }
+        payload = json.dumps(body).encode()
+        request.send_response(200)
+        request.send_header("Content-Type", "application/json")
+        request.end_headers()
+        request.wfile.write(payload)
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def fake_server():
+    server = FakeAlpacaServer()
+    yield server
+    server.close()
@@ -0,0 +1,25 @@
+from types import SimpleNamespace
+
+from archive_index import cmd_leaderboard
+from data.archive import ArchiveIndex
+
+
+def test_leaderboard_wins_need_trades(tmp_path):
+    index = ArchiveIndex(":memory:", root=str(tmp_path))
+    runs = [
+        # Quiet run: the trader closed flat, tying the idle penguin's cash
+        ("260105/run_0930", [("Trader", 5000.0, 2), ("Idle", 5000.0, 0)]),
+        ("260106/run_0930", [("Trader", 5050.0, 2), ("Idle", 5000.0, 0)]),
+    ]
+    for run_id, (path, results) in enumerate(runs, start=1):
+        index.db.execute("INSERT INTO runs (id, path) VALUES (?, ?)", (run_id, path))
+        for penguin, value, trades in results:
+            index.db.execute(
+                "INSERT INTO results (run_id, penguin, final_value, pnl_pct, trades) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (run_id, penguin, value, (value - 5000.0) / 50, trades),
+            )
+
+    columns, rows = cmd_leaderboard(index, SimpleNamespace(since=None, until=None))
+    wins = {row[0]: row[columns.index("wins")] for row in rows}
+    assert wins == {"Trader": 2, "Idle": 0}
@@ -0,0 +1,93 @@
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytz
+
+from data.alpaca_history import load_minute_bars
+from data.bar_cache import BarCache, to_epoch
+
+END = datetime(2026, 1, 6, 16, 0, tzinfo=pytz.UTC)  # Tuesday, 11:00 New York
+MINUTE = timedelta(minutes=1)
+
+
+class FakeBarsClient:
+    """Answers get_bars with one bar per minute, or none while closed."""
+
+    feed = "iex"
+
+    def __init__(self, closed=False):
+        self.closed = closed
+        self.requests = []  # [(start, end, symbols)]
+
+    def get_bars(self, req):
+        # The request model stores start/end as naive UTC
+        start, end = (t.replace(tzinfo=pytz.UTC) for t in (req.start, req.end))
+        symbols = list(req.symbol_or_symbols)
+        self.requests.append((start, end, symbols))
+        data = {}
+        if not self.closed:
+            t = start
+            while t < end:
+                for s in symbols:
+                    price = 100.0 + t.minute
+                    data.setdefault(s, []).append(
+                        SimpleNamespace(
+                            timestamp=t,
+                            open=price,
+                            high=price,
+                            low=price,
+                            close=price,
+                            volume=10.0,
+                            vwap=price,
+                        )
+                    )
+                t += MINUTE
+        return SimpleNamespace(data=data)
+
+
+def load(client, tmp_path, minutes):
+    return load_minute_bars(
+        ["AAPL", "MSFT"],
+        minutes=minutes,
+        end=END,
+        offline=False,
+        cache_dir=str(tmp_path),
+        client=client,
+    )
+
+
+def test_only_missing_minutes_are_fetched(tmp_path):
+    client = FakeBarsClient()
+    bars = load(client, tmp_path, 30)
+    assert len(bars["AAPL"]) == 30
+    assert client.requests == [(END - 30 * MINUTE, END, ["AAPL", "MSFT"])]
+
+    # A longer window only backfills its start
+    bars = load(client, tmp_path, 300)
+    assert len(bars["MSFT"]) == 300
+    assert client.requests[1:] == [
+        (END - 300 * MINUTE, END - 30 * MINUTE, ["AAPL", "MSFT"])
+    ]
+    assert (bars["AAPL"]["t"][1:] - bars["AAPL"]["t"][:-1] == 60).all()
+
+    # Fully cached: no request at all
+    load(client, tmp_path, 300)
+    assert len(client.requests) == 2
+
+
+def test_empty_ranges_are_not_requested_again(tmp_path):
+    client = FakeBarsClient(closed=True)
+    load(client, tmp_path, 60)
+    load(client, tmp_path, 60)
+    assert len(client.requests) == 1
+
+
+def test_gaps_merge_covered_ranges(tmp_path):
+    cache = BarCache(str(tmp_path))
+    end_t = to_epoch(END)
+    cache.mark_covered("AAPL", end_t - 3600, end_t - 1800)
+    cache.mark_covered("AAPL", end_t - 1800, end_t - 600)
+    assert cache.gaps("AAPL", end_t - 7200, end_t) == [
+        (end_t - 7200, end_t - 3600),
+        (end_t - 600, end_t),
+    ]
@@ -0,0 +1,49 @@
+import pytest
+
+from backtest.simulator import Simulator
+from data.quote_book import QuoteBook
+
+SYMBOLS = ["AAPL", "MSFT", "NVDA"]
+
+
+def make_sim():
+    return Simulator([], SYMBOLS, verbose=False)
+
+
+def test_stream_fed_bar_counts_each_quote_once():
+    sim = make_sim()
+    book = QuoteBook(on_update=sim.bars.update_quote)
+    mids = [100.0, 101.0, 99.0, 104.0]
+    for mid in mids:
+        book.update("AAPL", mid - 0.05, mid + 0.05)
+    book.update("MSFT", 199.95, 200.05)
+    sim.step(book.snapshot(), quotes_fed=True)
+
+    bar = sim.bars.last("AAPL")
+    assert bar["vwap"] == pytest.approx(sum(mids) / len(mids))
+    assert (bar["open"], bar["high"], bar["low"], bar["close"]) == pytest.approx(
+        (100.0, 104.0, 99.0, 104.0)
+    )
+
+    # Next bar: only MSFT quotes; AAPL's snapshot quote is not a new bar
+    book.update("MSFT", 200.95, 201.05)
+    sim.step(book.snapshot(), quotes_fed=True)
+    assert len(sim.bars.closes("AAPL")) == 1
+    assert sim.bars.last("MSFT")["vwap"] == pytest.approx(201.0)
+
+
+def test_synthetic_quotes_still_make_bars_when_stream_fed():
+    sim = make_sim()
+    sim.step(
+        {"NVDA": (49.95, 50.05)},
+        price_source={"NVDA": "synthetic"},
+        quotes_fed=True,
+    )
+    assert sim.bars.last("NVDA")["close"] == pytest.approx(50.0)
+
+
+def test_polled_quotes_make_one_bar_each():
+    sim = make_sim()
+    sim.step({"AAPL": (99.95, 100.05), "MSFT": (199.95, 200.05)})
+    assert sim.bars.last("AAPL")["vwap"] == pytest.approx(100.0)
+    assert len(sim.bars.closes("MSFT")) == 1
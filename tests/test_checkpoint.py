@@ -0,0 +1,71 @@
+import pickle
+
+from backtest.checkpoint import BASE_FILE, Checkpointer
+from backtest.simulator import Simulator
+from data.synthetic import SyntheticMarket
+from penguins import MovingAverageCrossoverPenguin
+from run_simulation import make_penguins
+
+SYMBOLS = ["AAPL", "MSFT", "NVDA", "TSLA"]
+MINUTES = 90
+
+
+def quotes():
+    closes = SyntheticMarket(seed=7).bars(SYMBOLS, MINUTES)
+    return [
+        {s: (b["close"][i] * 0.9995, b["close"][i] * 1.0005) for s, b in closes.items()}
+        for i in range(MINUTES)
+    ]
+
+
+def make_sim():
+    return Simulator(make_penguins(), SYMBOLS, verbose=False)
+
+
+def test_resume_after_crash_gives_the_same_curves(tmp_path):
+    bars = quotes()
+    full = make_sim()
+    for minute, q in enumerate(bars, start=1):
+        full.step(q, minute=minute)
+
+    checkpointer = Checkpointer(str(tmp_path), compact_every=3)
+    sim = make_sim()
+    for minute, q in enumerate(bars[:67], start=1):
+        sim.step(q, minute=minute)
+        if minute % 5 == 0:
+            checkpointer.save(sim)
+    # Crash at minute 67: everything after the minute-65 save is lost
+
+    resumed = Checkpointer(str(tmp_path), compact_every=3)
+    state = resumed.load()
+    assert state["minute"] == 65
+    sim = make_sim()
+    resumed.restore(sim, state)
+    for minute, q in enumerate(bars[65:], start=66):
+        sim.step(q, minute=minute)
+
+    assert sim.curves == full.curves
+    assert sim.trades_log == full.trades_log
+    for name, portfolio in full.portfolios.items():
+        assert sim.portfolios[name].positions == portfolio.positions
+        assert list(sim.portfolios[name].trade_history) == list(portfolio.trade_history)
+
+
+def test_checkpoint_keeps_penguin_state_not_indicators(tmp_path):
+    sim = make_sim()
+    for minute, q in enumerate(quotes()[:30], start=1):
+        sim.step(q, minute=minute)
+    Checkpointer(str(tmp_path)).save(sim)
+    with open(tmp_path / BASE_FILE, "rb") as f:
+        saved = pickle.load(f)["penguins"]
+    assert saved["CopilotPenguin"] == {"entry_price": {}}
+    assert saved["TrendPenguin"] == {}
+
+
+def test_penguin_state_round_trip():
+    penguin = MovingAverageCrossoverPenguin()
+    penguin.prev_signal = "BUY"
+    fresh = MovingAverageCrossoverPenguin()
+    fresh.load_state({**penguin.state(), "ma_func": None})
+    assert fresh.prev_signal == "BUY"
+    assert fresh.ma_func is penguin.ma_func
@@ -0,0 +1,33 @@
+from backtest.portfolio import Portfolio, TradeLedger
+from run_simulation import check_consistency
+
+
+def make_portfolio():
+    portfolio = Portfolio(cash=10000.0)
+    portfolio.buy("AAPL", 100.0, 5)
+    portfolio.buy("MSFT", 200.0, 2)
+    portfolio.sell("AAPL", 110.0, 3)
+    portfolio.sell("MSFT", 210.0, 2)
+    return portfolio
+
+
+def test_ledger_net_qty():
+    assert make_portfolio().trade_history.net_qty() == {"AAPL": 2, "MSFT": 0}
+    assert TradeLedger().net_qty() == {}
+
+
+def test_consistent_portfolio_has_no_warnings():
+    portfolio = make_portfolio()
+    prices = {"AAPL": 110.0}
+    assert check_consistency(portfolio, prices, [portfolio.value(prices)]) == []
+
+
+def test_position_drift_from_ledger_is_reported():
+    portfolio = make_portfolio()
+    portfolio.positions["AAPL"].qty = 4  # e.g. a bad checkpoint restore
+    warnings = check_consistency(portfolio, {}, [])
+    assert warnings == ["Position mismatch for AAPL: positions=4, trades=2"]
+
+    del portfolio.positions["AAPL"]
+    warnings = check_consistency(portfolio, {}, [])
+    assert warnings == ["Missing position for AAPL: trades imply qty=2, positions=0"]
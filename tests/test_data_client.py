@@ -0,0 +1,114 @@
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from data_client import AlpacaClient, RequestScheduler
+
+
+class FakeData:
+    """Market data client answering get_stock_latest_quote from a dict."""
+
+    def __init__(self):
+        self.quotes = {}  # {symbol: quote}
+        self.requests = []
+
+    def set(self, symbol, bid, ask, age_seconds=0):
+        self.quotes[symbol] = SimpleNamespace(
+            bid_price=bid,
+            ask_price=ask,
+            timestamp=datetime.now(timezone.utc) - timedelta(seconds=age_seconds),
+        )
+
+    def get_stock_latest_quote(self, req):
+        symbols = req.symbol_or_symbols
+        symbols = [symbols] if isinstance(symbols, str) else symbols
+        self.requests.append(list(symbols))
+        return {s: self.quotes[s] for s in symbols if s in self.quotes}
+
+
+class FakeTrading:
+    def __init__(self, is_open=True):
+        now = datetime.now(timezone.utc)
+        self.clock = SimpleNamespace(
+            is_open=is_open,
+            next_open=now + timedelta(days=1),
+            next_close=now + timedelta(hours=1),
+        )
+
+    def get_clock(self):
+        return self.clock
+
+
+@pytest.fixture
+def fake_data():
+    return FakeData()
+
+
+@pytest.fixture
+def client(fake_data):
+    return AlpacaClient(
+        trading=FakeTrading(), data=fake_data, scheduler=RequestScheduler()
+    )
+
+
+def test_batch_fetches_all_symbols_in_one_request(client, fake_data):
+    fake_data.set("AAPL", 100.0, 100.1)
+    fake_data.set("MSFT", 300.0, 300.2)
+    quotes = client.get_bid_ask_many(["AAPL", "MSFT", "NONE"])
+    assert quotes == {
+        "AAPL": (100.0, 100.1),
+        "MSFT": (300.0, 300.2),
+        "NONE": (None, None),
+    }
+    assert fake_data.requests == [["AAPL", "MSFT", "NONE"]]
+
+
+def test_batch_matches_per_symbol_path(fake_data):
+    fake_data.set("AAPL", 100.0, 100.1)
+    fake_data.set("OLD", 50.0, 50.1, age_seconds=600)
+    fake_data.set("HALF", None, 20.0)
+    symbols = ["AAPL", "OLD", "HALF", "NONE"]
+    batched = AlpacaClient(trading=FakeTrading(), data=fake_data)
+    single = AlpacaClient(trading=FakeTrading(), data=fake_data)
+    assert batched.get_bid_ask_many(symbols) == {
+        s: single.get_bid_ask(s) for s in symbols
+    }
+
+
+def test_empty_symbol_list_makes_no_request(client, fake_data):
+    assert client.get_bid_ask_many([]) == {}
+    assert fake_data.requests == []
+
+
+def test_stale_quote_falls_back_to_none(client, fake_data, capsys):
+    fake_data.set("AAPL", 100.0, 100.1, age_seconds=301)
+    fake_data.set("MSFT", 300.0, 300.2, age_seconds=299)
+    quotes = client.get_bid_ask_many(["AAPL", "MSFT"])
+    assert quotes["AAPL"] == (None, None)
+    assert quotes["MSFT"] == (300.0, 300.2)
+    assert "Stale quote for AAPL" in capsys.readouterr().out
+
+
+def test_no_update_warns_but_keeps_quote(client, fake_data, capsys):
+    fake_data.set("AAPL", 100.0, 100.1)
+    for _ in range(3):
+        assert client.get_bid_ask_many(["AAPL"]) == {"AAPL": (100.0, 100.1)}
+    assert "No price update" not in capsys.readouterr().out
+
+    # Fourth identical quote: third unchanged check in a row
+    assert client.get_bid_ask_many(["AAPL"]) == {"AAPL": (100.0, 100.1)}
+    assert "No price update for AAPL (3 min)" in capsys.readouterr().out
+
+    # A price change resets the counter
+    fake_data.set("AAPL", 100.5, 100.6)
+    client.get_bid_ask_many(["AAPL"])
+    assert client._no_update_count["AAPL"] == 0
+
+
+def test_no_update_is_silent_when_market_closed(fake_data, capsys):
+    client = AlpacaClient(trading=FakeTrading(is_open=False), data=fake_data)
+    fake_data.set("AAPL", 100.0, 100.1)
+    for _ in range(5):
+        client.get_bid_ask_many(["AAPL"])
+    assert "No price update" not in capsys.readouterr().out
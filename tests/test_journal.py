@@ -0,0 +1,98 @@
+import json
+
+import pytest
+
+import plot_old_log
+from backtest.replay import replay_bars
+from backtest.simulator import Simulator
+from data.journal import Journal, JournalReplay, read_journal
+from data.synthetic import SyntheticMarket
+from run_simulation import make_penguins
+
+SYMBOLS = ["AAPL", "MSFT", "NVDA"]
+
+
+@pytest.fixture
+def journal_path(tmp_path):
+    """Journal of a short synthetic run, plus the live curves it recorded."""
+    path = tmp_path / "journal.jsonl"
+    bars = SyntheticMarket(seed=3).bars(SYMBOLS, 120)
+    journal = Journal(str(path), flush_seconds=0)
+    sim = Simulator(make_penguins(), SYMBOLS, verbose=False, journal=journal)
+    replay_bars(sim, {s: b["close"].tolist() for s, b in bars.items()})
+    journal.close()
+    assert sum(p.trades for p in sim.portfolios.values()) > 0
+    return path, sim.curves
+
+
+def test_replayed_portfolios_match_live_curves(journal_path):
+    path, curves = journal_path
+    replay = JournalReplay(str(path)).run()
+    assert replay.mismatches == []
+    for name, values in curves.items():
+        assert replay.curves[name] == pytest.approx(values, abs=1e-6)
+
+
+def test_replay_reports_a_lost_fill(journal_path):
+    path, _ = journal_path
+    lines = path.read_text().splitlines()
+    first_fill = next(i for i, line in enumerate(lines) if '"type":"fill"' in line)
+    fill = json.loads(lines.pop(first_fill))
+    path.write_text("\n".join(lines) + "\n")
+
+    replay = JournalReplay(str(path)).run()
+    assert replay.mismatches[0][:2] == (fill["bar"], fill["penguin"])
+
+
+def write_bars(journal, bars):
+    for bar in bars:
+        journal.bar(bar, {"AAPL": (99.9, 100.1)})
+        journal.values({"P": 5000.0 + bar})
+
+
+def test_reader_skips_a_torn_last_line(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    journal = Journal(str(path), flush_seconds=0)
+    journal.start_run(["AAPL"], ["P"], 5000.0, 1.0, True)
+    write_bars(journal, [1, 2])
+    journal.flush()
+    with open(path, "a") as f:
+        f.write('{"type":"values","bar":3,"val')  # Crash mid-write
+
+    records = list(read_journal(str(path)))
+    assert [r["type"] for r in records] == ["run", "bar", "values", "bar", "values"]
+    assert records[-1]["bar"] == 2
+
+
+def test_resume_offset_drops_records_after_the_checkpoint(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    journal = Journal(str(path), flush_seconds=60)
+    journal.start_run(["AAPL"], ["P"], 5000.0, 1.0, True)
+    write_bars(journal, [1, 2])
+    offset = journal.offset()  # Saved with the checkpoint
+    write_bars(journal, [3])
+    journal.flush()  # Written after the checkpoint, then the process dies
+
+    journal = Journal(str(path), flush_seconds=60, resume_offset=offset)
+    journal.start_run(["AAPL"], ["P"], 5000.0, 1.0, True)  # Keeps the header
+    write_bars(journal, [3, 4])
+    journal.close()
+
+    records = list(read_journal(str(path)))
+    assert [r["type"] for r in records].count("run") == 1
+    assert [r["bar"] for r in records if r["type"] == "values"] == [1, 2, 3, 4]
+    assert records[-1]["type"] == "end"
+
+
+def test_plot_json_uses_the_given_file(tmp_path, monkeypatch):
+    run_dir = tmp_path / "run"
+    run_dir.mkdir()
+    (run_dir / "data_a.json").write_text(json.dumps({"A": [1.0, 2.0]}))
+    (run_dir / "data_b.json").write_text(json.dumps({"B": [3.0, 4.0]}))
+    plotted = []
+    monkeypatch.setattr(
+        plot_old_log, "plot_capital_curves", lambda curves, out: plotted.append(curves)
+    )
+    monkeypatch.setattr("sys.argv", ["plot_old_log.py", str(run_dir / "data_b.json")])
+    plot_old_log.main()
+    assert plotted == [{"B": [3.0, 4.0]}]
@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+from backtest.portfolio import Portfolio
+from backtest.portfolio_book import PortfolioBook
+
+NAMES = ["A", "B", "C"]
+SYMBOLS = ["AAPL", "MSFT", "NVDA", "TSLA", "AMD"]
+
+
+def trade_randomly(book, portfolios, rng, bars=200):
+    for _ in range(bars):
+        name = NAMES[rng.integers(len(NAMES))]
+        symbol = SYMBOLS[rng.integers(len(SYMBOLS))]
+        price = float(rng.uniform(10, 200))
+        portfolio = portfolios[name]
+        trade = portfolio.buy if rng.random() < 0.6 else portfolio.sell
+        if trade(symbol, price, int(rng.integers(1, 4))):
+            book.sync(name, portfolio, symbol)
+
+
+def test_values_match_each_portfolio():
+    rng = np.random.default_rng(2)
+    portfolios = {name: Portfolio(cash=5000.0) for name in NAMES}
+    book = PortfolioBook(NAMES, SYMBOLS[:2])  # The rest add columns on the fly
+    trade_randomly(book, portfolios, rng)
+    assert set(book.symbols) == set(SYMBOLS)
+
+    priced = {s: float(rng.uniform(10, 200)) for s in SYMBOLS}
+    # All priced, one missing, one invalid: the last two mark at avg_price
+    for prices in (priced, {**priced, "NVDA": 0.0}, dict(list(priced.items())[1:])):
+        expected = [portfolios[name].value(prices) for name in NAMES]
+        assert book.values(prices) == pytest.approx(expected)
+
+
+def test_load_rebuilds_from_portfolios():
+    rng = np.random.default_rng(3)
+    portfolios = {name: Portfolio(cash=5000.0) for name in NAMES}
+    book = PortfolioBook(NAMES, SYMBOLS)
+    trade_randomly(book, portfolios, rng)
+
+    fresh = PortfolioBook(NAMES, SYMBOLS)
+    fresh.load(portfolios)
+    prices = {s: 100.0 for s in SYMBOLS}
+    assert fresh.value_dict(prices) == pytest.approx(book.value_dict(prices))
@@ -0,0 +1,42 @@
+import numpy as np
+
+from data.price_history import PriceHistory
+
+
+def test_matches_list_of_floats_across_growth():
+    history = PriceHistory(["AAPL"], capacity=2)
+    expected = {}
+    rng = np.random.default_rng(0)
+    # Uneven lengths and new symbols force both row and column growth
+    for i in range(50):
+        for s in ["AAPL", "MSFT", "NVDA"][: 1 + i % 3]:
+            price = float(rng.uniform(50, 150))
+            history.append(s, price)
+            expected.setdefault(s, []).append(price)
+    history.extend("TSLA", [1.0, 2.0, 3.0])
+    expected["TSLA"] = [1.0, 2.0, 3.0]
+
+    assert history.to_dict() == expected
+    assert history.symbols == ["AAPL", "MSFT", "NVDA", "TSLA"]
+    assert history.lengths.tolist() == [len(v) for v in expected.values()]
+    assert history.window("MSFT", 5).tolist() == expected["MSFT"][-5:]
+    assert history.window("TSLA", 10).tolist() == [1.0, 2.0, 3.0]
+    assert history.last("NVDA") == expected["NVDA"][-1]
+
+
+def test_matrix_rows_line_up_with_lengths():
+    history = PriceHistory(["A", "B"])
+    history.extend("A", [1.0, 2.0, 3.0])
+    history.extend("B", [4.0])
+    matrix = history.matrix()
+    assert matrix.shape == (2, 3)
+    assert matrix[0].tolist() == [1.0, 2.0, 3.0]
+    assert matrix[1, :1].tolist() == [4.0]
+
+
+def test_unknown_symbol_reads_empty():
+    history = PriceHistory()
+    assert len(history["NONE"]) == 0
+    assert len(history.window("NONE", 3)) == 0
+    assert history.last("NONE", default=-1.0) == -1.0
+    assert "NONE" not in history
@@ -0,0 +1,80 @@
+import threading
+import time
+
+import pytest
+
+from data.quote_book import QuoteBook, QuoteStreamConsumer, ReplayQuoteSource
+
+
+class BrokenSource:
+    """Quote source that delivers one quote, then drops the connection."""
+
+    def run(self, on_quote):
+        on_quote("AAPL", 100.0, 100.1, None)
+        raise ConnectionError("stream closed")
+
+    def stop(self):
+        pass
+
+
+def test_consumer_records_stream_error():
+    book = QuoteBook()
+    stream = QuoteStreamConsumer(book, BrokenSource())
+    stream.start()
+    stream.stop()
+    assert isinstance(stream.error, ConnectionError)
+    assert not stream.is_alive()
+    assert book.snapshot() == {"AAPL": (100.0, 100.1)}
+
+
+def test_consumer_stop_ends_a_running_stream():
+    prices = {"AAPL": [100.0, 101.0, 102.0]}
+    source = ReplayQuoteSource.from_price_history(prices, interval=60)
+    book = QuoteBook()
+    first = threading.Event()
+    book.on_update = lambda *quote: first.set()
+    stream = QuoteStreamConsumer(book, source)
+    stream.start()
+    assert first.wait(1.0)
+    stream.stop(timeout=1.0)
+    assert not stream.is_alive()
+    assert stream.error is None
+    assert book.updates == 1
+
+
+def test_snapshot_drops_stale_quotes(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr("data.quote_book.time.monotonic", lambda: clock[0])
+    book = QuoteBook()
+    book.update("AAPL", 100.0, 100.1)
+    clock[0] += 10
+    book.update("MSFT", 200.0, 200.2)
+    clock[0] += 5
+
+    assert book.snapshot(max_age=12) == {"MSFT": (200.0, 200.2)}
+    assert book.snapshot() == {"AAPL": (100.0, 100.1), "MSFT": (200.0, 200.2)}
+    assert book.get_bid_ask("AAPL") == (100.0, 100.1)  # Kept, just not fresh
+
+
+def test_book_ignores_one_sided_quotes():
+    book = QuoteBook()
+    book.update("AAPL", None, 100.1)
+    assert len(book) == 0
+    assert book.get_bid_ask("AAPL") == (None, None)
+
+
+def test_replay_pauses_only_between_bars():
+    source = ReplayQuoteSource.from_price_history(
+        {"AAPL": [100.0, 101.0, 102.0], "MSFT": [200.0, 201.0, 202.0]},
+        interval=0.05,
+    )
+    arrivals = []
+    start = time.monotonic()
+    source.run(lambda s, bid, ask, ts: arrivals.append(time.monotonic() - start))
+
+    assert len(arrivals) == 6
+    # Both symbols of a bar arrive together; bars are one interval apart
+    for bar in range(3):
+        first, second = arrivals[2 * bar : 2 * bar + 2]
+        assert second - first < 0.03
+        assert first == pytest.approx(0.05 * bar, abs=0.03)
@@ -0,0 +1,197 @@
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+from alpaca.common.exceptions import APIError
+from alpaca.data.historical import StockHistoricalDataClient
+from alpaca.trading.client import TradingClient
+
+from data_client import (
+    PRIORITY_HIGH,
+    PRIORITY_LOW,
+    PRIORITY_NORMAL,
+    AlpacaClient,
+    CircuitOpenError,
+    RequestScheduler,
+    TokenBucket,
+)
+
+QUOTES = "/v2/stocks/quotes/latest"
+CLOCK = "/v2/clock"
+
+
+def make_client(server, **scheduler_kwargs):
+    params = dict(per_minute=6000, burst=20, backoff_base=0.01, seed=0)
+    params.update(scheduler_kwargs)
+    return AlpacaClient(
+        trading=TradingClient("key", "secret", url_override=server.url),
+        data=StockHistoricalDataClient("key", "secret", url_override=server.url),
+        request_timeout=0.3,
+        scheduler=RequestScheduler(**params),
+    )
+
+
+# ---------- Retries ----------
+def test_retries_5xx_and_429_then_succeeds(fake_server):
+    client = make_client(fake_server)
+    fake_server.fail(QUOTES, 503, 429, 500)
+    quotes = client.get_bid_ask_many(["AAPL", "MSFT"])
+    assert quotes == {"AAPL": (100.0, 101.0), "MSFT": (100.0, 101.0)}
+    assert fake_server.count(QUOTES) == 4
+
+
+def test_gives_up_after_retries(fake_server):
+    client = make_client(fake_server, retries=2)
+    fake_server.fail(QUOTES, 503, 503, 503, 503)
+    with pytest.raises(APIError):
+        client.get_quotes(["AAPL"])
+    assert fake_server.count(QUOTES) == 3
+
+
+def test_honours_retry_after(fake_server):
+    client = make_client(fake_server)
+    fake_server.fail(QUOTES, (429, 0.3))
+    client.get_quotes(["AAPL"])
+    first, second = fake_server.hits[QUOTES]
+    assert second - first >= 0.3
+
+
+def test_retries_timeouts(fake_server):
+    client = make_client(fake_server)
+    fake_server.fail(QUOTES, "hang")
+    assert client.get_quotes(["AAPL"])
+    assert fake_server.count(QUOTES) == 2
+
+
+def test_does_not_retry_4xx(fake_server):
+    client = make_client(fake_server)
+    fake_server.fail(QUOTES, 400)
+    with pytest.raises(APIError):
+        client.get_quotes(["AAPL"])
+    assert fake_server.count(QUOTES) == 1
+
+
+def test_orders_are_never_retried():
+    calls = []
+
+    def submit_order(order):
+        calls.append(order)
+        raise ConnectionError("reset")
+
+    trading = SimpleNamespace(submit_order=submit_order)
+    client = AlpacaClient(
+        trading=trading,
+        data=SimpleNamespace(),
+        scheduler=RequestScheduler(backoff_base=0.01),
+    )
+    with pytest.raises(ConnectionError):
+        client.buy_market("AAPL", 1)
+    assert len(calls) == 1
+
+
+# ---------- Circuit breaker ----------
+def test_breaker_opens_half_opens_and_closes(fake_server):
+    client = make_client(
+        fake_server, retries=0, breaker_threshold=2, breaker_reset_seconds=0.3
+    )
+    breaker = client.scheduler.breaker("latest_quotes")
+    fake_server.fail(QUOTES, 503, 503)
+    for _ in range(2):
+        with pytest.raises(APIError):
+            client.get_quotes(["AAPL"])
+    assert breaker.state == "open"
+
+    # Open: fails fast without touching the server
+    with pytest.raises(CircuitOpenError):
+        client.get_quotes(["AAPL"])
+    assert fake_server.count(QUOTES) == 2
+    assert 0 < client.scheduler.retry_in("latest_quotes") <= 0.3
+
+    time.sleep(0.35)
+    assert breaker.state == "half_open"
+    assert client.get_quotes(["AAPL"])  # The probe succeeds
+    assert breaker.state == "closed"
+
+
+def test_failed_probe_reopens(fake_server):
+    client = make_client(
+        fake_server, retries=0, breaker_threshold=1, breaker_reset_seconds=0.2
+    )
+    fake_server.fail(QUOTES, 503, 503)
+    with pytest.raises(APIError):
+        client.get_quotes(["AAPL"])
+    time.sleep(0.25)
+    with pytest.raises(APIError):
+        client.get_quotes(["AAPL"])
+    assert client.scheduler.breaker("latest_quotes").state == "open"
+
+
+def test_repeated_auth_errors_back_off_the_clock(fake_server):
+    client = make_client(
+        fake_server, retries=0, breaker_threshold=3, breaker_reset_seconds=30
+    )
+    fake_server.fail(CLOCK, 401, 401, 401)
+    for _ in range(3):
+        with pytest.raises(APIError):
+            client.clock.refresh()
+    assert fake_server.count(CLOCK) == 3
+    assert client.scheduler.retry_in("clock") > 29
+    with pytest.raises(CircuitOpenError):
+        client.market_is_open()
+    assert fake_server.count(CLOCK) == 3
+
+
+# ---------- Deadlines ----------
+def test_deadline_stops_retries(fake_server):
+    client = make_client(fake_server, retries=10, backoff_base=0.2)
+    fake_server.fail(QUOTES, *[503] * 10)
+    start = time.monotonic()
+    with pytest.raises(APIError):
+        client.get_quotes(["AAPL"], deadline=0.3)
+    assert time.monotonic() - start < 0.5
+    assert fake_server.count(QUOTES) < 10
+
+
+def test_deadline_on_rate_limit_wait():
+    scheduler = RequestScheduler(per_minute=60, burst=1)
+    scheduler.call("latest_quote", lambda: None)
+    with pytest.raises(TimeoutError):
+        scheduler.call("latest_quote", lambda: None, deadline=0.1)
+
+
+# ---------- Token bucket ----------
+def test_bucket_rate():
+    bucket = TokenBucket(per_minute=1200, burst=5)  # 20/s
+    start = time.monotonic()
+    for _ in range(15):
+        assert bucket.acquire(PRIORITY_HIGH)
+    assert 0.4 <= time.monotonic() - start < 1.0
+
+
+def test_bucket_serves_waiters_by_priority():
+    bucket = TokenBucket(per_minute=600, burst=1)  # 10/s
+    bucket.acquire(PRIORITY_HIGH)  # Empty it
+    order = []
+
+    def take(priority, tag):
+        bucket.acquire(priority)
+        order.append(tag)
+
+    threads = [threading.Thread(target=take, args=(PRIORITY_LOW, "low"))]
+    threads[0].start()
+    time.sleep(0.02)  # The low request is already waiting
+    for priority, tag in ((PRIORITY_NORMAL, "quotes"), (PRIORITY_HIGH, "clock")):
+        threads.append(threading.Thread(target=take, args=(priority, tag)))
+        threads[-1].start()
+    for thread in threads:
+        thread.join()
+    assert order == ["clock", "quotes", "low"]
+
+
+def test_bucket_reserve_is_kept_from_low_priority():
+    bucket = TokenBucket(per_minute=60, burst=3, reserve=2)
+    assert bucket.acquire(PRIORITY_LOW, timeout=0)
+    assert not bucket.acquire(PRIORITY_LOW, timeout=0)
+    assert bucket.acquire(PRIORITY_NORMAL, timeout=0)
+    assert bucket.acquire(PRIORITY_HIGH, timeout=0)
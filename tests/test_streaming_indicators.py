@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+from indicators.momentum import roc, rsi
+from indicators.statsistics import sma, zscore
+from indicators.streaming import StreamingIndicators
+
+
+@pytest.fixture
+def prices():
+    rng = np.random.default_rng(1)
+    steps = rng.normal(0, 1, 300)
+    steps[100:110] = 0  # A flat stretch: RSI's all-gain/all-loss edge cases
+    return (100 + np.cumsum(steps)).tolist()
+
+
+@pytest.mark.parametrize(
+    "name, reference, n",
+    [("rsi", rsi, 14), ("roc", roc, 5), ("sma", sma, 10), ("zscore", zscore, 20)],
+)
+def test_matches_list_functions_bar_by_bar(prices, name, reference, n):
+    streaming = StreamingIndicators()
+    method = getattr(streaming, name)
+    for end in range(1, len(prices) + 1):
+        expected = reference(prices[:end], n)
+        assert method("AAPL", prices[:end], n) == pytest.approx(expected, abs=1e-9)
+
+
+def test_rolling_min_max_and_lag(prices):
+    streaming = StreamingIndicators()
+    for end in range(1, len(prices) + 1):
+        window = prices[max(0, end - 20) : end]
+        assert streaming.rolling_max("AAPL", prices[:end], 20) == max(window)
+        assert streaming.rolling_min("AAPL", prices[:end], 20) == min(window)
+        if end > 1:
+            assert streaming.sma("AAPL", prices[:end], 10, lag=1) == pytest.approx(
+                sma(prices[: end - 1], 10)
+            )
+
+
+def test_shorter_series_resets_the_state(prices):
+    streaming = StreamingIndicators()
+    streaming.rsi("AAPL", prices, 14)
+    assert streaming.rsi("AAPL", prices[:50], 14) == pytest.approx(rsi(prices[:50]))
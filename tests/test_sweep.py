@@ -0,0 +1,51 @@
+import os
+
+import pytest
+
+import penguins
+from backtest.replay import replay_bars
+from backtest.simulator import Simulator
+from backtest.sweep import run_sweep
+from data.synthetic import SyntheticMarket
+
+SYMBOLS = ["AAPL", "MSFT", "NVDA"]
+CONFIGS = [
+    ("BreakoutPenguin", {"lookback": 5}),
+    ("BreakoutPenguin", {"lookback": 20}),
+    ("VolatilityBreakoutPenguin", {"period": 10, "std_mult": 1.5}),
+]
+
+
+@pytest.fixture
+def price_history():
+    bars = SyntheticMarket(seed=9).bars(SYMBOLS, 150)
+    return {s: b["close"].tolist() for s, b in bars.items()}
+
+
+def shared_segments():
+    return set(os.listdir("/dev/shm")) if os.path.isdir("/dev/shm") else set()
+
+
+def test_sweep_matches_a_serial_replay_and_frees_shared_memory(price_history):
+    before = shared_segments()
+    results = run_sweep(price_history, CONFIGS, workers=2)
+    assert shared_segments() == before
+
+    by_config = {(r["penguin"], tuple(r["params"].items())): r for r in results}
+    for class_name, params in CONFIGS:
+        penguin = getattr(penguins, class_name)(**params)
+        sim = Simulator([penguin], SYMBOLS, verbose=False)
+        replay_bars(sim, price_history)
+        result = by_config[(class_name, tuple(params.items()))]
+        assert result["trades"] == sim.portfolios[penguin.name].trades
+        assert result["final_value"] == pytest.approx(sim.curves[penguin.name][-1])
+
+    finals = [r["final_value"] for r in results]
+    assert finals == sorted(finals, reverse=True)
+
+
+def test_shared_memory_is_freed_when_a_worker_fails(price_history):
+    before = shared_segments()
+    with pytest.raises(AttributeError):
+        run_sweep(price_history, [("NoSuchPenguin", {})], workers=1)
+    assert shared_segments() == before
@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+from data.synthetic import SyntheticMarket
+
+SYMBOLS = ["AAPL", "MSFT", "NVDA"]
+
+
+def joined(chunks):
+    return {s: np.concatenate([c[s] for c in chunks]) for s in chunks[0]}
+
+
+@pytest.mark.parametrize("k", [1, 137, 499])
+def test_paths_do_not_depend_on_chunking(k):
+    whole = SyntheticMarket(seed=11).bars(SYMBOLS, 500)
+    market = SyntheticMarket(seed=11)
+    first = market.bars(SYMBOLS, k)
+    rest = market.bars(SYMBOLS, 500 - k, start_t=60 * k)
+    for s, bars in joined([first, rest]).items():
+        np.testing.assert_array_equal(bars, whole[s])
+
+
+def test_paths_do_not_depend_on_other_symbols():
+    alone = SyntheticMarket(seed=11).bars(["MSFT"], 300)["MSFT"]
+    together = SyntheticMarket(seed=11).bars(SYMBOLS, 300)["MSFT"]
+    np.testing.assert_array_equal(alone, together)
+
+
+def test_seed_changes_the_path_and_bars_are_valid():
+    a = SyntheticMarket(seed=1).bars(["AAPL"], 200)["AAPL"]
+    b = SyntheticMarket(seed=2).bars(["AAPL"], 200)["AAPL"]
+    assert not np.array_equal(a["close"], b["close"])
+    assert (a["high"] >= np.maximum(a["open"], a["close"])).all()
+    assert (a["low"] <= np.minimum(a["open"], a["close"])).all()
+    assert (a["t"] == 60 * np.arange(200)).all()
+
+
+def test_quote_continues_from_the_last_price():
+    bid, ask = SyntheticMarket(seed=4).quote("AAPL", last=50.0)
+    assert 0 < bid < ask
+    assert abs((bid + ask) / 2 / 50.0 - 1) < 0.05